@@ -5,6 +5,9 @@ from . import res_partner
 from . import res_company
 from . import account
 from . import account_report
+from . import account_report_balance_cache
+from . import account_report_export_job
+from . import account_report_ledger_version
 from . import account_analytic_report
 from . import account_bank_reconciliation_report
 from . import account_general_ledger
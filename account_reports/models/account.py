@@ -8,3 +8,27 @@ class AccountAccount(models.Model):
     _inherit = "account.account"
 
     exclude_provision_currency_ids = fields.Many2many('res.currency', relation='account_account_exclude_res_currency_provision', help="Whether or not we have to make provisions for the selected foreign currencies.")
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        # Overridden to invalidate the account codes index used by the account_codes report engine, and the totals cached by the reports
+        accounts = super().create(vals_list)
+        self.env['account.report'].clear_caches()
+        self.env['account.report.ledger.version'].sudo()._bump(accounts.company_id.ids)
+        return accounts
+
+    def write(self, vals):
+        # Overridden to invalidate the account codes index used by the account_codes report engine, and the totals cached by the reports
+        company_ids = self.company_id.ids
+        res = super().write(vals)
+        if {'code', 'company_id'} & vals.keys():
+            self.env['account.report'].clear_caches()
+        self.env['account.report.ledger.version'].sudo()._bump_on_write(self, vals, company_ids + self.company_id.ids)
+        return res
+
+    def unlink(self):
+        # Overridden to invalidate the account codes index used by the account_codes report engine, and the totals cached by the reports
+        self.env['account.report.ledger.version'].sudo()._bump(self.company_id.ids)
+        res = super().unlink()
+        self.env['account.report'].clear_caches()
+        return res
@@ -178,6 +178,18 @@ class AccountReport(models.AbstractModel):
 
         return tables, where_clause, where_params
 
+    def _get_balance_cache_date_bounds(self, options, date_scope):
+        # The balance cache knows nothing about analytic distributions nor analytic lines
+        if options.get('analytic_groupby_option') or options.get('analytic_accounts') or options.get('include_analytic_without_aml'):
+            return None
+        return super()._get_balance_cache_date_bounds(options, date_scope)
+
+    def _can_use_expression_totals_cache(self, options, grouped_formulas):
+        # Analytic lines are not covered by the ledger version
+        if options.get('analytic_groupby_option') or options.get('analytic_accounts') or options.get('include_analytic_without_aml'):
+            return False
+        return super()._can_use_expression_totals_cache(options, grouped_formulas)
+
     def action_audit_cell(self, options, params):
         column_group_options = self._get_column_group_options(options, params['column_group_key'])
 
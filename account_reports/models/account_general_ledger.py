@@ -85,7 +85,7 @@ class GeneralLedgerCustomHandler(models.AbstractModel):
         return {
             'initial_balances': self._get_initial_balance_values(report, account_ids_to_expand, options),
 
-            # load_more_limit canno( be passed to this call, otherwise it won't be applied per account but on the whole result.
+            # load_more_limit cannot be passed to this call, otherwise it won't be applied per account but on the whole result.
             # We gain perf from batching, but load every result, even if the limit restricts them later.
             'aml_values': self._get_aml_values(report, options, account_ids_to_expand)[0],
         }
@@ -318,18 +318,26 @@ class GeneralLedgerCustomHandler(models.AbstractModel):
 
         return new_options
 
-    def _get_aml_values(self, report, options, expanded_account_ids, offset=0, limit=None):
+    def _get_aml_values(self, report, options, expanded_account_ids, keyset_cursor=None, limit=None):
+        """ Returns the values of the move lines to display under the provided accounts, grouped by account.
+
+        :return: (rslt, has_more, next_keyset_cursor), next_keyset_cursor being the cursor to pass to the next call
+                 to get the following move lines, when has_more is True.
+        """
         rslt = {account_id: {} for account_id in expanded_account_ids}
-        aml_query, aml_params = self._get_query_amls(report, options, expanded_account_ids, offset=offset, limit=limit)
+        aml_query, aml_params = self._get_query_amls(report, options, expanded_account_ids, keyset_cursor=keyset_cursor, limit=limit)
         self._cr.execute(aml_query, aml_params)
         aml_results_number = 0
         has_more = False
+        next_keyset_cursor = keyset_cursor
         for aml_result in self._cr.dictfetchall():
             aml_results_number += 1
             if aml_results_number == limit:
                 has_more = True
                 break
 
+            next_keyset_cursor = report._get_partner_and_general_ledger_keyset_cursor(aml_result)
+
             if aml_result['ref']:
                 aml_result['communication'] = f"{aml_result['ref']} - {aml_result['name']}"
             else:
@@ -356,14 +364,15 @@ class GeneralLedgerCustomHandler(models.AbstractModel):
             else:
                 account_result[aml_key][aml_result['column_group_key']] = aml_result
 
-        return rslt, has_more
+        return rslt, has_more, next_keyset_cursor
 
-    def _get_query_amls(self, report, options, expanded_account_ids, offset=0, limit=None):
+    def _get_query_amls(self, report, options, expanded_account_ids, keyset_cursor=None, limit=None):
         """ Construct a query retrieving the account.move.lines when expanding a report line with or without the load
         more.
         :param options:               The report options.
         :param expanded_account_ids:  The account.account ids corresponding to consider. If None, match every account.
-        :param offset:                The offset of the query (used by the load more).
+        :param keyset_cursor:         The sort key of the last move line already loaded (used by the load more).
+                                      See _get_partner_and_general_ledger_keyset_clause.
         :param limit:                 The limit of the query (used by the load more).
         :return:                      (query, params)
         """
@@ -375,10 +384,12 @@ class GeneralLedgerCustomHandler(models.AbstractModel):
             self.pool['account.journal'].name.translate else 'journal.name'
         account_name = f"COALESCE(account.name->>'{lang}', account.name->>'en_US')" if \
             self.pool['account.account'].name.translate else 'account.name'
-        for column_group_key, group_options in report._split_options_per_column_group(options).items():
+        for column_group_index, (column_group_key, group_options) in enumerate(report._split_options_per_column_group(options).items()):
             # Get sums for the account move lines.
             # period: [('date' <= options['date_to']), ('date', '>=', options['date_from'])]
             tables, where_clause, where_params = report._query_get(group_options, domain=additional_domain, date_scope='strict_range')
+            keyset_clause, keyset_params = report._get_partner_and_general_ledger_keyset_clause(keyset_cursor, column_group_index)
+            limit_clause = 'LIMIT %s' if limit else ''
             ct_query = self.env['res.currency']._get_query_currency_table(group_options)
             query = f'''
                 (SELECT
@@ -405,7 +416,10 @@ class GeneralLedgerCustomHandler(models.AbstractModel):
                     journal.code                            AS journal_code,
                     {journal_name}                          AS journal_name,
                     full_rec.name                           AS full_rec_name,
-                    %s                                      AS column_group_key
+                    %s                                      AS column_group_key,
+                    COALESCE(account_move_line.move_name, '') AS keyset_move_name,
+                    %s                                      AS keyset_column_group_index,
+                    0                                       AS keyset_tiebreaker
                 FROM {tables}
                 JOIN account_move move                      ON move.id = account_move_line.move_id
                 LEFT JOIN {ct_query}                        ON currency_table.company_id = account_move_line.company_id
@@ -414,19 +428,20 @@ class GeneralLedgerCustomHandler(models.AbstractModel):
                 LEFT JOIN account_account account           ON account.id = account_move_line.account_id
                 LEFT JOIN account_journal journal           ON journal.id = account_move_line.journal_id
                 LEFT JOIN account_full_reconcile full_rec   ON full_rec.id = account_move_line.full_reconcile_id
-                WHERE {where_clause}
-                ORDER BY account_move_line.date, account_move_line.id)
+                WHERE {where_clause} AND {keyset_clause}
+                ORDER BY account_move_line.account_id, account_move_line.date, COALESCE(account_move_line.move_name, ''), account_move_line.id
+                {limit_clause})
             '''
 
             queries.append(query)
-            all_params.append(column_group_key)
-            all_params += where_params
+            all_params += [column_group_key, column_group_index, *where_params, *keyset_params]
+            if limit:
+                all_params.append(limit)
 
-        full_query = " UNION ALL ".join(queries)
+        # The order matches the indexes on account_move_line (account_id, date, move_name, id), so that each page
+        # can be read directly from them, whatever the number of move lines loaded before it.
+        full_query = " UNION ALL ".join(queries) + " ORDER BY account_id, date, keyset_move_name, id, keyset_column_group_index"
 
-        if offset:
-            full_query += ' OFFSET %s '
-            all_params.append(offset)
         if limit:
             full_query += ' LIMIT %s '
             all_params.append(limit)
@@ -700,12 +715,15 @@ class GeneralLedgerCustomHandler(models.AbstractModel):
                 progress = init_load_more_progress(initial_balance_line)
 
         # Get move lines
-        limit_to_load = report.load_more_limit + 1 if report.load_more_limit and not self._context.get('print_mode') else None
+        load_more_limit = report._get_load_more_limit()
+        limit_to_load = load_more_limit + 1 if load_more_limit else None
         has_more = False
+        # When loading more lines, the progress also contains the sort key of the last move line loaded before, to start from there.
+        keyset_cursor = progress.get('keyset_cursor') if offset else None
         if unfold_all_batch_data:
             aml_results = unfold_all_batch_data['aml_values'][model_id]
         else:
-            aml_results, has_more = self._get_aml_values(report, options, [model_id], offset=offset, limit=limit_to_load)
+            aml_results, has_more, keyset_cursor = self._get_aml_values(report, options, [model_id], keyset_cursor=keyset_cursor, limit=limit_to_load)
             aml_results = aml_results[model_id]
 
         next_progress = progress
@@ -716,7 +734,7 @@ class GeneralLedgerCustomHandler(models.AbstractModel):
 
         return {
             'lines': lines,
-            'offset_increment': report.load_more_limit,
+            'offset_increment': load_more_limit,
             'has_more': has_more,
-            'progress': json.dumps(next_progress),
+            'progress': json.dumps({**next_progress, 'keyset_cursor': keyset_cursor}),
         }
@@ -70,6 +70,23 @@ class AccountMove(models.Model):
 
             carryover_values.unlink()
 
+    def write(self, vals):
+        # Overridden to update the balance cache when moves get posted, reset or moved to another date, journal or company
+        self.env['account.report.ledger.version'].sudo()._bump_on_write(self, vals, self.company_id.ids + ([vals['company_id']] if vals.get('company_id') else []))
+        if self._context.get('skip_account_report_balance_cache') or not {'state', 'date', 'journal_id', 'company_id', 'line_ids'} & vals.keys():
+            return super().write(vals)
+
+        balance_cache = self.env['account.report.balance.cache'].sudo()
+        balance_cache._update_from_moves(self.filtered(lambda m: m.state == 'posted'), -1)
+        res = super(AccountMove, self.with_context(skip_account_report_balance_cache=True)).write(vals)
+        balance_cache._update_from_moves(self.filtered(lambda m: m.state == 'posted'), 1)
+        return res
+
+    def unlink(self):
+        # Overridden to invalidate the totals cached by the reports
+        self.env['account.report.ledger.version'].sudo()._bump(self.company_id.ids)
+        return super().unlink()
+
     def action_open_tax_report(self):
         action = self.env["ir.actions.actions"]._for_xml_id("account_reports.action_account_report_gt")
         if not self.tax_closing_end_date:
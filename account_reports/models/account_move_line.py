@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
-from odoo import fields, models
+from odoo import api, fields, models
+from odoo.tools.sql import create_index
 
 
 class AccountMoveLine(models.Model):
@@ -11,3 +12,38 @@ class AccountMoveLine(models.Model):
     expected_pay_date = fields.Date('Expected Date',
                                     help="Expected payment date as manually set through the customer statement"
                                          "(e.g: if you had the customer on the phone and want to remember the date he promised he would pay)")
+
+    def init(self):
+        super().init()
+        # Used by the keyset pagination of the general ledger and partner ledger (see _get_partner_and_general_ledger_keyset_clause)
+        create_index(self.env.cr, 'account_move_line__account_keyset_index', 'account_move_line', ['account_id', 'date', "(COALESCE(move_name, ''))", 'id'])
+        create_index(self.env.cr, 'account_move_line__partner_keyset_index', 'account_move_line', ['partner_id', 'date', "(COALESCE(move_name, ''))", 'id'])
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        # Overridden to add the posted lines to the balance cache of the reports and to invalidate their cached totals
+        lines = super().create(vals_list)
+        self.env['account.report.ledger.version'].sudo()._bump(lines.company_id.ids)
+        if not self._context.get('skip_account_report_balance_cache'):
+            self.env['account.report.balance.cache'].sudo()._update_from_move_lines(lines.filtered(lambda l: l.parent_state == 'posted'), 1)
+        return lines
+
+    def write(self, vals):
+        # Overridden to move the posted lines between the keys of the balance cache when their amounts or keys change
+        self.env['account.report.ledger.version'].sudo()._bump_on_write(self, vals, self.company_id.ids + ([vals['company_id']] if vals.get('company_id') else []))
+
+        if self._context.get('skip_account_report_balance_cache') or not {'account_id', 'debit', 'credit', 'balance', 'date', 'journal_id', 'company_id', 'display_type', 'move_id'} & vals.keys():
+            return super().write(vals)
+
+        balance_cache = self.env['account.report.balance.cache'].sudo()
+        balance_cache._update_from_move_lines(self.filtered(lambda l: l.parent_state == 'posted'), -1)
+        res = super().write(vals)
+        balance_cache._update_from_move_lines(self.filtered(lambda l: l.parent_state == 'posted'), 1)
+        return res
+
+    def unlink(self):
+        # Overridden to remove the posted lines from the balance cache
+        self.env['account.report.ledger.version'].sudo()._bump(self.company_id.ids)
+        if not self._context.get('skip_account_report_balance_cache'):
+            self.env['account.report.balance.cache'].sudo()._update_from_move_lines(self.filtered(lambda l: l.parent_state == 'posted'), -1)
+        return super().unlink()
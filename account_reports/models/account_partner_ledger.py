@@ -384,18 +384,21 @@ class PartnerLedgerCustomHandler(models.AbstractModel):
                 # For the first expansion of the line, the initial balance line gives the progress
                 progress = init_load_more_progress(initial_balance_line)
 
-        limit_to_load = report.load_more_limit + 1 if report.load_more_limit and not self._context.get('print_mode') else None
+        load_more_limit = report._get_load_more_limit()
+        limit_to_load = load_more_limit + 1 if load_more_limit else None
 
+        # When loading more lines, the progress also contains the sort key of the last move line loaded before, to start from there.
+        keyset_cursor = progress.get('keyset_cursor') if offset else None
         if unfold_all_batch_data:
             aml_results = unfold_all_batch_data['aml_values'][record_id]
         else:
-            aml_results = self._get_aml_values(options, [record_id], offset=offset, limit=limit_to_load)[record_id]
+            aml_results = self._get_aml_values(options, [record_id], keyset_cursor=keyset_cursor, limit=limit_to_load)[record_id]
 
         has_more = False
         treated_results_count = 0
         next_progress = progress
         for result in aml_results:
-            if not self._context.get('print_mode') and report.load_more_limit and treated_results_count == report.load_more_limit:
+            if load_more_limit and treated_results_count == load_more_limit:
                 # We loaded one more than the limit on purpose: this way we know we need a "load more" line
                 has_more = True
                 break
@@ -403,16 +406,17 @@ class PartnerLedgerCustomHandler(models.AbstractModel):
             new_line = self._get_report_line_move_line(options, result, line_dict_id, next_progress, level_shift=level_shift)
             lines.append(new_line)
             next_progress = init_load_more_progress(new_line)
+            keyset_cursor = report._get_partner_and_general_ledger_keyset_cursor(result)
             treated_results_count += 1
 
         return {
             'lines': lines,
             'offset_increment': treated_results_count,
             'has_more': has_more,
-            'progress': json.dumps(next_progress)
+            'progress': json.dumps({**next_progress, 'keyset_cursor': keyset_cursor})
         }
 
-    def _get_aml_values(self, options, partner_ids, offset=0, limit=None):
+    def _get_aml_values(self, options, partner_ids, keyset_cursor=None, limit=None):
         rslt = {partner_id: [] for partner_id in partner_ids}
 
         partner_ids_wo_none = [x for x in partner_ids if x]
@@ -438,18 +442,28 @@ class PartnerLedgerCustomHandler(models.AbstractModel):
         account_name = f"COALESCE(account.name->>'{lang}', account.name->>'en_US')" if \
             self.pool['account.account'].name.translate else 'account.name'
         report = self.env.ref('account_reports.partner_ledger_report')
-        for column_group_key, group_options in report._split_options_per_column_group(options).items():
+        for column_group_index, (column_group_key, group_options) in enumerate(report._split_options_per_column_group(options).items()):
             tables, where_clause, where_params = report._query_get(group_options, 'strict_range')
+            direct_keyset_clause, direct_keyset_params = report._get_partner_and_general_ledger_keyset_clause(keyset_cursor, column_group_index)
+            indirect_keyset_clause, indirect_keyset_params = report._get_partner_and_general_ledger_keyset_clause(keyset_cursor, column_group_index, tiebreaker_sql='partial.id')
+            limit_clause = 'LIMIT %s' if limit else ''
+            limit_params = [limit] if limit else []
 
             all_params += [
                 column_group_key,
+                column_group_index,
                 *where_params,
                 *directly_linked_aml_partner_params,
+                *direct_keyset_params,
+                *limit_params,
                 column_group_key,
+                column_group_index,
                 *indirectly_linked_aml_partner_params,
                 *where_params,
                 group_options['date']['date_from'],
                 group_options['date']['date_to'],
+                *indirect_keyset_params,
+                *limit_params,
             ]
 
             # For the move lines directly linked to this partner
@@ -477,7 +491,10 @@ class PartnerLedgerCustomHandler(models.AbstractModel):
                     journal.code                                                                     AS journal_code,
                     {journal_name}                                                                   AS journal_name,
                     %s                                                                               AS column_group_key,
-                    'directly_linked_aml'                                                            AS key
+                    'directly_linked_aml'                                                            AS key,
+                    COALESCE(account_move_line.move_name, '')                                        AS keyset_move_name,
+                    %s                                                                               AS keyset_column_group_index,
+                    0                                                                                AS keyset_tiebreaker
                 FROM {tables}
                 JOIN account_move ON account_move.id = account_move_line.move_id
                 LEFT JOIN {ct_query} ON currency_table.company_id = account_move_line.company_id
@@ -485,8 +502,9 @@ class PartnerLedgerCustomHandler(models.AbstractModel):
                 LEFT JOIN res_partner partner               ON partner.id = account_move_line.partner_id
                 LEFT JOIN account_account account           ON account.id = account_move_line.account_id
                 LEFT JOIN account_journal journal           ON journal.id = account_move_line.journal_id
-                WHERE {where_clause} AND {directly_linked_aml_partner_clause}
-                ORDER BY account_move_line.date, account_move_line.id
+                WHERE {where_clause} AND {directly_linked_aml_partner_clause} AND {direct_keyset_clause}
+                ORDER BY account_move_line.date, COALESCE(account_move_line.move_name, ''), account_move_line.id
+                {limit_clause}
             ''')
 
             # For the move lines linked to no partner, but reconciled with this partner. They will appear in grey in the report
@@ -520,7 +538,10 @@ class PartnerLedgerCustomHandler(models.AbstractModel):
                     journal.code                                                                        AS journal_code,
                     {journal_name}                                                                      AS journal_name,
                     %s                                                                                  AS column_group_key,
-                    'indirectly_linked_aml'                                                             AS key
+                    'indirectly_linked_aml'                                                             AS key,
+                    COALESCE(account_move_line.move_name, '')                                           AS keyset_move_name,
+                    %s                                                                                  AS keyset_column_group_index,
+                    partial.id                                                                          AS keyset_tiebreaker
                 FROM {tables}
                     LEFT JOIN {ct_query} ON currency_table.company_id = account_move_line.company_id,
                     account_partial_reconcile partial,
@@ -538,14 +559,15 @@ class PartnerLedgerCustomHandler(models.AbstractModel):
                     AND account.id = account_move_line.account_id
                     AND {where_clause}
                     AND partial.max_date BETWEEN %s AND %s
-                ORDER BY account_move_line.date, account_move_line.id
+                    AND {indirect_keyset_clause}
+                ORDER BY account_move_line.date, COALESCE(account_move_line.move_name, ''), account_move_line.id, partial.id
+                {limit_clause}
             ''')
 
+        # The order matches the index on account_move_line (partner_id, date, move_name, id), so that each page of
+        # the directly linked move lines can be read directly from it, whatever the number of lines loaded before it.
         query = '(' + ') UNION ALL ('.join(queries) + ')'
-
-        if offset:
-            query += ' OFFSET %s '
-            all_params.append(offset)
+        query += ' ORDER BY date, keyset_move_name, id, keyset_column_group_index, keyset_tiebreaker '
 
         if limit:
             query += ' LIMIT %s '
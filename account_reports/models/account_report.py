@@ -2,15 +2,19 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
 import ast
+import bisect
+import copy
 import datetime
 import io
 import json
 import logging
 import math
 import re
+import sys
 import base64
 from ast import literal_eval
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from functools import cmp_to_key
 
 import markupsafe
@@ -18,10 +22,11 @@ from babel.dates import get_quarter_names
 from dateutil.relativedelta import relativedelta
 
 from odoo.addons.web.controllers.utils import clean_action
-from odoo import models, fields, api, _, osv
+from odoo import models, fields, api, sql_db, tools, _, osv
 from odoo.exceptions import RedirectWarning, UserError, ValidationError
 from odoo.tools import config, date_utils, get_lang, float_compare, float_is_zero
 from odoo.tools.float_utils import float_round
+from odoo.tools.lru import LRU
 from odoo.tools.misc import formatLang, format_date, xlsxwriter
 from odoo.tools.safe_eval import expr_eval, safe_eval
 from odoo.models import check_method_name
@@ -40,6 +45,23 @@ ACCOUNT_CODES_ENGINE_TERM_REGEX = re.compile(
 # Performance optimisation: those engines always will receive None as their next_groupby, allowing more efficient batching.
 NO_NEXT_GROUPBY_ENGINES = {'tax_tags', 'account_codes'}
 
+# Engines whose results only depend on the journal items, the accounts and the options, and can hence be cached until the ledger changes.
+# The tax_tags engine is not part of it, as it also depends on the names of the tags.
+EXPRESSION_TOTALS_CACHE_ENGINES = {'domain', 'account_codes', 'aggregation'}
+
+# Models whose modifications change the version of the ledger, except for a few fields (see account.report.ledger.version).
+LEDGER_VERSION_MODELS = {'account.move.line', 'account.move', 'account.account'}
+
+# Options only impacting the way the lines are displayed, ignored in the keys of the expression totals cache.
+EXPRESSION_TOTALS_CACHE_IGNORED_OPTIONS = {'unfolded_lines', 'unfold_all', 'buttons', 'order_column', 'hierarchy'}
+
+# Engines whose batches only run read-only queries, and can hence be evaluated in parallel on separate cursors.
+PARALLEL_ENGINES = {'tax_tags', 'domain', 'account_codes'}
+
+# Process-wide cache of the expression totals computed by _compute_expression_totals_for_each_column_group, with its hit and miss counters.
+EXPRESSION_TOTALS_CACHE = LRU(256)
+EXPRESSION_TOTALS_CACHE_STATS = {'hit': 0, 'miss': 0}
+
 
 class AccountReportManager(models.Model):
     _name = 'account.report.manager'
@@ -1281,11 +1303,16 @@ class AccountReport(models.Model):
         return columns, column_groups
 
     def _get_dict_hashable_key_tuple(self, dict_to_convert):
+        def get_hashable_value(value):
+            if isinstance(value, dict):
+                return self._get_dict_hashable_key_tuple(value)
+            if isinstance(value, (list, tuple)):
+                return tuple(get_hashable_value(item) for item in value)
+            return value
+
         rslt = []
         for key, value in sorted(dict_to_convert.items()):
-            if isinstance(value, dict):
-                value = self._get_dict_hashable_key_tuple(value)
-            rslt.append((key, value))
+            rslt.append((key, get_hashable_value(value)))
         return tuple(rslt)
 
     ####################################################
@@ -1295,6 +1322,7 @@ class AccountReport(models.Model):
         options['buttons'] = [
             {'name': _('PDF'), 'sequence': 10, 'action': 'export_file', 'action_param': 'export_to_pdf', 'file_export_type': _('PDF')},
             {'name': _('XLSX'), 'sequence': 20, 'action': 'export_file', 'action_param': 'export_to_xlsx', 'file_export_type': _('XLSX')},
+            {'name': _('XLSX (Background)'), 'sequence': 30, 'action': 'export_to_xlsx_in_background'},
             {'name': _('Save'), 'sequence': 100, 'action': 'open_report_export_wizard'},
         ]
 
@@ -1500,6 +1528,174 @@ class AccountReport(models.Model):
 
         return query.get_sql()
 
+    def _query_get_for_column_groups(self, options_per_group, date_scope, domain=None):
+        """ Equivalent of _query_get for several column groups at once, allowing the engines to evaluate all of them with a single
+        scan of account_move_line.
+
+        The column groups sharing the same tables and currency table get merged together. Their FROM clause then joins a column_group
+        relation, whose column_group_key column gives the key of each column group a journal item belongs to. A journal item can belong
+        to several column groups (for example when comparing periods starting from the beginning), in which case it appears once per
+        column group, so that grouping on column_group.column_group_key gives the totals of each column group.
+
+        :param options_per_group:   A dict(column_group_key, column_group_options), as returned by _split_options_per_column_group.
+        :param date_scope:          The date scope to use, as in _query_get.
+        :param domain:              An additional domain on account.move.line, as in _query_get.
+
+        :return: A list of tuples (tables, where_clause, where_params, currency_table_query), one per set of merged column groups.
+        """
+        queries_per_batch = {}
+        for group_key, group_options in options_per_group.items():
+            tables, where_clause, where_params = self._query_get(group_options, date_scope, domain=domain)
+            ct_query = self.env['res.currency']._get_query_currency_table(group_options)
+            # A FROM clause with parameters (from joins) cannot be shared, as its parameters are returned together with where_params.
+            batch_key = (tables, ct_query) if '%s' not in tables else (tables, ct_query, group_key)
+            queries_per_batch.setdefault(batch_key, []).append((group_key, where_clause, where_params))
+
+        rslt = []
+        for (tables, ct_query, *dummy), group_queries in queries_per_batch.items():
+            if len(group_queries) == 1:
+                group_key, where_clause, where_params = group_queries[0]
+                column_group_values = self.env.cr.mogrify('(VALUES (%s)) AS column_group(column_group_key)', [group_key]).decode(self.env.cr.connection.encoding)
+                rslt.append((f'{tables} JOIN {column_group_values} ON TRUE', where_clause, where_params, ct_query))
+            else:
+                # The conditions of each column group are inlined in the lateral join, so that the FROM clause doesn't need any parameter.
+                column_group_selects = [
+                    self.env.cr.mogrify(f'SELECT %s AS column_group_key WHERE {where_clause}', [group_key, *where_params]).decode(self.env.cr.connection.encoding)
+                    for group_key, where_clause, where_params in group_queries
+                ]
+                rslt.append((
+                    f"{tables} JOIN LATERAL ({' UNION ALL '.join(column_group_selects)}) AS column_group ON TRUE",
+                    ' OR '.join(f'({where_clause})' for dummy, where_clause, dummy in group_queries),
+                    [param for dummy, dummy, where_params in group_queries for param in where_params],
+                    ct_query,
+                ))
+        return rslt
+
+    def _get_balance_cache_date_bounds(self, options, date_scope):
+        """ Checks whether the journal items selected by the options for date_scope can be totalled using account.report.balance.cache.
+
+        The cache only contains posted items, aggregated per company, account, journal and month. It can hence only be used when
+        no other filter applies, and when the period starts at the beginning of a month. The items of the last, incomplete month
+        of the period (if any) are then taken from account_move_line.
+
+        :return: None if the cache cannot be used, else a tuple (date_from, cache_date_to, include_initial_balance), where:
+                 - date_from is the first date to consider (or None if there is no such bound)
+                 - cache_date_to is the last day covered by the cache ; the items after it must be read from account_move_line
+                 - include_initial_balance tells whether the accounts with include_initial_balance are to be totalled from the beginning
+        """
+        if options.get('forced_domain'):
+            return None
+
+        supported_fields = {'display_type', 'company_id', 'journal_id', 'date', 'account_id.include_initial_balance', 'parent_state'}
+        for leaf in self._get_options_domain(options, date_scope):
+            if osv.expression.is_operator(leaf):
+                continue
+            if leaf[0] not in supported_fields or (leaf[0] == 'parent_state' and tuple(leaf) != ('parent_state', '=', 'posted')):
+                return None
+
+        # Only the standard multi-company rule is supported, as the cache doesn't allow applying any other.
+        for leaf in self.env['ir.rule']._compute_domain('account.move.line', 'read') or []:
+            if not osv.expression.is_operator(leaf) and leaf[0] != 'company_id':
+                return None
+
+        # The cached balances are expressed in company currency, so no currency conversion must be needed.
+        companies = self.env['res.company'].browse(self.get_report_company_ids(options))
+        if companies.currency_id != self.env.company.currency_id:
+            return None
+
+        date_from, date_to, include_initial_balance = self._get_date_bounds_info(options, date_scope)
+        date_from = fields.Date.to_date(date_from)
+        date_to = fields.Date.to_date(date_to)
+        if date_from and date_from.day != 1:
+            return None
+
+        cache_date_to = date_utils.end_of(date_to, 'month')
+        if cache_date_to != date_to:
+            cache_date_to = date_utils.start_of(date_to, 'month') - relativedelta(days=1)
+        if date_from and cache_date_to < date_from:
+            return None
+
+        return date_from, cache_date_to, include_initial_balance and bool(date_from)
+
+    def _get_balance_cache_account_totals_query(self, options, date_scope, domain=None):
+        """ Builds a query giving the balance and the number of journal items of each account, reading account.report.balance.cache
+        for the months it fully covers, and account_move_line for the remaining days.
+
+        :param options:     The report options, for a single column group.
+        :param date_scope:  The date scope to compute the totals for.
+        :param domain:      An additional domain on account.move.line. Only conditions on account_id are supported.
+
+        :return: None if the cache cannot be used with these parameters, else a tuple (query, params), where query selects
+                 the account_id, sum and aml_count columns, with one row per account having journal items.
+        """
+        date_bounds = self._get_balance_cache_date_bounds(options, date_scope)
+        if not date_bounds:
+            return None
+        date_from, cache_date_to, include_initial_balance = date_bounds
+
+        account_domain = []
+        for leaf in domain or []:
+            if osv.expression.is_operator(leaf):
+                account_domain.append(leaf)
+            elif leaf[0] == 'account_id':
+                account_domain.append(('id', *leaf[1:]))
+            elif isinstance(leaf[0], str) and leaf[0].startswith('account_id.'):
+                account_domain.append((leaf[0][len('account_id.'):], *leaf[1:]))
+            else:
+                return None
+
+        company_ids = tuple(set(self.get_report_company_ids(options)) & set(self.env.companies.ids))
+        if not company_ids:
+            return None
+
+        cache_conditions = ['cache.company_id IN %s', 'cache.period <= %s']
+        cache_params = [company_ids, cache_date_to]
+
+        journal_ids = [journal['id'] for journal in self._get_options_journals(options)]
+        if journal_ids:
+            cache_conditions.append('cache.journal_id IN %s')
+            cache_params.append(tuple(journal_ids))
+
+        if date_from and include_initial_balance:
+            cache_conditions.append('(cache.period >= %s OR account_account.include_initial_balance)')
+            cache_params.append(date_from)
+        elif date_from:
+            cache_conditions.append('cache.period >= %s')
+            cache_params.append(date_from)
+
+        if account_domain:
+            account_query = self.env['account.account'].with_context(active_test=False)._search(account_domain)
+            account_query_str, account_query_params = account_query.subselect()
+            cache_conditions.append(f'cache.account_id IN ({account_query_str})')
+            cache_params += account_query_params
+
+        # Journal items of the last, incomplete month
+        tables, where_clause, where_params = self._query_get(options, date_scope, domain=(domain or []) + [('date', '>', cache_date_to)])
+        ct_query = self.env['res.currency']._get_query_currency_table(options)
+
+        query = f"""
+            SELECT totals.account_id, SUM(totals.sum) AS sum, SUM(totals.aml_count) AS aml_count
+            FROM (
+                SELECT cache.account_id, cache.balance AS sum, cache.aml_count
+                FROM account_report_balance_cache cache
+                JOIN account_account ON account_account.id = cache.account_id
+                WHERE {' AND '.join(cache_conditions)}
+
+                UNION ALL
+
+                SELECT
+                    account_move_line.account_id,
+                    ROUND(account_move_line.balance * currency_table.rate, currency_table.precision),
+                    1
+                FROM {tables}
+                JOIN {ct_query} ON currency_table.company_id = account_move_line.company_id
+                WHERE {where_clause}
+            ) totals
+            GROUP BY totals.account_id
+            HAVING SUM(totals.aml_count) > 0
+        """
+        return query, cache_params + where_params
+
     ####################################################
     # LINE IDS MANAGEMENT HELPERS
     ####################################################
@@ -1760,6 +1956,36 @@ class AccountReport(models.Model):
         return getattr(self, function_name)
 
     def _get_lines(self, options, all_column_groups_expression_totals=None):
+        lines = self._get_lines_to_unfold(options, all_column_groups_expression_totals=all_column_groups_expression_totals)
+
+        # Unfold lines (static or dynamic) if necessary and add totals below section to dynamic lines
+        lines = self._fully_unfold_lines_if_needed(lines, options)
+
+        if self.custom_handler_model_id:
+            lines = self.env[self.custom_handler_model_name]._custom_line_postprocessor(self, options, lines)
+
+        return lines
+
+    def _iter_lines(self, options):
+        """ Generator version of _get_lines, used by streaming exports.
+
+        The static and dynamic lines are still computed at once, but the lines obtained by unfolding them are yielded
+        as they get generated, and are never all held in memory. This is only possible if the report's custom handler
+        does not need to postprocess the full list of lines; if it does, the lines of _get_lines are yielded instead.
+        """
+        if self._has_custom_line_postprocessor():
+            yield from self._get_lines(options)
+        else:
+            yield from self._iter_fully_unfolded_lines(self._get_lines_to_unfold(options), options)
+
+    def _has_custom_line_postprocessor(self):
+        if not self.custom_handler_model_id:
+            return False
+        handler_class = type(self.env[self.custom_handler_model_name])
+        return handler_class._custom_line_postprocessor is not AccountReportCustomHandler._custom_line_postprocessor
+
+    def _get_lines_to_unfold(self, options, all_column_groups_expression_totals=None):
+        """ Returns the static and dynamic lines of the report, before the unfolded ones get expanded by _get_lines. """
         self.ensure_one()
 
         if options['report_id'] != self.id:
@@ -1857,24 +2083,23 @@ class AccountReport(models.Model):
             lines = self._create_hierarchy(lines, options)
 
         # Handle totals below sections for static lines
-        lines = self._add_totals_below_sections(lines, options)
-
-        # Unfold lines (static or dynamic) if necessary and add totals below section to dynamic lines
-        lines = self._fully_unfold_lines_if_needed(lines, options)
-
-        if self.custom_handler_model_id:
-            lines = self.env[self.custom_handler_model_name]._custom_line_postprocessor(self, options, lines)
-
-        return lines
+        return self._add_totals_below_sections(lines, options)
 
     def _fully_unfold_lines_if_needed(self, lines, options):
+        return list(self._iter_fully_unfolded_lines(lines, options))
+
+    def _iter_fully_unfolded_lines(self, lines, options):
+        """ Yields the provided lines, each of them directly followed by its sublines if it is unfolded and has an expand function.
+        The sublines are unfolded the same way, recursively.
+        """
         def line_need_expansion(line_dict):
             return line_dict.get('unfolded') and line_dict.get('expand_function')
 
         custom_unfold_all_batch_data = None
 
-        # If it's possible to batch unfold and we're unfolding all lines, compute the batch, so that individual expansions are more efficient
-        if options['unfold_all'] and self.custom_handler_model_id:
+        # If it's possible to batch unfold and we're unfolding all lines, compute the batch, so that individual expansions are more efficient.
+        # Streaming exports expand the lines chunk by chunk instead, as the batch would need to hold all the sublines in memory.
+        if options['unfold_all'] and self.custom_handler_model_id and not self._context.get('account_report_expand_chunk_size'):
             lines_to_expand_by_function = {}
             for line_dict in lines:
                 if line_need_expansion(line_dict):
@@ -1882,19 +2107,18 @@ class AccountReport(models.Model):
 
             custom_unfold_all_batch_data = self.env[self.custom_handler_model_name]._custom_unfold_all_batch_data_generator(self, options, lines_to_expand_by_function)
 
-        i = 0
-        while i < len(lines):
-            # We iterate in such a way that if the lines added by an expansion need expansion, they will get it as well
-            line_dict = lines[i]
-            if line_need_expansion(line_dict):
-                groupby = line_dict.get('groupby')
-                progress = line_dict.get('progress')
-                to_insert = self._expand_unfoldable_line(line_dict['expand_function'], line_dict['id'], groupby, options, progress, 0,
-                                                         unfold_all_batch_data=custom_unfold_all_batch_data)
-                lines = lines[:i+1] + to_insert + lines[i+1:]
-            i += 1
+        # Depth-first traversal: the lines added by an expansion are yielded (and expanded if needed) before the next sibling of their parent
+        iterators_stack = [iter(lines)]
+        while iterators_stack:
+            line_dict = next(iterators_stack[-1], None)
+            if line_dict is None:
+                iterators_stack.pop()
+                continue
 
-        return lines
+            yield line_dict
+
+            if line_need_expansion(line_dict):
+                iterators_stack.append(self._iter_expanded_unfoldable_line(line_dict, options, unfold_all_batch_data=custom_unfold_all_batch_data))
 
     def _generate_total_below_section_line(self, section_line_dict):
         return {
@@ -2130,9 +2354,49 @@ class AccountReport(models.Model):
                 forced_date_scope = self._standardize_date_scope_for_date_range(expression.date_scope)
                 add_expressions_to_groups(expanded_cross, grouped_formulas, force_date_scope=forced_date_scope)
 
+        cache_key = None
+        if not forced_all_column_groups_expression_totals and grouped_formulas.keys() <= EXPRESSION_TOTALS_CACHE_ENGINES:
+            cache_key = self._get_expression_totals_cache_key(options, grouped_formulas, groupby_to_expand, offset, limit)
+
+        if cache_key:
+            cached_totals = EXPRESSION_TOTALS_CACHE.get(cache_key)
+            if cached_totals is not None:
+                EXPRESSION_TOTALS_CACHE_STATS['hit'] += 1
+                return {
+                    group_key: {
+                        self.env['account.report.expression'].browse(expression_id): copy.deepcopy(expression_totals)
+                        for expression_id, expression_totals in column_group_totals.items()
+                    }
+                    for group_key, column_group_totals in cached_totals.items()
+                }
+            EXPRESSION_TOTALS_CACHE_STATS['miss'] += 1
+
+        options_per_group = self._split_options_per_column_group(options)
+
+        # Evaluate each formula batch for all the column groups at once, so that engines supporting it can use a single query for all of them
+        formula_batches = [
+            (engine, batch_key, formulas_dict)
+            for engine, engine_batches in grouped_formulas.items()
+            if engine != 'aggregation'
+            for batch_key, formulas_dict in engine_batches.items()
+        ]
+        parallel_batch_results = self._compute_formula_batches_in_parallel(options_per_group, formula_batches, offset=offset, limit=limit)
+
+        formula_results_per_group = {group_key: {} for group_key in options_per_group}
+        for engine, batch_key, formulas_dict in formula_batches:
+            batch_results = parallel_batch_results.get((engine, batch_key))
+            if batch_results is None:
+                date_scope, current_groupby, next_groupby = batch_key
+                batch_results = self._compute_formula_batch_for_column_groups(
+                    options_per_group, engine, date_scope, formulas_dict, current_groupby, next_groupby, offset=offset, limit=limit,
+                )
+
+            for group_key, formula_results in batch_results.items():
+                formula_results_per_group[group_key][(engine, batch_key)] = formula_results
+
         # Treat each formula batch for each column group
         all_column_groups_expression_totals = {}
-        for group_key, group_options in self._split_options_per_column_group(options).items():
+        for group_key, group_options in options_per_group.items():
             if forced_all_column_groups_expression_totals:
                 forced_column_group_totals = forced_all_column_groups_expression_totals.get(group_key, None)
             else:
@@ -2144,11 +2408,125 @@ class AccountReport(models.Model):
                 forced_column_group_expression_totals=forced_column_group_totals,
                 offset=offset,
                 limit=limit,
+                formula_results_per_batch=formula_results_per_group[group_key],
             )
             all_column_groups_expression_totals[group_key] = current_group_expression_totals
 
+        if cache_key:
+            EXPRESSION_TOTALS_CACHE[cache_key] = {
+                group_key: {
+                    expression.id: copy.deepcopy(expression_totals)
+                    for expression, expression_totals in column_group_totals.items()
+                }
+                for group_key, column_group_totals in all_column_groups_expression_totals.items()
+            }
+
         return all_column_groups_expression_totals
 
+    def _can_use_expression_totals_cache(self, options, grouped_formulas):
+        """ Returns whether the totals of grouped_formulas computed with the provided options can be cached until the ledger of the companies
+        changes. Currency conversions are excluded, as they depend on the rates, as well as the domains reading data whose modifications
+        don't change the ledger version. To be overridden by the modules making the engines depend on other data.
+        """
+        companies = self.env['res.company'].browse(self.get_report_company_ids(options))
+        if len(companies.currency_id) != 1:
+            return False
+
+        # The partner categories and the taxes are not covered by the ledger version
+        if options.get('partner_categories') or self.only_tax_exigible:
+            return False
+
+        return all(
+            self._is_ledger_versioned_domain(literal_eval(formula))
+            for formulas_dict in grouped_formulas.get('domain', {}).values()
+            for formula in formulas_dict
+        )
+
+    @api.model
+    def _is_ledger_versioned_domain(self, domain):
+        """ Returns whether the journal items matching the provided domain can only change along with the ledger version, i.e. whether all
+        the fields it reads are stored in the models of LEDGER_VERSION_MODELS, without being computed from other data.
+        """
+        return all(
+            osv.expression.is_operator(leaf) or leaf in (osv.expression.TRUE_LEAF, osv.expression.FALSE_LEAF)
+            or self._is_ledger_versioned_field_path('account.move.line', leaf[0].split('.'))
+            for leaf in domain
+        )
+
+    @api.model
+    def _is_ledger_versioned_field_path(self, model_name, path, checked_fields=None):
+        """ Returns whether the value of the provided field path can only change along with the ledger version ; see _is_ledger_versioned_domain.
+
+        :param model_name:      The name of the model the path starts from.
+        :param path:            The list of the field names of the path.
+        :param checked_fields:  The computed fields whose dependencies are already being checked, to stop on circular dependencies.
+        """
+        if model_name not in LEDGER_VERSION_MODELS:
+            return False
+
+        field = self.env[model_name]._fields.get(path[0])
+        if not field or not self.env['account.report.ledger.version']._is_versioned_field(model_name, field.name):
+            return False
+        if field.related:
+            return self._is_ledger_versioned_field_path(model_name, field.related.split('.') + path[1:], checked_fields)
+        if not field.store:
+            return False
+        if field.compute:
+            # Stored computed fields, like amount_residual, are recomputed without writing on their records when one of their
+            # dependencies changes, so all of them must be versioned as well.
+            checked_fields = set() if checked_fields is None else checked_fields
+            if field not in checked_fields:
+                checked_fields.add(field)
+                depends, depends_context = field.get_depends(self.env[model_name])
+                if depends_context or not all(
+                    self._is_ledger_versioned_field_path(model_name, dependency.split('.'), checked_fields)
+                    for dependency in depends
+                ):
+                    return False
+
+        if len(path) > 1:
+            return self._is_ledger_versioned_field_path(field.comodel_name, path[1:], checked_fields)
+        if field.type == 'one2many':
+            # The values of a one2many field are stored in its comodel
+            return field.comodel_name in LEDGER_VERSION_MODELS
+        return True
+
+    def _get_expression_totals_cache_key(self, options, grouped_formulas, groupby_to_expand, offset, limit):
+        """ Returns the key under which the totals of grouped_formulas computed with the provided options are cached, or None if they
+        shouldn't be.
+
+        The key contains a normalized version of the options and the formulas, as well as the version of the ledgers of the companies,
+        which changes each time their journal items or accounts are modified (see account.report.ledger.version).
+        """
+        if not self._can_use_expression_totals_cache(options, grouped_formulas):
+            return None
+
+        formulas_key = frozenset(
+            (engine, batch_key, formula, tuple((expression.id, expression.subformula) for expression in expressions))
+            for engine, engine_batches in grouped_formulas.items()
+            for batch_key, formulas_dict in engine_batches.items()
+            for formula, expressions in formulas_dict.items()
+        )
+        options_key = self._get_dict_hashable_key_tuple({
+            key: value
+            for key, value in options.items()
+            if key not in EXPRESSION_TOTALS_CACHE_IGNORED_OPTIONS
+        })
+        company_ids = self.get_report_company_ids(options)
+
+        return (
+            self.env.cr.dbname,
+            self.id,
+            self.env.uid,
+            tuple(self.env.companies.ids),
+            options_key,
+            formulas_key,
+            groupby_to_expand,
+            offset,
+            limit,
+            self.env['account.report.ledger.version']._get_versions(company_ids),
+        )
+
     def _standardize_date_scope_for_date_range(self, date_scope):
         """ Depending on the fact the report accepts date ranges or not, different date scopes might mean the same thing.
         This function is used so that, in those cases, only one of these date_scopes' values is used, to avoid useless creation
@@ -2185,7 +2563,7 @@ class AccountReport(models.Model):
             'owner_column_group': group_key,
         }
 
-    def _compute_expression_totals_for_single_column_group(self, column_group_options, grouped_formulas, forced_column_group_expression_totals=None, offset=0, limit=None):
+    def _compute_expression_totals_for_single_column_group(self, column_group_options, grouped_formulas, forced_column_group_expression_totals=None, offset=0, limit=None, formula_results_per_batch=None):
         """ Evaluates expressions for a single column group.
 
             :param column_group_options: The options dict obtained from _split_options_per_column_group() for the column group to evaluate.
@@ -2206,6 +2584,11 @@ class AccountReport(models.Model):
             :param limit: The SQL limit to apply when computing these expressions' result. Used if self.load_more_limit is set, to handle
                           the load more feature.
 
+            :param formula_results_per_batch: The results of the formula batches of grouped_formulas, if they were already computed for this
+                                              column group, as a dict((engine, (date_scope, current_groupby, next_groupby)), formula_results),
+                                              formula_results being in the format returned by _compute_formula_batch.
+                                              Aggregation formulas are always computed by this function.
+
             :return: A dict(expression, {'value': value, 'has_sublines': has_sublines}), where:
                      - expression is one of the account.report.expressions that got evaluated
 
@@ -2265,8 +2648,12 @@ class AccountReport(models.Model):
             if selection_val[0] != 'aggregation'
         ]
         for engine in batchable_engines:
-            for (date_scope, current_groupby, next_groupby), formulas_dict in grouped_formulas.get(engine, {}).items():
-                formula_results = self._compute_formula_batch(column_group_options, engine, date_scope, formulas_dict, current_groupby, next_groupby, offset=offset, limit=limit)
+            for batch_key, formulas_dict in grouped_formulas.get(engine, {}).items():
+                date_scope, current_groupby, next_groupby = batch_key
+                if formula_results_per_batch is not None:
+                    formula_results = formula_results_per_batch[(engine, batch_key)]
+                else:
+                    formula_results = self._compute_formula_batch(column_group_options, engine, date_scope, formulas_dict, current_groupby, next_groupby, offset=offset, limit=limit)
                 inject_formula_results(
                     formula_results,
                     column_group_expression_totals,
@@ -2549,6 +2936,118 @@ class AccountReport(models.Model):
             offset=offset, limit=limit
         )
 
+    def _compute_formula_batch_for_column_groups(self, options_per_group, formula_engine, date_scope, formulas_dict, current_groupby, next_groupby, offset=0, limit=None):
+        """ Evaluates a batch of formulas for several column groups.
+
+        Engines able to evaluate all the column groups with the same queries implement a _compute_formula_batch_for_column_groups_with_engine_xxx
+        function, which is used here. The other engines are evaluated column group by column group, using _compute_formula_batch. This is also the
+        case when using an offset or a limit, as they need to be applied on each column group separately.
+
+        :param options_per_group: A dict(column_group_key, column_group_options), as returned by _split_options_per_column_group.
+
+        The other parameters are the same as for _compute_formula_batch.
+
+        :return: A dict(column_group_key, formula_results), where formula_results is in the format returned by _compute_formula_batch.
+        """
+        multi_groups_function_name = f'_compute_formula_batch_for_column_groups_with_engine_{formula_engine}'
+        if not offset and not limit and hasattr(self, multi_groups_function_name):
+            return getattr(self, multi_groups_function_name)(options_per_group, date_scope, formulas_dict, current_groupby, next_groupby)
+
+        return {
+            group_key: self._compute_formula_batch(group_options, formula_engine, date_scope, formulas_dict, current_groupby, next_groupby, offset=offset, limit=limit)
+            for group_key, group_options in options_per_group.items()
+        }
+
+    def _get_parallel_workers_count(self):
+        """ Returns the number of cursors the formula batches of the reports can be evaluated with in parallel ; see _compute_formula_batches_in_parallel.
+        This is opt-in: it is disabled unless the 'account_reports.parallel_workers' system parameter is set to at least 2. Each worker uses its
+        own database connection, so this value should stay well below db_maxconn.
+        """
+        return int(self.env['ir.config_parameter'].sudo().get_param('account_reports.parallel_workers', 0))
+
+    def _compute_formula_batches_in_parallel(self, options_per_group, formula_batches, offset=0, limit=None):
+        """ Evaluates the formula batches of the engines in PARALLEL_ENGINES concurrently, each one in a thread using its own read-only cursor.
+
+        The worker cursors import a snapshot exported by the current transaction, so that they all see exactly the same data as it does. Since an
+        exported snapshot doesn't include the uncommitted changes of the exporting transaction, nothing is done if the current transaction has
+        already written in the database: the batches are then evaluated sequentially by the caller.
+
+        :param options_per_group: A dict(column_group_key, column_group_options), as returned by _split_options_per_column_group.
+        :param formula_batches:   A list of tuples (engine, batch_key, formulas_dict), batch_key being (date_scope, current_groupby, next_groupby).
+
+        :return: A dict((engine, batch_key), batch_results), batch_results being in the format returned by _compute_formula_batch_for_column_groups.
+                 The batches that were not evaluated are not part of it.
+        """
+        parallel_batches = [batch for batch in formula_batches if batch[0] in PARALLEL_ENGINES]
+        workers_count = min(self._get_parallel_workers_count(), len(parallel_batches))
+        if workers_count < 2 or self.pool.in_test_mode():
+            return {}
+
+        snapshot_id = self._export_parallel_snapshot()
+        if not snapshot_id:
+            return {}
+
+        uid, context, su = self.env.uid, self.env.context, self.env.su
+
+        def compute_batch(engine, batch_key, formulas_dict):
+            worker_cr = self._get_parallel_worker_cursor(snapshot_id)
+            try:
+                worker_env = api.Environment(worker_cr, uid, context, su=su)
+                date_scope, current_groupby, next_groupby = batch_key
+                batch_results = self.with_env(worker_env)._compute_formula_batch_for_column_groups(
+                    options_per_group,
+                    engine,
+                    date_scope,
+                    {formula: expressions.with_env(worker_env) for formula, expressions in formulas_dict.items()},
+                    current_groupby,
+                    next_groupby,
+                    offset=offset,
+                    limit=limit,
+                )
+            finally:
+                worker_cr.rollback()
+                worker_cr.close()
+
+            # The results are keyed by (formula, expressions); give them back the expressions of the current environment.
+            return {
+                group_key: {(formula, expressions.with_env(self.env)): formula_rslt for (formula, expressions), formula_rslt in formula_results.items()}
+                for group_key, formula_results in batch_results.items()
+            }
+
+        with ThreadPoolExecutor(max_workers=workers_count, thread_name_prefix='account_report_worker') as executor:
+            futures = {
+                (engine, batch_key): executor.submit(compute_batch, engine, batch_key, formulas_dict)
+                for engine, batch_key, formulas_dict in parallel_batches
+            }
+            return {batch: future.result() for batch, future in futures.items()}
+
+    def _export_parallel_snapshot(self):
+        """ Exports the snapshot of the current transaction for the worker cursors of _compute_formula_batches_in_parallel.
+
+        :return: The id of the exported snapshot, or None if the current transaction has already written in the database, as an exported
+                 snapshot doesn't include the uncommitted changes of the exporting transaction.
+        """
+        self.env.flush_all()
+        self._cr.execute("SELECT txid_current_if_assigned()")
+        if self._cr.fetchone()[0] is not None:
+            return None
+
+        self._cr.execute("SELECT pg_export_snapshot()")
+        return self._cr.fetchone()[0]
+
+    def _get_parallel_worker_cursor(self, snapshot_id):
+        """ Returns a new read-only cursor seeing the data of the snapshot exported by _export_parallel_snapshot. The caller is responsible
+        for closing it.
+        """
+        worker_cr = sql_db.db_connect(self._cr.dbname).cursor()
+        try:
+            worker_cr.execute("SET TRANSACTION SNAPSHOT %s", [snapshot_id])
+            worker_cr.execute("SET TRANSACTION READ ONLY")
+        except Exception:
+            worker_cr.close()
+            raise
+        return worker_cr
+
     def _compute_formula_batch_with_engine_tax_tags(self, options, date_scope, formulas_dict, current_groupby, next_groupby, offset=0, limit=None):
         """ Report engine.
 
@@ -2559,55 +3058,67 @@ class AccountReport(models.Model):
 
         This engine does not support any subformula.
         """
+        column_group_key = options.get('owner_column_group')
+        return self._compute_formula_batch_for_column_groups_with_engine_tax_tags(
+            {column_group_key: options}, date_scope, formulas_dict, current_groupby, next_groupby, offset=offset, limit=limit,
+        )[column_group_key]
+
+    def _compute_formula_batch_for_column_groups_with_engine_tax_tags(self, options_per_group, date_scope, formulas_dict, current_groupby, next_groupby, offset=0, limit=None):
+        """ Evaluates the tax_tags engine for several column groups at once ; see _compute_formula_batch_with_engine_tax_tags.
+        """
         self._check_groupby_fields((next_groupby.split(',') if next_groupby else []) + ([current_groupby] if current_groupby else []))
         all_expressions = self.env['account.report.expression']
         for expressions in formulas_dict.values():
             all_expressions |= expressions
         tags = all_expressions._get_matching_tags()
 
-        currency_table_query = self.env['res.currency']._get_query_currency_table(options)
         groupby_sql = f'account_move_line.{current_groupby}' if current_groupby else None
-        tables, where_clause, where_params = self._query_get(options, date_scope)
         tail_query, tail_params = self._get_engine_query_tail(offset, limit)
         if self.pool['account.account.tag'].name.translate:
             lang = self.env.user.lang or get_lang(self.env).code
             acc_tag_name = f"COALESCE(acc_tag.name->>'{lang}', acc_tag.name->>'en_US')"
         else:
             acc_tag_name = 'acc_tag.name'
-        sql = f"""
-            SELECT
-                SUBSTRING({acc_tag_name}, 2, LENGTH({acc_tag_name}) - 1) AS formula,
-                SUM(ROUND(COALESCE(account_move_line.balance, 0) * currency_table.rate, currency_table.precision)
-                    * CASE WHEN acc_tag.tax_negate THEN -1 ELSE 1 END
-                    * CASE WHEN account_move_line.tax_tag_invert THEN -1 ELSE 1 END
-                ) AS balance,
-                COUNT(account_move_line.id) AS aml_count
-                {f', {groupby_sql} AS grouping_key' if groupby_sql else ''}
-
-            FROM {tables}
-
-            JOIN account_account_tag_account_move_line_rel aml_tag
-                ON aml_tag.account_move_line_id = account_move_line.id
-            JOIN account_account_tag acc_tag
-                ON aml_tag.account_account_tag_id = acc_tag.id
-                AND acc_tag.id IN %s
-            JOIN {currency_table_query}
-                ON currency_table.company_id = account_move_line.company_id
-
-            WHERE {where_clause}
-
-            GROUP BY SUBSTRING({acc_tag_name}, 2, LENGTH({acc_tag_name}) - 1)
-                {f', {groupby_sql}' if groupby_sql else ''}
-
-            {tail_query}
-        """
 
-        params = [tuple(tags.ids)] + where_params + tail_params
-        self._cr.execute(sql, params)
+        queries = []
+        params = []
+        for tables, where_clause, where_params, currency_table_query in self._query_get_for_column_groups(options_per_group, date_scope):
+            queries.append(f"""
+                SELECT
+                    column_group.column_group_key AS column_group_key,
+                    SUBSTRING({acc_tag_name}, 2, LENGTH({acc_tag_name}) - 1) AS formula,
+                    SUM(ROUND(COALESCE(account_move_line.balance, 0) * currency_table.rate, currency_table.precision)
+                        * CASE WHEN acc_tag.tax_negate THEN -1 ELSE 1 END
+                        * CASE WHEN account_move_line.tax_tag_invert THEN -1 ELSE 1 END
+                    ) AS balance,
+                    COUNT(account_move_line.id) AS aml_count
+                    {f', {groupby_sql} AS grouping_key' if groupby_sql else ''}
+
+                FROM {tables}
 
-        rslt = {formula_expr: [] if current_groupby else {'result': 0, 'has_sublines': False} for formula_expr in formulas_dict.items()}
-        for query_res in self._cr.dictfetchall():
+                JOIN account_account_tag_account_move_line_rel aml_tag
+                    ON aml_tag.account_move_line_id = account_move_line.id
+                JOIN account_account_tag acc_tag
+                    ON aml_tag.account_account_tag_id = acc_tag.id
+                    AND acc_tag.id IN %s
+                JOIN {currency_table_query}
+                    ON currency_table.company_id = account_move_line.company_id
+
+                WHERE {where_clause}
+
+                GROUP BY column_group.column_group_key, SUBSTRING({acc_tag_name}, 2, LENGTH({acc_tag_name}) - 1)
+                    {f', {groupby_sql}' if groupby_sql else ''}
+            """)
+            params += [tuple(tags.ids)] + where_params
 
+        self._cr.execute(f"{' UNION ALL '.join(queries)} {tail_query}", params + tail_params)
+
+        rslt_per_group = {
+            group_key: {formula_expr: [] if current_groupby else {'result': 0, 'has_sublines': False} for formula_expr in formulas_dict.items()}
+            for group_key in options_per_group
+        }
+        for query_res in self._cr.dictfetchall():
+            rslt = rslt_per_group[query_res['column_group_key']]
             formula = query_res['formula']
             rslt_dict = {'result': query_res['balance'], 'has_sublines': query_res['aml_count'] > 0}
             for formula_expr in formulas_dict[formula]:
@@ -2616,7 +3127,7 @@ class AccountReport(models.Model):
                 else:
                     rslt[(formula, formula_expr)] = rslt_dict
 
-        return rslt
+        return rslt_per_group
 
     def _compute_formula_batch_with_engine_domain(self, options, date_scope, formulas_dict, current_groupby, next_groupby, offset=0, limit=None):
         """ Report engine.
@@ -2634,6 +3145,14 @@ class AccountReport(models.Model):
                       then it will be the number of matching amls. If there is a groupby, it will be the number of distinct grouping
                       keys at the first level of this groupby (so, if groupby is 'partner_id, account_id', the number of partners).
         """
+        column_group_key = options.get('owner_column_group')
+        return self._compute_formula_batch_for_column_groups_with_engine_domain(
+            {column_group_key: options}, date_scope, formulas_dict, current_groupby, next_groupby, offset=offset, limit=limit,
+        )[column_group_key]
+
+    def _compute_formula_batch_for_column_groups_with_engine_domain(self, options_per_group, date_scope, formulas_dict, current_groupby, next_groupby, offset=0, limit=None):
+        """ Evaluates the domain engine for several column groups at once ; see _compute_formula_batch_with_engine_domain.
+        """
         def _format_result_depending_on_groupby(formula_rslt):
             if not current_groupby:
                 if formula_rslt:
@@ -2654,44 +3173,57 @@ class AccountReport(models.Model):
         self._check_groupby_fields((next_groupby.split(',') if next_groupby else []) + ([current_groupby] if current_groupby else []))
 
         groupby_sql = f'account_move_line.{current_groupby}' if current_groupby else None
-        ct_query = self.env['res.currency']._get_query_currency_table(options)
+        count_rows_field = next_groupby.split(',')[0] if next_groupby else 'id'
+        tail_query, tail_params = self._get_engine_query_tail(offset, limit)
 
-        rslt = {}
+        rslt_per_group = {group_key: {} for group_key in options_per_group}
 
         for formula, expressions in formulas_dict.items():
             line_domain = literal_eval(formula)
-            tables, where_clause, where_params = self._query_get(options, date_scope, domain=line_domain)
 
-            tail_query, tail_params = self._get_engine_query_tail(offset, limit)
-            query = f"""
-                SELECT
-                    COALESCE(SUM(ROUND(account_move_line.balance * currency_table.rate, currency_table.precision)), 0.0) AS sum,
-                    COUNT(DISTINCT account_move_line.{next_groupby.split(',')[0] if next_groupby else 'id'}) AS count_rows
-                    {f', {groupby_sql} AS grouping_key' if groupby_sql else ''}
-                FROM {tables}
-                JOIN {ct_query} ON currency_table.company_id = account_move_line.company_id
-                WHERE {where_clause}
-                {f' GROUP BY {groupby_sql}' if groupby_sql else ''}
-                {tail_query}
-            """
+            queries = []
+            params = []
+
+            # Column groups whose totals can be read from the balance cache
+            live_options_per_group = {}
+            for group_key, group_options in options_per_group.items():
+                cached_totals = current_groupby in (None, 'account_id') and count_rows_field in ('id', 'account_id') \
+                                and self._get_balance_cache_account_totals_query(group_options, date_scope, domain=line_domain)
+                if cached_totals:
+                    totals_query, totals_params = cached_totals
+                    queries.append(f"""
+                        SELECT
+                            %s AS column_group_key,
+                            COALESCE(SUM(totals.sum), 0.0) AS sum,
+                            {'COALESCE(SUM(totals.aml_count), 0)::integer' if count_rows_field == 'id' else 'COUNT(DISTINCT totals.account_id)'} AS count_rows
+                            {', totals.account_id AS grouping_key' if current_groupby else ''}
+                        FROM ({totals_query}) totals
+                        {' GROUP BY totals.account_id' if current_groupby else ''}
+                    """)
+                    params += [group_key, *totals_params]
+                else:
+                    live_options_per_group[group_key] = group_options
+
+            # Column groups whose totals need to be computed from account_move_line
+            for tables, where_clause, where_params, ct_query in self._query_get_for_column_groups(live_options_per_group, date_scope, domain=line_domain):
+                queries.append(f"""
+                    SELECT
+                        column_group.column_group_key AS column_group_key,
+                        COALESCE(SUM(ROUND(account_move_line.balance * currency_table.rate, currency_table.precision)), 0.0) AS sum,
+                        COUNT(DISTINCT account_move_line.{count_rows_field}) AS count_rows
+                        {f', {groupby_sql} AS grouping_key' if groupby_sql else ''}
+                    FROM {tables}
+                    JOIN {ct_query} ON currency_table.company_id = account_move_line.company_id
+                    WHERE {where_clause}
+                    GROUP BY column_group.column_group_key{f', {groupby_sql}' if groupby_sql else ''}
+                """)
+                params += where_params
 
             # Fetch the results.
-            formula_rslt = []
-            self._cr.execute(query, where_params + tail_params)
-            all_query_res = self._cr.dictfetchall()
-
-            total_sum = 0
-            for query_res in all_query_res:
-                res_sum = query_res['sum']
-                total_sum += res_sum
-                totals = {
-                    'sum': res_sum,
-                    'sum_if_pos': 0,
-                    'sum_if_neg': 0,
-                    'count_rows': query_res['count_rows'],
-                    'has_sublines': query_res['count_rows'] > 0,
-                }
-                formula_rslt.append((query_res.get('grouping_key', None), totals))
+            self._cr.execute(f"{' UNION ALL '.join(queries)} {tail_query}", params + tail_params)
+            all_query_res_per_group = defaultdict(list)
+            for query_res in self._cr.dictfetchall():
+                all_query_res_per_group[query_res['column_group_key']].append(query_res)
 
             # Handle sum_if_pos, -sum_if_pos, sum_if_neg and -sum_if_neg
             expressions_by_sign_policy = defaultdict(lambda: self.env['account.report.expression'])
@@ -2702,27 +3234,42 @@ class AccountReport(models.Model):
                 else:
                     expressions_by_sign_policy['no_sign_check'] += expression
 
-            # Then we have to check the total of the line and only give results if its sign matches the desired policy.
-            # This is important for groupby managements, for which we can't just check the sign query_res by query_res
-            if expressions_by_sign_policy['sum_if_pos'] or expressions_by_sign_policy['sum_if_neg']:
-                sign_policy_with_value = 'sum_if_pos' if self.env.company.currency_id.compare_amounts(total_sum, 0.0) >= 0 else 'sum_if_neg'
-                # >= instead of > is intended; usability decision: 0 is considered positive
+            for group_key, rslt in rslt_per_group.items():
+                formula_rslt = []
+                total_sum = 0
+                for query_res in all_query_res_per_group[group_key]:
+                    res_sum = query_res['sum']
+                    total_sum += res_sum
+                    totals = {
+                        'sum': res_sum,
+                        'sum_if_pos': 0,
+                        'sum_if_neg': 0,
+                        'count_rows': query_res['count_rows'],
+                        'has_sublines': query_res['count_rows'] > 0,
+                    }
+                    formula_rslt.append((query_res.get('grouping_key', None), totals))
 
-                formula_rslt_with_sign = [(grouping_key, {**totals, sign_policy_with_value: totals['sum']}) for grouping_key, totals in formula_rslt]
+                # Then we have to check the total of the line and only give results if its sign matches the desired policy.
+                # This is important for groupby managements, for which we can't just check the sign query_res by query_res
+                if expressions_by_sign_policy['sum_if_pos'] or expressions_by_sign_policy['sum_if_neg']:
+                    sign_policy_with_value = 'sum_if_pos' if self.env.company.currency_id.compare_amounts(total_sum, 0.0) >= 0 else 'sum_if_neg'
+                    # >= instead of > is intended; usability decision: 0 is considered positive
 
-                for sign_policy in ('sum_if_pos', 'sum_if_neg'):
-                    policy_expressions = expressions_by_sign_policy[sign_policy]
+                    formula_rslt_with_sign = [(grouping_key, {**totals, sign_policy_with_value: totals['sum']}) for grouping_key, totals in formula_rslt]
 
-                    if policy_expressions:
-                        if sign_policy == sign_policy_with_value:
-                            rslt[(formula, policy_expressions)] = _format_result_depending_on_groupby(formula_rslt_with_sign)
-                        else:
-                            rslt[(formula, policy_expressions)] = _format_result_depending_on_groupby([])
+                    for sign_policy in ('sum_if_pos', 'sum_if_neg'):
+                        policy_expressions = expressions_by_sign_policy[sign_policy]
 
-            if expressions_by_sign_policy['no_sign_check']:
-                rslt[(formula, expressions_by_sign_policy['no_sign_check'])] = _format_result_depending_on_groupby(formula_rslt)
+                        if policy_expressions:
+                            if sign_policy == sign_policy_with_value:
+                                rslt[(formula, policy_expressions)] = _format_result_depending_on_groupby(formula_rslt_with_sign)
+                            else:
+                                rslt[(formula, policy_expressions)] = _format_result_depending_on_groupby([])
 
-        return rslt
+                if expressions_by_sign_policy['no_sign_check']:
+                    rslt[(formula, expressions_by_sign_policy['no_sign_check'])] = _format_result_depending_on_groupby(formula_rslt)
+
+        return rslt_per_group
 
     def _compute_formula_batch_with_engine_account_codes(self, options, date_scope, formulas_dict, current_groupby, next_groupby, offset=0, limit=None):
         r""" Report engine.
@@ -2749,136 +3296,185 @@ class AccountReport(models.Model):
         Example 1: '123D\' will take the total balance of accounts starting with '123D'
         Example 2: '123D\C' will return the balance of accounts starting with '123D' if it's negative, 0 otherwise.
         """
+        column_group_key = options.get('owner_column_group')
+        return self._compute_formula_batch_for_column_groups_with_engine_account_codes(
+            {column_group_key: options}, date_scope, formulas_dict, current_groupby, next_groupby, offset=offset, limit=limit,
+        )[column_group_key]
+
+    def _compute_formula_batch_for_column_groups_with_engine_account_codes(self, options_per_group, date_scope, formulas_dict, current_groupby, next_groupby, offset=0, limit=None):
+        """ Evaluates the account_codes engine for several column groups at once ; see _compute_formula_batch_with_engine_account_codes.
+        """
         self._check_groupby_fields((next_groupby.split(',') if next_groupby else []) + ([current_groupby] if current_groupby else []))
 
-        # Gather the account code prefixes to compute the total from
-        prefix_details_by_formula = {}  # in the form {formula: [(1, prefix1), (-1, prefix2)]}
-        prefixes_to_compute = set()
+        # Gather the accounts matched by each term of the formulas, using the compiled formulas and the account codes index
+        company_ids = tuple(sorted({
+            comp_opt['id']
+            for group_options in options_per_group.values()
+            for comp_opt in group_options.get('multi_company', self.env.company)
+        }))
+        prefix_details_by_formula = {}  # in the form {formula: [(1, prefix_key1, balance_character1), (-1, prefix_key2, balance_character2)]}
+        account_ids_by_prefix_key = {}
         for formula in formulas_dict:
             prefix_details_by_formula[formula] = []
-            for token in ACCOUNT_CODES_ENGINE_SPLIT_REGEX.split(formula.replace(' ', '')):
-                if token:
-                    token_match = ACCOUNT_CODES_ENGINE_TERM_REGEX.match(token)
+            for multiplicator, prefix, excluded_prefixes, balance_character in self._parse_account_codes_formula(formula):
+                # We group using both prefix and excluded_prefixes as keys, for the case where two expressions would
+                # include the same prefix, but exlcude different prefixes (example 104\(1041) and 104\(1042))
+                prefix_key = (prefix, *excluded_prefixes)
+                prefix_details_by_formula[formula].append((multiplicator, prefix_key, balance_character))
+                if prefix_key not in account_ids_by_prefix_key:
+                    account_ids_by_prefix_key[prefix_key] = self._get_account_ids_matching_codes_prefix(company_ids, prefix, excluded_prefixes)
 
-                    if not token_match:
-                        raise UserError(_("Invalid token '%s' in account_codes formula '%s'", token, formula))
+        # Run main query
+        tail_query, tail_params = self._get_engine_query_tail(offset, limit)
+        queries = []
+        params = []
 
-                    parsed_token = token_match.groupdict()
+        # Column groups whose totals can be read from the balance cache
+        live_options_per_group = {}
+        for group_key, group_options in options_per_group.items():
+            cached_totals = current_groupby in (None, 'account_id') and self._get_balance_cache_account_totals_query(group_options, date_scope)
+            if cached_totals:
+                totals_query, totals_params = cached_totals
+                queries.append(f"""
+                    SELECT
+                        %s AS column_group_key,
+                        totals.account_id AS account_id,
+                        totals.sum AS sum,
+                        totals.aml_count AS aml_count
+                        {', totals.account_id AS grouping_key' if current_groupby else ''}
+                    FROM ({totals_query}) totals
+                """)
+                params += [group_key, *totals_params]
+            else:
+                live_options_per_group[group_key] = group_options
 
-                    if not parsed_token:
-                        raise UserError(_("Could not parse account_code formula from token '%s'", token))
+        # Column groups whose totals need to be computed from account_move_line
+        extra_groupby_sql = f', account_move_line.{current_groupby}' if current_groupby else ''
+        extra_select_sql = f', account_move_line.{current_groupby} AS grouping_key' if current_groupby else ''
+        for tables, where_clause, where_params, currency_table_query in self._query_get_for_column_groups(live_options_per_group, date_scope):
+            queries.append(f"""
+                SELECT
+                    column_group.column_group_key AS column_group_key,
+                    account_move_line.account_id AS account_id,
+                    SUM(ROUND(account_move_line.balance * currency_table.rate, currency_table.precision)) AS sum,
+                    COUNT(account_move_line.id) AS aml_count
+                    {extra_select_sql}
+                FROM {tables}
+                JOIN {currency_table_query} ON currency_table.company_id = account_move_line.company_id
+                WHERE {where_clause}
+                GROUP BY column_group.column_group_key, account_move_line.account_id{extra_groupby_sql}
+            """)
+            params += where_params
 
-                    multiplicator = -1 if parsed_token['sign'] == '-' else 1
-                    excluded_prefixes_match = token_match['excluded_prefixes']
-                    excluded_prefixes = excluded_prefixes_match.split(',') if excluded_prefixes_match else []
-                    prefix = token_match['prefix']
+        self._cr.execute(f"{' UNION ALL '.join(queries)} {tail_query}", params + tail_params)
 
-                    # We group using both prefix and excluded_prefixes as keys, for the case where two expressions would
-                    # include the same prefix, but exlcude different prefixes (example 104\(1041) and 104\(1042))
-                    prefix_key = (prefix, *excluded_prefixes)
-                    prefix_details_by_formula[formula].append((multiplicator, prefix_key, token_match['balance_character']))
-                    prefixes_to_compute.add((prefix, tuple(excluded_prefixes)))
+        # Parse result
+        results_by_account_per_group = {group_key: defaultdict(list) for group_key in options_per_group}
+        for query_res in self._cr.dictfetchall():
+            # Done this way so that we can run similar code for groupby and non-groupby
+            grouping_key = query_res['grouping_key'] if current_groupby else None
+            results_by_account_per_group[query_res['column_group_key']][query_res['account_id']].append(
+                (grouping_key, {'result': query_res['sum'], 'has_sublines': query_res['aml_count'] > 0})
+            )
 
-        # Create the subquery for the WITH linking our prefixes with account.account entries
-        all_prefixes_queries = []
-        prefix_params = []
-        company_ids = [comp_opt['id'] for comp_opt in options.get('multi_company', self.env.company)]
-        for prefix, excluded_prefixes in prefixes_to_compute:
-            account_domain = [('company_id', 'in', company_ids), ('code', '=like', f'{prefix}%')]
-            excluded_prefixes_domains = []
+        company_currency = self.env.company.currency_id
+        rslt_per_group = {}
+        for group_key, results_by_account in results_by_account_per_group.items():
+            # Aggregate the results of each account, and of each term, only once ; many formulas share the same terms.
+            account_totals = {
+                account_id: (sum(group_val['result'] for dummy, group_val in account_results), any(group_val['has_sublines'] for dummy, group_val in account_results))
+                for account_id, account_results in results_by_account.items()
+            }
+            account_signs = {account_id: company_currency.compare_amounts(total, 0.0) for account_id, (total, dummy) in account_totals.items()}
+            term_account_ids_cache = {}
 
-            for excluded_prefix in excluded_prefixes:
-                excluded_prefixes_domains.append([('code', '=like', f'{excluded_prefix}%')])
+            def get_term_account_ids(prefix_key, balance_character):
+                cache_key = (prefix_key, balance_character)
+                if cache_key not in term_account_ids_cache:
+                    # Manage balance_character.
+                    term_account_ids_cache[cache_key] = [
+                        account_id
+                        for account_id in sorted(account_ids_by_prefix_key[prefix_key] & account_totals.keys())
+                        if not balance_character or (balance_character == 'D' and account_signs[account_id] >= 0) or (balance_character == 'C' and account_signs[account_id] < 0)
+                    ]
+                return term_account_ids_cache[cache_key]
+
+            rslt = rslt_per_group[group_key] = {}
+            for formula, prefix_details in prefix_details_by_formula.items():
+                rslt_key = (formula, formulas_dict[formula])
+                if current_groupby:
+                    rslt_destination = rslt.setdefault(rslt_key, [])
+                    for multiplicator, prefix_key, balance_character in prefix_details:
+                        for account_id in get_term_account_ids(prefix_key, balance_character):
+                            for account_group_key, group_val in results_by_account[account_id]:
+                                rslt_destination.append((account_group_key, {**group_val, 'result': multiplicator * group_val['result']}))
+                else:
+                    formula_total = 0
+                    formula_has_sublines = False
+                    for multiplicator, prefix_key, balance_character in prefix_details:
+                        term_account_ids = get_term_account_ids(prefix_key, balance_character)
+                        formula_total += multiplicator * sum(account_totals[account_id][0] for account_id in term_account_ids)
+                        formula_has_sublines = formula_has_sublines or any(account_totals[account_id][1] for account_id in term_account_ids)
+                    rslt[rslt_key] = {'result': formula_total, 'has_sublines': formula_has_sublines}
 
-            if excluded_prefixes_domains:
-                account_domain.append('!')
-                account_domain += osv.expression.OR(excluded_prefixes_domains)
+        return rslt_per_group
 
-            prefix_tables, prefix_where_clause, prefix_where_params = self.env['account.account']._where_calc(account_domain).get_sql()
+    @api.model
+    @tools.ormcache('formula')
+    def _parse_account_codes_formula(self, formula):
+        """ Parses an account_codes formula into a tuple of terms, each of them in the form
+        (multiplicator, prefix, excluded_prefixes, balance_character).
 
-            prefix_params.append(prefix)
-            for excluded_prefix in excluded_prefixes:
-                prefix_params.append(excluded_prefix)
+        The result is cached, so that the formulas of a report are only tokenized once, instead of at each evaluation.
+        """
+        terms = []
+        for token in ACCOUNT_CODES_ENGINE_SPLIT_REGEX.split(formula.replace(' ', '')):
+            if token:
+                token_match = ACCOUNT_CODES_ENGINE_TERM_REGEX.match(token)
 
-            prefix_select_query = ', '.join(['%s'] * (len(excluded_prefixes) + 1)) # +1 for prefix
-            prefix_select_query = f'ARRAY[{prefix_select_query}]'
+                if not token_match:
+                    raise UserError(_("Invalid token '%s' in account_codes formula '%s'", token, formula))
 
-            all_prefixes_queries.append(f"""
-                SELECT
-                    {prefix_select_query} AS prefix,
-                    account_account.id AS account_id
-                FROM {prefix_tables}
-                WHERE {prefix_where_clause}
-            """)
-            prefix_params += prefix_where_params
+                parsed_token = token_match.groupdict()
 
-        # Build a map to associate each account with the prefixes it matches
-        accounts_prefix_map = defaultdict(list)
-        self._cr.execute(' UNION ALL '.join(all_prefixes_queries), prefix_params)
-        for prefix, account_id in self._cr.fetchall():
-            accounts_prefix_map[account_id].append(tuple(prefix))
+                if not parsed_token:
+                    raise UserError(_("Could not parse account_code formula from token '%s'", token))
 
-        # Run main query
-        tables, where_clause, where_params = self._query_get(options, date_scope)
+                multiplicator = -1 if parsed_token['sign'] == '-' else 1
+                excluded_prefixes_match = token_match['excluded_prefixes']
+                excluded_prefixes = tuple(excluded_prefixes_match.split(',')) if excluded_prefixes_match else ()
+                terms.append((multiplicator, token_match['prefix'], excluded_prefixes, token_match['balance_character']))
+        return tuple(terms)
 
-        currency_table_query = self.env['res.currency']._get_query_currency_table(options)
-        extra_groupby_sql = f', account_move_line.{current_groupby}' if current_groupby else ''
-        extra_select_sql = f', account_move_line.{current_groupby} AS grouping_key' if current_groupby else ''
-        tail_query, tail_params = self._get_engine_query_tail(offset, limit)
+    @api.model
+    @tools.ormcache('company_ids')
+    def _get_account_codes_index(self, company_ids):
+        """ Returns the codes of all the accounts of the provided companies, sorted, along with the corresponding account ids, as
+        a tuple (codes, account_ids). The accounts whose code starts with a given prefix are contiguous in it, so they can be found
+        by bisection, instead of querying account_account for each prefix.
 
-        query = f"""
-            SELECT
-                account_move_line.account_id AS account_id,
-                SUM(ROUND(account_move_line.balance * currency_table.rate, currency_table.precision)) AS sum,
-                COUNT(account_move_line.id) AS aml_count
-                {extra_select_sql}
-            FROM {tables}
-            JOIN {currency_table_query} ON currency_table.company_id = account_move_line.company_id
-            WHERE {where_clause}
-            GROUP BY account_move_line.account_id{extra_groupby_sql}
-            {tail_query}
+        The result is cached; the cache is cleared whenever the code or company of an account changes.
         """
-        self._cr.execute(query, where_params + tail_params)
+        self.env['account.account'].flush_model(['code', 'company_id'])
+        self._cr.execute("SELECT code, id FROM account_account WHERE company_id IN %s", [company_ids])
+        sorted_accounts = sorted(self._cr.fetchall())
+        return tuple(code for code, dummy in sorted_accounts), tuple(account_id for dummy, account_id in sorted_accounts)
 
-        # Parse result
-        rslt = {}
-
-        res_by_prefix_account_id = {}
-        for query_res in self._cr.dictfetchall():
-            # Done this way so that we can run similar code for groupby and non-groupby
-            grouping_key = query_res['grouping_key'] if current_groupby else None
-            account_id = query_res['account_id']
-            for prefix_key in accounts_prefix_map[account_id]:
-                res_by_prefix_account_id.setdefault(prefix_key, {})\
-                                        .setdefault(account_id, [])\
-                                        .append((grouping_key, {'result': query_res['sum'], 'has_sublines': query_res['aml_count'] > 0}))
-
-        for formula, prefix_details in prefix_details_by_formula.items():
-            rslt_key = (formula, formulas_dict[formula])
-            rslt_destination = rslt.setdefault(rslt_key, [] if current_groupby else {'result': 0, 'has_sublines': False})
-            for multiplicator, prefix_key, balance_character in prefix_details:
-                res_by_account_id = res_by_prefix_account_id.get(prefix_key, {})
-
-                for account_results in res_by_account_id.values():
-                    account_total_value = sum(group_val['result'] for (group_key, group_val) in account_results)
-                    comparator = self.env.company.currency_id.compare_amounts(account_total_value, 0.0)
-
-                    # Manage balance_character.
-                    if not balance_character or (balance_character == 'D' and comparator >= 0) or (balance_character == 'C' and comparator < 0):
-
-                        for group_key, group_val in account_results:
-                            rslt_group = {
-                                **group_val,
-                                'result': multiplicator * group_val['result'],
-                            }
+    @api.model
+    def _get_account_ids_matching_codes_prefix(self, company_ids, prefix, excluded_prefixes=()):
+        """ Returns the set of the ids of the accounts of the provided companies whose code starts with prefix, but with none of
+        the excluded_prefixes.
+        """
+        codes, account_ids = self._get_account_codes_index(company_ids)
 
-                            if current_groupby:
-                                rslt_destination.append((group_key, rslt_group))
-                            else:
-                                rslt_destination['result'] += rslt_group['result']
-                                rslt_destination['has_sublines'] = rslt_destination['has_sublines'] or rslt_group['has_sublines']
+        def get_prefix_slice(code_prefix):
+            # All the codes starting with code_prefix are sorted between code_prefix and code_prefix followed by the highest character
+            return slice(bisect.bisect_left(codes, code_prefix), bisect.bisect_left(codes, code_prefix + chr(sys.maxunicode)))
 
-        return rslt
+        matching_account_ids = set(account_ids[get_prefix_slice(prefix)])
+        for excluded_prefix in excluded_prefixes:
+            matching_account_ids.difference_update(account_ids[get_prefix_slice(excluded_prefix)])
+        return matching_account_ids
 
     def _compute_formula_batch_with_engine_external(self, options, date_scope, formulas_dict, current_groupby, next_groupby, offset=0, limit=None):
         """ Report engine.
@@ -3847,6 +4443,43 @@ class AccountReport(models.Model):
 
         return self._add_totals_below_sections(rslt, options)
 
+    def _iter_expanded_unfoldable_line(self, line_dict, options, unfold_all_batch_data=None):
+        """ Yields the sublines of line_dict, as returned by _expand_unfoldable_line.
+
+        When a chunk size is set in the context by a streaming export (see _get_load_more_limit), the expand function is
+        called once per chunk of sublines, instead of returning a 'load more' line, so that the sublines of a line never
+        all need to be held in memory at the same time.
+        """
+        expand_function_name = line_dict['expand_function']
+        groupby = line_dict.get('groupby')
+        progress = line_dict.get('progress')
+
+        if not self._context.get('account_report_expand_chunk_size'):
+            yield from self._expand_unfoldable_line(expand_function_name, line_dict['id'], groupby, options, progress, 0, unfold_all_batch_data=unfold_all_batch_data)
+            return
+
+        if not progress:
+            progress = {column_group_key: 0 for column_group_key in options['column_groups']}
+
+        expand_function = self._get_custom_report_function(expand_function_name, 'expand_unfoldable_line')
+        offset = 0
+        after_load_more_lines = []
+        while True:
+            expansion_result = expand_function(line_dict['id'], groupby, options, progress, offset, unfold_all_batch_data=None)
+            yield from self._add_totals_below_sections(expansion_result['lines'], options)
+            after_load_more_lines += expansion_result.get('after_load_more_lines', [])
+
+            if not expansion_result.get('has_more'):
+                break
+
+            offset += expansion_result['offset_increment']
+            next_progress = expansion_result.get('progress')
+            if next_progress:
+                # Expand functions return their progress json-formatted, as they would for a 'load more' line
+                progress = json.loads(next_progress) if isinstance(next_progress, str) else next_progress
+
+        yield from self._add_totals_below_sections(after_load_more_lines, options)
+
     def _add_totals_below_sections(self, lines, options):
         """ Returns a new list, corresponding to lines with the required total lines added as sublines of the sections it contains.
         """
@@ -3889,6 +4522,17 @@ class AccountReport(models.Model):
 
         return lines
 
+    def _get_load_more_limit(self):
+        """ Returns the maximum number of sublines an expand function should return at once, or None if they should all be returned.
+
+        When printing, all the sublines are loaded at once, unless a streaming export asked to generate them chunk by chunk, using
+        the 'account_report_expand_chunk_size' context key.
+        """
+        self.ensure_one()
+        if self._context.get('print_mode'):
+            return self._context.get('account_report_expand_chunk_size') or None
+        return self.load_more_limit or None
+
     @api.model
     def _get_load_more_line(self, offset, parent_line_id, expand_function_name, groupby, progress, options):
         """ Returns a 'Load more' line allowing to reach the subsequent elements of an unfolded line with an expand function if the maximum
@@ -3935,17 +4579,16 @@ class AccountReport(models.Model):
 
         line = self.env['account.report.line'].browse(report_line_id)
 
-        if ',' not in groupby and not self._context.get('print_mode'):
+        if ',' not in groupby:
             # if ',' not in groupby, then its a terminal groupby (like 'id' in 'partner_id, id'), so we can use the 'load more' feature if necessary
-            # When printing, we want to ignore the limit.
-            limit_to_load = self.load_more_limit or None
+            limit_to_load = self._get_load_more_limit()
         else:
             # Else, we disable it
             limit_to_load = None
             offset = 0
 
         rslt_lines = line._expand_groupby(line_dict_id, groupby, options, offset=offset, limit=limit_to_load, load_one_more=bool(limit_to_load), unfold_all_batch_data=unfold_all_batch_data)
-        lines_to_load = rslt_lines[:self.load_more_limit] if limit_to_load else rslt_lines
+        lines_to_load = rslt_lines[:limit_to_load] if limit_to_load else rslt_lines
 
         if not limit_to_load and not self._context.get('print_mode'):
             lines_to_load = self._regroup_lines_by_name_prefix(options, rslt_lines, '_report_expand_unfoldable_line_groupby_prefix_group', line.hierarchy_level,
@@ -4270,28 +4913,82 @@ class AccountReport(models.Model):
         """ Returns a list containing all the lines of the provided list that need to be displayed when printing,
         hence removing the children whose parent is folded (especially useful to remove total lines).
         """
-        rslt = []
+        return list(self._iter_filter_out_folded_children(lines))
+
+    def _iter_filter_out_folded_children(self, lines):
+        """ Generator version of _filter_out_folded_children, accepting any iterable of lines. """
         folded_lines = set()
         for line in lines:
             if line.get('unfoldable') and not line.get('unfolded'):
                 folded_lines.add(line['id'])
 
             if 'parent_id' not in line or line['parent_id'] not in folded_lines:
-                rslt.append(line)
-        return rslt
+                yield line
 
     def export_to_xlsx(self, options, response=None):
-        def write_with_colspan(sheet, x, y, value, colspan, style):
-            if colspan == 1:
-                sheet.write(y, x, value, style)
-            else:
-                sheet.merge_range(y, x, y, x + colspan - 1, value, style)
         self.ensure_one()
         output = io.BytesIO()
         workbook = xlsxwriter.Workbook(output, {
             'in_memory': True,
             'strings_to_formulas': False,
         })
+        self._inject_report_into_xlsx_workbook(options, workbook)
+        workbook.close()
+        output.seek(0)
+        generated_file = output.read()
+        output.close()
+
+        return {
+            'file_name': self.get_default_report_filename('xlsx'),
+            'file_content': generated_file,
+            'file_type': 'xlsx',
+        }
+
+    def export_to_xlsx_in_background(self, options):
+        """ Schedules a streaming export of this report to xlsx, for reports too big to be exported within a request.
+        The user gets notified with a download link once the file is ready.
+        """
+        self.ensure_one()
+        self.env['account.report.export.job']._schedule(self, options)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'type': 'info',
+                'message': _("The export has been scheduled. You will be notified when the file is ready."),
+                'sticky': False,
+            },
+        }
+
+    def _export_to_xlsx_file(self, options, file_path, chunk_size=5000):
+        """ Streaming version of export_to_xlsx, writing the report to the file at file_path.
+
+        The lines are generated chunk by chunk by the expand functions, and written to a constant memory workbook as soon as
+        they are generated, so that the memory used does not depend on the number of lines of the report.
+
+        :param chunk_size: The maximum number of sublines to get at once from the expand functions.
+        """
+        self.ensure_one()
+        workbook = xlsxwriter.Workbook(file_path, {
+            'constant_memory': True,
+            'strings_to_formulas': False,
+        })
+        self.with_context(account_report_expand_chunk_size=chunk_size)._inject_report_into_xlsx_workbook(options, workbook, stream_lines=True)
+        workbook.close()
+
+    def _inject_report_into_xlsx_workbook(self, options, workbook, stream_lines=False):
+        """ Writes the report into a new sheet of the provided xlsxwriter workbook.
+
+        :param stream_lines: Whether the lines should be written as they get generated (see _iter_lines) instead of being computed at once.
+                             This requires the workbook to be in constant_memory mode, in which merged cells are not supported. Sorting
+                             the lines still requires computing them all.
+        """
+        def write_with_colspan(sheet, x, y, value, colspan, style):
+            if colspan == 1 or stream_lines:
+                sheet.write(y, x, value, style)
+            else:
+                sheet.merge_range(y, x, y, x + colspan - 1, value, style)
+        self.ensure_one()
         sheet = workbook.add_worksheet(self.name[:31])
 
         date_default_col1_style = workbook.add_format({'font_name': 'Arial', 'font_size': 12, 'font_color': '#666666', 'indent': 2, 'num_format': 'yyyy-mm-dd'})
@@ -4315,7 +5012,10 @@ class AccountReport(models.Model):
         x_offset = 1 # 1 and not 0 to leave space for the line name
         print_mode_self = self.with_context(no_format=True, print_mode=True, prefetch_fields=False)
         print_options = print_mode_self._get_options(previous_options=options)
-        lines = self._filter_out_folded_children(print_mode_self._get_lines(print_options))
+        if stream_lines:
+            lines = self._iter_filter_out_folded_children(print_mode_self._iter_lines(print_options))
+        else:
+            lines = self._filter_out_folded_children(print_mode_self._get_lines(print_options))
 
         # Add headers.
         # For this, iterate in the same way as done in main_table_header template
@@ -4344,12 +5044,12 @@ class AccountReport(models.Model):
         y_offset += 1
 
         if print_options.get('order_column'):
-            lines = self._sort_lines(lines, print_options)
+            lines = self._sort_lines(list(lines), print_options)
 
         # Add lines.
-        for y in range(0, len(lines)):
-            level = lines[y].get('level')
-            if lines[y].get('caret_options'):
+        for y, line in enumerate(lines):
+            level = line.get('level')
+            if line.get('caret_options'):
                 style = level_3_style
                 col1_style = level_3_col1_style
             elif level == 0:
@@ -4361,42 +5061,31 @@ class AccountReport(models.Model):
                 col1_style = style
             elif level == 2:
                 style = level_2_style
-                col1_style = 'total' in lines[y].get('class', '').split(' ') and level_2_col1_total_style or level_2_col1_style
+                col1_style = 'total' in line.get('class', '').split(' ') and level_2_col1_total_style or level_2_col1_style
             elif level == 3:
                 style = level_3_style
-                col1_style = 'total' in lines[y].get('class', '').split(' ') and level_3_col1_total_style or level_3_col1_style
+                col1_style = 'total' in line.get('class', '').split(' ') and level_3_col1_total_style or level_3_col1_style
             else:
                 style = default_style
                 col1_style = default_col1_style
 
             #write the first column, with a specific style to manage the indentation
-            cell_type, cell_value = self._get_cell_type_value(lines[y])
+            cell_type, cell_value = self._get_cell_type_value(line)
             if cell_type == 'date':
                 sheet.write_datetime(y + y_offset, 0, cell_value, date_default_col1_style)
             else:
                 sheet.write(y + y_offset, 0, cell_value, col1_style)
 
             #write all the remaining cells
-            columns = lines[y]['columns']
-            if print_options['show_growth_comparison'] and 'growth_comparison_data' in lines[y]:
-                columns += [lines[y].get('growth_comparison_data')]
+            columns = line['columns']
+            if print_options['show_growth_comparison'] and 'growth_comparison_data' in line:
+                columns += [line.get('growth_comparison_data')]
             for x, column in enumerate(columns, start=1):
                 cell_type, cell_value = self._get_cell_type_value(column)
                 if cell_type == 'date':
-                    sheet.write_datetime(y + y_offset, x + lines[y].get('colspan', 1) - 1, cell_value, date_default_style)
+                    sheet.write_datetime(y + y_offset, x + line.get('colspan', 1) - 1, cell_value, date_default_style)
                 else:
-                    sheet.write(y + y_offset, x + lines[y].get('colspan', 1) - 1, cell_value, style)
-
-        workbook.close()
-        output.seek(0)
-        generated_file = output.read()
-        output.close()
-
-        return {
-            'file_name': self.get_default_report_filename('xlsx'),
-            'file_content': generated_file,
-            'file_type': 'xlsx',
-        }
+                    sheet.write(y + y_offset, x + line.get('colspan', 1) - 1, cell_value, style)
 
     def _get_cell_type_value(self, cell):
         if 'date' not in cell.get('class', '') or not cell.get('name'):
@@ -4478,6 +5167,42 @@ class AccountReport(models.Model):
             'columns': line_columns,
         }
 
+    def _get_partner_and_general_ledger_keyset_clause(self, keyset_cursor, column_group_index, tiebreaker_sql='0'):
+        """ Helper used by general ledger and partner ledger to paginate their move lines using a keyset instead of an offset,
+        so that loading a page costs the same whatever the number of lines loaded before it.
+
+        The move lines are sorted by (date, move name, id, column group index, tiebreaker), the tiebreaker being used to
+        distinguish the rows generated for the same move line in the same column group (0 if there can't be any).
+
+        :param keyset_cursor:       The sort key of the last row already loaded, as returned by _get_partner_and_general_ledger_keyset_cursor,
+                                    or None to start from the first row.
+        :param column_group_index:  The index of the column group the query is made for, in options['column_groups'].
+        :param tiebreaker_sql:      The SQL expression of the tiebreaker.
+        :return:                    (where_clause, where_params), restricting account_move_line to the rows coming after keyset_cursor.
+        """
+        if not keyset_cursor:
+            return 'TRUE', []
+
+        # The first condition is redundant, but unlike the second one it can be matched by the indexes on (..., date, move_name, id).
+        where_clause = f"""
+            (account_move_line.date, COALESCE(account_move_line.move_name, ''), account_move_line.id) >= (%s, %s, %s)
+            AND (account_move_line.date, COALESCE(account_move_line.move_name, ''), account_move_line.id, %s, {tiebreaker_sql}) > (%s, %s, %s, %s, %s)
+        """
+        return where_clause, [*keyset_cursor[:3], column_group_index, *keyset_cursor]
+
+    @api.model
+    def _get_partner_and_general_ledger_keyset_cursor(self, aml_result):
+        """ Returns the sort key (see _get_partner_and_general_ledger_keyset_clause) of a row fetched by the general ledger or partner ledger,
+        in a json-serializable format, so that it can be carried in the 'progress' of a 'load more' line.
+        """
+        return [
+            fields.Date.to_string(aml_result['date']),
+            aml_result['keyset_move_name'],
+            aml_result['id'],
+            aml_result['keyset_column_group_index'],
+            aml_result['keyset_tiebreaker'],
+        ]
+
     def _compute_growth_comparison_column(self, options, value1, value2, green_on_positive=True):
         ''' Helper to get the additional columns due to the growth comparison feature. When only one comparison is
         requested, an additional column is there to show the percentage of growth based on the compared period.
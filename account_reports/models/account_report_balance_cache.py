@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import api, fields, models
+from odoo.tools.sql import create_index
+
+
+class AccountReportBalanceCache(models.Model):
+    """ Per-month summary of the posted journal items, used by the report engines to avoid aggregating account_move_line
+    over periods that are fully covered by this table.
+
+    Each row holds a balance and a number of posted journal items for a (company, account, journal, month) key, the totals
+    of a key being the sums of all its rows. The table is maintained incrementally by account.move and account.move.line each
+    time posted items are created, modified or removed (typically on post and reset to draft), so that it always reflects the
+    posted ledger exactly. These changes are appended as new delta rows instead of updating the existing ones, so that
+    concurrent postings never lock each other on the rows of the same accounts; a daily cron folds them back into a single
+    row per key.
+    """
+    _name = 'account.report.balance.cache'
+    _description = "Accounting Report Balance Cache"
+    _log_access = False
+
+    company_id = fields.Many2one(comodel_name='res.company', required=True, readonly=True, ondelete='cascade')
+    account_id = fields.Many2one(comodel_name='account.account', required=True, readonly=True, ondelete='cascade')
+    journal_id = fields.Many2one(comodel_name='account.journal', required=True, readonly=True, ondelete='cascade')
+    period = fields.Date(string="Period", required=True, readonly=True, help="First day of the month this row aggregates.")
+    company_currency_id = fields.Many2one(related='company_id.currency_id')
+    balance = fields.Monetary(currency_field='company_currency_id', readonly=True)
+    aml_count = fields.Integer(readonly=True)
+
+    def init(self):
+        super().init()
+        create_index(self.env.cr, 'account_report_balance_cache_key_index', self._table, ['company_id', 'account_id', 'journal_id', 'period'])
+        # Fill the table when it gets created on a database already containing posted entries.
+        self.env.cr.execute("SELECT 1 FROM account_report_balance_cache LIMIT 1")
+        if not self.env.cr.fetchone():
+            self._rebuild()
+
+    @api.model
+    def _get_impacting_aml_fields(self):
+        """ Returns the fields of account.move.line whose value is aggregated in the cache. """
+        return ['company_id', 'account_id', 'journal_id', 'date', 'balance', 'parent_state', 'display_type', 'move_id']
+
+    @api.model
+    def _apply_aml_delta(self, aml_where_clause, aml_where_params, sign):
+        """ Adds (sign=1) or removes (sign=-1) the posted journal items matching the provided where clause from the cache, by
+        appending delta rows to it.
+
+        :param aml_where_clause:    An SQL condition on the account_move_line table, aliased as aml.
+        :param aml_where_params:    The parameters of aml_where_clause.
+        :param sign:                1 to add the matched items to the cache, -1 to remove them from it.
+        """
+        self.env['account.move.line'].flush_model(self._get_impacting_aml_fields())
+        self.env.cr.execute(f"""
+            INSERT INTO account_report_balance_cache (company_id, account_id, journal_id, period, balance, aml_count)
+            SELECT
+                aml.company_id,
+                aml.account_id,
+                aml.journal_id,
+                DATE_TRUNC('month', aml.date)::date,
+                %s * SUM(aml.balance),
+                %s * COUNT(aml.id)
+            FROM account_move_line aml
+            WHERE aml.parent_state = 'posted'
+            AND (aml.display_type IS NULL OR aml.display_type NOT IN ('line_section', 'line_note'))
+            AND aml.account_id IS NOT NULL
+            AND ({aml_where_clause})
+            GROUP BY aml.company_id, aml.account_id, aml.journal_id, DATE_TRUNC('month', aml.date)
+        """, [sign, sign, *aml_where_params])
+        self.invalidate_model()
+
+    @api.model
+    def _update_from_moves(self, moves, sign):
+        if moves:
+            self._apply_aml_delta('aml.move_id IN %s', [tuple(moves.ids)], sign)
+
+    @api.model
+    def _update_from_move_lines(self, move_lines, sign):
+        if move_lines:
+            self._apply_aml_delta('aml.id IN %s', [tuple(move_lines.ids)], sign)
+
+    @api.model
+    def _rebuild(self, companies=None):
+        """ Recomputes the whole cache from account_move_line, for the given companies (all of them by default). """
+        company_ids = tuple((companies or self.env['res.company'].search([])).ids)
+        if not company_ids:
+            return
+        self.env.cr.execute("DELETE FROM account_report_balance_cache WHERE company_id IN %s", [company_ids])
+        self._apply_aml_delta('aml.company_id IN %s', [company_ids], 1)
+
+    @api.model
+    def _cron_fold(self):
+        """ Replaces the delta rows of each key by a single row holding their sums, to keep the reads of the cache cheap.
+        The keys whose journal items were all removed are dropped.
+        """
+        self.env.cr.execute("""
+            WITH delta_keys AS (
+                SELECT company_id, account_id, journal_id, period
+                FROM account_report_balance_cache
+                GROUP BY company_id, account_id, journal_id, period
+                HAVING COUNT(*) > 1
+            ), deleted AS (
+                DELETE FROM account_report_balance_cache cache
+                USING delta_keys
+                WHERE cache.company_id = delta_keys.company_id
+                AND cache.account_id = delta_keys.account_id
+                AND cache.journal_id = delta_keys.journal_id
+                AND cache.period = delta_keys.period
+                RETURNING cache.company_id, cache.account_id, cache.journal_id, cache.period, cache.balance, cache.aml_count
+            )
+            INSERT INTO account_report_balance_cache (company_id, account_id, journal_id, period, balance, aml_count)
+            SELECT company_id, account_id, journal_id, period, SUM(balance), SUM(aml_count)
+            FROM deleted
+            GROUP BY company_id, account_id, journal_id, period
+            HAVING SUM(aml_count) != 0
+        """)
+        self.invalidate_model()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import json
+import logging
+import tempfile
+from datetime import timedelta
+
+from markupsafe import Markup
+
+from odoo import api, fields, models, _, Command
+from odoo.tools import config
+
+_logger = logging.getLogger(__name__)
+
+
+class AccountReportExportJob(models.Model):
+    """ Export of a report to xlsx, run in background by a cron so that big reports (like a fully unfolded general ledger)
+    can be exported without keeping all their lines in memory nor hitting the request timeout.
+    The user who requested the export gets notified with a download link once the file is ready.
+    """
+    _name = 'account.report.export.job'
+    _description = "Accounting Report Export Job"
+    _order = 'id'
+
+    report_id = fields.Many2one(comodel_name='account.report', required=True, readonly=True, ondelete='cascade')
+    user_id = fields.Many2one(comodel_name='res.users', required=True, readonly=True, ondelete='cascade', default=lambda self: self.env.user)
+    company_ids = fields.Many2many(comodel_name='res.company', readonly=True, help="Companies the report was opened with.")
+    options = fields.Text(required=True, readonly=True, help="JSON-formatted options the report is exported with.")
+    state = fields.Selection(
+        selection=[('pending', "Pending"), ('done', "Done"), ('failed', "Failed")],
+        required=True,
+        readonly=True,
+        default='pending',
+    )
+    attachment_id = fields.Many2one(comodel_name='ir.attachment', readonly=True, ondelete='set null')
+
+    @api.model
+    def _schedule(self, report, options):
+        """ Creates a job exporting report with the provided options for the current user, and triggers the cron processing it. """
+        job = self.sudo().create({
+            'report_id': report.id,
+            'user_id': self.env.user.id,
+            'company_ids': [Command.set(self.env.companies.ids)],
+            'options': json.dumps(options),
+        })
+        self.env.ref('account_reports.ir_cron_account_report_export_job')._trigger()
+        return job
+
+    @api.model
+    def _cron_process_pending_jobs(self, job_limit=5):
+        self._gc_finished_jobs()
+        jobs = self.search([('state', '=', 'pending')], limit=job_limit + 1)
+        for job in jobs[:job_limit]:
+            try:
+                with self.env.cr.savepoint():
+                    job._process()
+            except Exception:
+                _logger.exception("Export of report %s requested by user %s failed.", job.report_id.id, job.user_id.id)
+                job.state = 'failed'
+            job._notify_user()
+
+            if not config['test_enable']:
+                self.env.cr.commit()
+
+        if len(jobs) > job_limit:
+            self.env.ref('account_reports.ir_cron_account_report_export_job')._trigger()
+
+    @api.model
+    def _gc_finished_jobs(self, retention_days=7):
+        """ Removes the jobs finished for more than retention_days days, together with their exported file. """
+        jobs = self.search([
+            ('state', 'in', ('done', 'failed')),
+            ('write_date', '<', fields.Datetime.now() - timedelta(days=retention_days)),
+        ])
+        jobs.attachment_id.sudo().unlink()
+        jobs.unlink()
+
+    def _process(self):
+        """ Generates the xlsx file of the job, using the rights of the user who requested it, and stores it in an attachment. """
+        self.ensure_one()
+        report = self.report_id.with_user(self.user_id).with_context(allowed_company_ids=self.company_ids.ids or self.user_id.company_id.ids)
+        with tempfile.NamedTemporaryFile(suffix='.xlsx') as export_file:
+            report._export_to_xlsx_file(json.loads(self.options), export_file.name)
+            # The attachment is not linked to the job, so that only the user who created it can access it.
+            attachment = self._create_attachment_from_file(export_file, {
+                'name': report.get_default_report_filename('xlsx'),
+                'mimetype': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            })
+
+        self.write({
+            'attachment_id': attachment.id,
+            'state': 'done',
+        })
+
+    def _create_attachment_from_file(self, export_file, attachment_vals):
+        """ Creates an attachment of the user of the job holding the content of export_file. The content goes through
+        the ir.attachment API, so that it is stored and deduplicated according to the storage of the database.
+        """
+        self.ensure_one()
+        export_file.seek(0)
+        return self.env['ir.attachment'].with_user(self.user_id).create({**attachment_vals, 'raw': export_file.read()})
+
+    def _notify_user(self):
+        self.ensure_one()
+        report_name = self.report_id.with_user(self.user_id).name
+        if self.state == 'done':
+            subject = _("Your export of %s is ready", report_name)
+            body = Markup('<a href="/web/content/%s?download=true">%s</a>') % (self.attachment_id.id, self.attachment_id.name)
+        else:
+            subject = _("Your export of %s failed", report_name)
+            body = _("An error occurred while exporting the report. Please try again or contact your administrator.")
+
+        self.env['mail.thread'].message_notify(
+            partner_ids=self.user_id.partner_id.ids,
+            subject=subject,
+            body=body,
+            email_layout_xmlid='mail.mail_notification_light',
+        )
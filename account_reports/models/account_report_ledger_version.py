@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import api, fields, models
+
+# Fields of the ledger models that never feed the reports, and whose modifications hence don't change the version of the ledger.
+# The domains of the reports can't read them, see account.report's _is_ledger_versioned_field_path.
+LEDGER_VERSION_IGNORED_FIELDS = {
+    'account.move': {
+        'is_move_sent', 'narration', 'to_check', 'invoice_user_id', 'invoice_origin', 'payment_reference', 'access_token',
+        'posted_before', 'invoice_incoterm_id', 'qr_code_method',
+    },
+    'account.move.line': {'expected_pay_date', 'blocked', 'sequence'},
+    'account.account': {'note', 'exclude_provision_currency_ids'},
+}
+
+
+class AccountReportLedgerVersion(models.Model):
+    """ Write sequence of the ledger of each company, used to invalidate the expression totals cached by the reports.
+
+    Each transaction modifying the journal items of a company inserts a row for it, and increments the bump counter of this
+    row at each subsequent modification. The (count, max id, sum of bumps) of the rows of a company hence changes every time
+    its ledger is modified, and, since the rows follow the transactions' visibility rules, it always describes the state of the
+    ledger that the current transaction sees. Inserting a row per transaction instead of updating a shared counter avoids
+    any lock contention between concurrent transactions.
+    """
+    _name = 'account.report.ledger.version'
+    _description = "Accounting Report Ledger Version"
+    _log_access = False
+
+    company_id = fields.Many2one(comodel_name='res.company', required=True, readonly=True, index=True, ondelete='cascade')
+    bump = fields.Integer(required=True, readonly=True, default=1)
+
+    @api.model
+    def _bump(self, company_ids):
+        """ Changes the version of the ledger of the provided companies. """
+        # The rows inserted by the current transaction; cleared on commit and rollback.
+        row_id_by_company = self.env.cr.precommit.data.setdefault('account_report_ledger_version.row_ids', {})
+        for company_id in set(company_ids):
+            row_id = row_id_by_company.get(company_id)
+            if row_id:
+                self.env.cr.execute("UPDATE account_report_ledger_version SET bump = bump + 1 WHERE id = %s", [row_id])
+                if self.env.cr.rowcount:
+                    continue
+
+            # First modification of this ledger in this transaction, or the row got rolled back with a savepoint
+            self.env.cr.execute("INSERT INTO account_report_ledger_version (company_id, bump) VALUES (%s, 1) RETURNING id", [company_id])
+            row_id_by_company[company_id] = self.env.cr.fetchone()[0]
+
+    @api.model
+    def _is_versioned_field(self, model_name, field_name):
+        """ Returns whether modifying the provided field of a ledger model changes the version of the ledger. """
+        return (
+            field_name in self.env[model_name]._fields
+            and field_name not in LEDGER_VERSION_IGNORED_FIELDS.get(model_name, ())
+            and not field_name.startswith(('message_', 'activity_', 'website_message_'))
+        )
+
+    @api.model
+    def _bump_on_write(self, records, vals, company_ids):
+        """ Changes the version of the ledger of the provided companies if vals, written on records, modifies a field feeding the reports. """
+        if any(self._is_versioned_field(records._name, field_name) for field_name in vals):
+            self._bump(company_ids)
+
+    @api.model
+    def _get_versions(self, company_ids):
+        """ Returns a hashable value identifying the current state of the ledgers of the provided companies. """
+        self.env.cr.execute("""
+            SELECT company_id, COUNT(*), MAX(id), SUM(bump)
+            FROM account_report_ledger_version
+            WHERE company_id IN %s
+            GROUP BY company_id
+            ORDER BY company_id
+        """, [tuple(company_ids)])
+        return tuple(self.env.cr.fetchall())
+
+    @api.model
+    def _cron_compact(self):
+        """ Replaces the rows of each company by a single new one, to keep _get_versions cheap.
+        The new rows get ids greater than all the previous ones, so that the resulting versions are all new.
+        """
+        self.env.cr.execute("""
+            WITH deleted AS (
+                DELETE FROM account_report_ledger_version
+                RETURNING company_id
+            )
+            INSERT INTO account_report_ledger_version (company_id, bump)
+            SELECT DISTINCT company_id, 1
+            FROM deleted
+        """)
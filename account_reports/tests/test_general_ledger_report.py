@@ -360,6 +360,73 @@ class TestGeneralLedgerReport(TestAccountReportsCommon, odoo.tests.HttpCase):
             ],
         )
 
+    def test_general_ledger_load_more_keyset(self):
+        ''' Test the load more starts from the sort key carried by the progress, and not from the offset. '''
+        self.env.companies = self.env.company
+        self.report.load_more_limit = 2
+
+        options = self._generate_options(self.report, fields.Date.from_string('2017-01-01'), fields.Date.from_string('2017-12-31'))
+        line_id = self.env['account.report']._get_generic_line_id('account.account', self.company_data["default_account_revenue"].id)
+        first_page = self.report._expand_unfoldable_line('_report_expand_unfoldable_line_general_ledger', line_id, None, options, None, 0)
+        load_more_line = first_page[-1]
+        progress = json.loads(load_more_line['progress'])
+
+        # Whatever offset is given, the lines following the cursor are loaded
+        load_more = self.report._expand_unfoldable_line('_report_expand_unfoldable_line_general_ledger', line_id, None, options, progress, load_more_line['offset'] + 42)
+
+        self.assertLinesValues(
+            load_more,
+            #   Name                                    Debit           Credit          Balance
+            [   0,                                      4,              5,              6],
+            [
+                ('INV/2017/00001',                      4000.0,         '',             9000.0),
+                ('INV/2017/00001',                      5000.0,         '',            14000.0),
+                ('Load more...',                        '',             '',             ''),
+            ],
+        )
+
+    def test_general_ledger_streamed_lines(self):
+        ''' Test the lines generated chunk by chunk for streaming exports are the same as the ones of the fully unfolded report. '''
+        self.env.companies = self.env.company
+
+        options = self._generate_options(self.report, fields.Date.from_string('2017-01-01'), fields.Date.from_string('2017-12-31'))
+        options['unfold_all'] = True
+
+        print_mode_report = self.report.with_context(print_mode=True)
+        expected_lines = print_mode_report._get_lines(options)
+        streamed_lines = list(print_mode_report.with_context(account_report_expand_chunk_size=2)._iter_lines(options))
+
+        self.assertEqual(
+            [(line['id'], [col.get('no_format') for col in line['columns']]) for line in streamed_lines],
+            [(line['id'], [col.get('no_format') for col in line['columns']]) for line in expected_lines],
+        )
+
+    def test_general_ledger_export_job(self):
+        ''' Test the background xlsx export generates an attachment for the user who requested it. '''
+        options = self._generate_options(self.report, fields.Date.from_string('2017-01-01'), fields.Date.from_string('2017-12-31'))
+        options['unfold_all'] = True
+
+        job = self.env['account.report.export.job']._schedule(self.report, options)
+        self.env['account.report.export.job']._cron_process_pending_jobs()
+
+        self.assertEqual(job.state, 'done')
+        self.assertTrue(job.attachment_id.raw)
+        self.assertEqual(job.attachment_id.file_size, len(job.attachment_id.raw))
+        self.assertEqual(job.attachment_id.create_uid, self.env.user)
+
+        # The finished jobs are removed with their file by the cron after a week
+        attachment = job.attachment_id
+        self.env['account.report.export.job']._cron_process_pending_jobs()
+        self.assertTrue(job.exists())
+        self.env.cr.execute(
+            "UPDATE account_report_export_job SET write_date = write_date - INTERVAL '8 days' WHERE id = %s",
+            [job.id],
+        )
+        job.invalidate_recordset(['write_date'])
+        self.env['account.report.export.job']._cron_process_pending_jobs()
+        self.assertFalse(job.exists())
+        self.assertFalse(attachment.exists())
+
     def test_general_ledger_foreign_currency_account(self):
         ''' Ensure the total in foreign currency of an account is displayed only if all journal items are sharing the
         same currency.
@@ -3,6 +3,7 @@ from .common import TestAccountReportsCommon
 from odoo import fields, Command
 from odoo.tests import tagged
 from odoo.tools import frozendict
+from odoo.addons.account_reports.models.account_report import EXPRESSION_TOTALS_CACHE_STATS
 
 from unittest.mock import patch
 
@@ -505,6 +506,242 @@ class TestReportEngines(TestAccountReportsCommon):
                 action_dict = report.action_audit_cell(options, self._get_audit_params_from_report_line(options, report_line, report_line_dict))
                 self.assertEqual(move.line_ids.filtered_domain(action_dict['domain']), expected_amls)
 
+    def test_engine_account_codes_index(self):
+        report = self._create_report([
+            self._prepare_test_report_line(self._prepare_test_expression_account_codes(r'101\(1012)')),
+        ])
+        move = self._create_test_account_moves([
+            self._prepare_test_account_move_line(1000.0, account_code='101001'),
+            self._prepare_test_account_move_line(300.0, account_code='101201'),
+        ])
+        options = self._generate_options(report, '2020-01-01', '2020-01-01')
+
+        self.assertLinesValues(report._get_lines(options), [0, 1], [('test_line_1', 1000.0)])
+
+        # Changing the chart of accounts must invalidate the accounts matched by the prefixes.
+        move.line_ids.account_id.filtered(lambda x: x.code == '101201').code = '101301'
+
+        self.assertLinesValues(report._get_lines(options), [0, 1], [('test_line_1', 1300.0)])
+
+    def test_engine_expression_totals_cache(self):
+        report = self._create_report([
+            self._prepare_test_report_line(self._prepare_test_expression_account_codes('101')),
+        ])
+        move = self._create_test_account_moves([
+            self._prepare_test_account_move_line(1000.0, account_code='101001'),
+        ])
+        options = self._generate_options(report, '2020-01-01', '2020-01-01')
+
+        self.assertLinesValues(report._get_lines(options), [0, 1], [('test_line_1', 1000.0)])
+
+        # Nothing changed in the ledger: the totals are served from the cache.
+        hits_before = EXPRESSION_TOTALS_CACHE_STATS['hit']
+        self.assertLinesValues(report._get_lines(options), [0, 1], [('test_line_1', 1000.0)])
+        self.assertEqual(EXPRESSION_TOTALS_CACHE_STATS['hit'], hits_before + 1)
+
+        # Modifying fields that don't feed the reports keeps the ledger version.
+        move.write({'narration': "Checked", 'to_check': True})
+        hits_before = EXPRESSION_TOTALS_CACHE_STATS['hit']
+        self.assertLinesValues(report._get_lines(options), [0, 1], [('test_line_1', 1000.0)])
+        self.assertEqual(EXPRESSION_TOTALS_CACHE_STATS['hit'], hits_before + 1)
+
+        # Posting a new entry changes the ledger version, so the totals get recomputed.
+        self._create_test_account_moves([
+            self._prepare_test_account_move_line(500.0, account_id=move.line_ids.account_id.filtered(lambda x: x.code == '101001').id),
+        ])
+        hits_before = EXPRESSION_TOTALS_CACHE_STATS['hit']
+        self.assertLinesValues(report._get_lines(options), [0, 1], [('test_line_1', 1500.0)])
+        self.assertEqual(EXPRESSION_TOTALS_CACHE_STATS['hit'], hits_before)
+
+    def test_engine_expression_totals_cache_unversioned_data(self):
+        self.env.company.account_fiscal_country_id = self.fake_country
+        tax = self.company_data['default_tax_sale'].copy()
+        tax_tags_report = self._create_report(
+            [self._prepare_test_report_line(self._prepare_test_expression_tax_tags('11'))],
+            country_id=self.fake_country.id,
+        )
+        tax_domain_report = self._create_report([
+            self._prepare_test_report_line(self._prepare_test_expression_domain([('tax_ids.type_tax_use', '=', 'sale')], 'sum')),
+        ])
+        self._create_test_account_moves([
+            self._prepare_test_account_move_line(1000.0, account_code='101001', tax_tags=['+11']),
+            self._prepare_test_account_move_line(500.0, account_code='101002', tax_ids=[Command.set(tax.ids)]),
+        ])
+        tax_tags_options = self._generate_options(tax_tags_report, '2020-01-01', '2020-01-01')
+        tax_domain_options = self._generate_options(tax_domain_report, '2020-01-01', '2020-01-01')
+
+        self.assertLinesValues(tax_tags_report._get_lines(tax_tags_options), [0, 1], [('test_line_1', 1000.0)])
+        self.assertLinesValues(tax_domain_report._get_lines(tax_domain_options), [0, 1], [('test_line_1', 500.0)])
+
+        # Editing a tag or a tax doesn't change the ledger version: the totals depending on them must not be served from the cache.
+        self.env['account.account.tag'].search([('country_id', '=', self.fake_country.id), ('name', '=', '+11')]).name = '+12'
+        tax.type_tax_use = 'purchase'
+
+        cache_stats_before = dict(EXPRESSION_TOTALS_CACHE_STATS)
+        self.assertLinesValues(tax_tags_report._get_lines(tax_tags_options), [0, 1], [('test_line_1', '')])
+        self.assertLinesValues(tax_domain_report._get_lines(tax_domain_options), [0, 1], [('test_line_1', '')])
+        self.assertEqual(EXPRESSION_TOTALS_CACHE_STATS, cache_stats_before)
+
+    def test_engine_balance_cache(self):
+        report = self._create_report([
+            self._prepare_test_report_line(
+                self._prepare_test_expression_account_codes('101'),
+                groupby='account_id',
+            ),
+            self._prepare_test_report_line(
+                self._prepare_test_expression_domain([('account_id.code', '=like', '101%')], 'count_rows'),
+                groupby='account_id',
+            ),
+        ])
+
+        january_move = self._create_test_account_moves([
+            self._prepare_test_account_move_line(1000.0, account_code='101001', date='2020-01-15'),
+            self._prepare_test_account_move_line(-300.0, account_code='101002', date='2020-01-15'),
+        ])
+        account_101001 = january_move.line_ids.account_id.filtered(lambda x: x.code == '101001')
+        account_101002 = january_move.line_ids.account_id.filtered(lambda x: x.code == '101002')
+        self._create_test_account_moves([
+            self._prepare_test_account_move_line(500.0, account_id=account_101001.id, date='2020-02-10'),
+        ])
+
+        options = self._generate_options(report, '2020-01-01', '2020-02-20', default_options={'unfold_all': True})
+
+        # January is served by the cache, February by account_move_line.
+        column_group_options = report._get_column_group_options(options, next(iter(options['column_groups'])))
+        self.assertEqual(
+            report._get_balance_cache_date_bounds(column_group_options, 'strict_range'),
+            (fields.Date.from_string('2020-01-01'), fields.Date.from_string('2020-01-31'), False),
+        )
+
+        self.assertLinesValues(
+            # pylint: disable=bad-whitespace
+            report._get_lines(options),
+            [   0,                          1],
+            [
+                ('test_line_1',        1200.0),
+                ('101001 101001',      1500.0),
+                ('101002 101002',      -300.0),
+                ('test_line_2',             3),
+                ('101001 101001',           2),
+                ('101002 101002',           1),
+            ],
+        )
+
+        # Resetting the move to draft must remove it from the cache.
+        january_move.button_draft()
+
+        self.assertLinesValues(
+            # pylint: disable=bad-whitespace
+            report._get_lines(options),
+            [   0,                          1],
+            [
+                ('test_line_1',         500.0),
+                ('101001 101001',       500.0),
+                ('test_line_2',             1),
+                ('101001 101001',           1),
+            ],
+        )
+
+        # The cache got a delta row for each change, folding them only keeps the February one.
+        balance_cache = self.env['account.report.balance.cache']
+        cache_domain = [('account_id', 'in', (account_101001 + account_101002).ids)]
+        self.assertGreater(len(balance_cache.search(cache_domain)), 2)
+        balance_cache._cron_fold()
+        self.assertRecordValues(balance_cache.search(cache_domain), [
+            {'account_id': account_101001.id, 'period': fields.Date.from_string('2020-02-01'), 'balance': 500.0, 'aml_count': 1},
+        ])
+
+    def test_engines_multiple_column_groups(self):
+        report = self._create_report(
+            [
+                self._prepare_test_report_line(
+                    self._prepare_test_expression_account_codes('101'),
+                    groupby='account_id',
+                ),
+                self._prepare_test_report_line(
+                    self._prepare_test_expression_domain([('account_id.code', '=like', '101%')], 'sum'),
+                ),
+            ],
+            filter_period_comparison=True,
+            filter_show_draft=True,
+        )
+
+        january_move = self._create_test_account_moves([
+            self._prepare_test_account_move_line(1000.0, account_code='101001', date='2020-01-15'),
+        ])
+        self._create_test_account_moves([
+            self._prepare_test_account_move_line(500.0, account_id=january_move.line_ids[0].account_id.id, date='2020-02-10'),
+            self._prepare_test_account_move_line(-300.0, account_code='101002', date='2020-02-10'),
+        ])
+
+        # Including draft entries prevents the use of the balance cache, so that everything is read from account_move_line.
+        options = self._generate_options(report, '2020-02-01', '2020-02-29', default_options={'unfold_all': True, 'all_entries': True})
+        options = self._update_comparison_filter(options, report, 'previous_period', 1)
+
+        # Both periods are evaluated by the same queries.
+        options_per_group = report._split_options_per_column_group(options)
+        self.assertEqual(len(options_per_group), 2)
+        self.assertEqual(len(report._query_get_for_column_groups(options_per_group, 'strict_range')), 1)
+
+        self.assertLinesValues(
+            # pylint: disable=bad-whitespace
+            report._get_lines(options),
+            [   0,                          1,          2],
+            [
+                ('test_line_1',         200.0,     1000.0),
+                ('101001 101001',       500.0,     1000.0),
+                ('101002 101002',      -300.0,         ''),
+                ('test_line_2',         200.0,     1000.0),
+            ],
+        )
+
+    def test_engines_parallel_workers(self):
+        report = self._create_report([
+            self._prepare_test_report_line(
+                self._prepare_test_expression_account_codes('101'),
+                groupby='account_id',
+            ),
+            self._prepare_test_report_line(
+                self._prepare_test_expression_domain([('account_id.code', '=like', '101%')], 'sum'),
+            ),
+        ])
+        self._create_test_account_moves([
+            self._prepare_test_account_move_line(1000.0, account_code='101001', date='2020-01-15'),
+            self._prepare_test_account_move_line(-300.0, account_code='101002', date='2020-01-15'),
+        ])
+        options = self._generate_options(report, '2020-01-01', '2020-01-31', default_options={'unfold_all': True})
+
+        AccountReport = self.registry['account.report']
+        with patch.object(AccountReport, '_can_use_expression_totals_cache', return_value=False):
+            serial_lines = report._get_lines(options)
+
+            # The worker cursors can't see the uncommitted data of the test transaction through a snapshot: make them share
+            # its connection instead, like the cursors of the HTTP tests do.
+            self.env['ir.config_parameter'].set_param('account_reports.parallel_workers', 2)
+            self.registry.enter_test_mode(self.cr)
+            try:
+                with patch.object(type(self.registry), 'in_test_mode', return_value=False), \
+                     patch.object(AccountReport, '_export_parallel_snapshot', return_value='test_snapshot'), \
+                     patch.object(AccountReport, '_get_parallel_worker_cursor', side_effect=lambda snapshot_id: self.registry.cursor()) as get_worker_cursor:
+                    parallel_lines = report._get_lines(options)
+            finally:
+                self.registry.leave_test_mode()
+
+        # Both the account_codes and the domain batches were evaluated by the workers
+        self.assertEqual(get_worker_cursor.call_count, 2)
+        self.assertLinesValues(
+            # pylint: disable=bad-whitespace
+            parallel_lines,
+            [   0,                          1],
+            [
+                ('test_line_1',         700.0),
+                ('101001 101001',      1000.0),
+                ('101002 101002',      -300.0),
+                ('test_line_2',         700.0),
+            ],
+        )
+        self.assertEqual(parallel_lines, serial_lines)
+
     def test_engine_external(self):
         # Create the report.
         test_line_1 = self._prepare_test_report_line(
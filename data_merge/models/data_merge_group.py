@@ -4,7 +4,7 @@
 from odoo import models, api, fields
 from odoo.models import MAGIC_COLUMNS
 from odoo.osv import expression
-from odoo.tools import split_every
+from odoo.tools import groupby, split_every
 
 import logging
 _logger = logging.getLogger(__name__)
@@ -44,24 +44,31 @@ class DataMergeGroup(models.Model):
 
     @api.depends('record_ids')
     def _compute_similarity(self):
-        for group in self:
-            if not group.record_ids:
-                group.divergent_fields = ''
-                group.similarity = 1
-                continue
-
-            read_fields = group._get_similarity_fields()
+        groups_without_records = self.filtered(lambda g: not g.record_ids)
+        groups_without_records.divergent_fields = ''
+        groups_without_records.similarity = 1
+
+        # Read the records of all the groups of a same model at once
+        for res_model_name, groups in groupby(self - groups_without_records, key=lambda g: g.res_model_name):
+            read_fields = groups[0]._get_similarity_fields()
+            all_record_ids = [res_id for group in groups for res_id in group.record_ids.mapped('res_id')]
+            records_by_id = {record['id']: record for record in self.env[res_model_name].browse(all_record_ids).read(read_fields)}
+
+            for group in groups:
+                records = [records_by_id[res_id] for res_id in group.record_ids.mapped('res_id') if res_id in records_by_id]
+                if not records:
+                    group.divergent_fields = ''
+                    group.similarity = 1
+                    continue
 
-            record_ids = group.record_ids.mapped('res_id')
-            records = self.env[group.res_model_name].browse(record_ids).read(read_fields)
-            # YTI What about unaccent ? Should be taken into account IMO if the
-            # rule was computed from that.
-            data = set(records[0].items())
-            data = data.intersection(*[set(record.items()) for record in records[1:]])
+                # YTI What about unaccent ? Should be taken into account IMO if the
+                # rule was computed from that.
+                data = set(records[0].items())
+                data = data.intersection(*[set(record.items()) for record in records[1:]])
 
-            diff_fields = set(read_fields) - {k for k, v in data}  # fields of the model minus the identical fields
-            group.divergent_fields = ','.join(diff_fields)
-            group.similarity = min(1, len(data) / len(read_fields))
+                diff_fields = set(read_fields) - {k for k, v in data}  # fields of the model minus the identical fields
+                group.divergent_fields = ','.join(diff_fields)
+                group.similarity = min(1, len(data) / len(read_fields))
 
     # YTI TODO: Move this on the data_merge.record model
     def discard_records(self, records=None):
@@ -81,21 +88,32 @@ class DataMergeGroup(models.Model):
 
         This method will look for a `_elect_method()` on the model.
         If it exists, this method is responsible to return the master record, otherwise, a generic method is used.
+        The original records of all the groups of a same model are fetched at once, and the masters are flagged in a single write.
         """
-        for group in self:
-            if hasattr(self.env[group.res_model_name], '_elect_method'):
-                elect_master = getattr(self.env[group.res_model_name], '_elect_method')
+        master_records = self.env['data_merge.record']
+        for res_model_name, groups in groupby(self, key=lambda g: g.res_model_name):
+            if hasattr(self.env[res_model_name], '_elect_method'):
+                elect_master = getattr(self.env[res_model_name], '_elect_method')
             else:
-                elect_master = group._elect_method
+                elect_master = self._elect_method
+
+            all_records = self.env['data_merge.record'].concat(*(group.record_ids for group in groups))
+            all_originals = all_records._original_records()
+            if not all_originals:
+                continue
+            existing_ids = set(all_originals.ids)
+
+            for group in groups:
+                original_ids = [res_id for res_id in group.record_ids.mapped('res_id') if res_id in existing_ids]
+                if not original_ids:
+                    continue
 
-            records = group.record_ids._original_records()
-            if not records:
-                return
+                # Share the prefetching of the originals of all the groups, so that reading them doesn't trigger a query per group
+                master = elect_master(all_originals.browse(original_ids).with_prefetch(all_originals._prefetch_ids))
+                if master:
+                    master_records |= group.record_ids.filtered(lambda r: r.res_id == master.id)
 
-            master = elect_master(records)
-            if master:
-                master_record = group.record_ids.filtered(lambda r: r.res_id == master.id)
-                master_record.is_master = True
+        master_records.write({'is_master': True})
 
     ## Generic master
     def _elect_method(self, records):
@@ -3,6 +3,7 @@
 
 from odoo import models, api, fields, _
 from odoo.exceptions import UserError, ValidationError
+from odoo.tools import split_every
 
 from psycopg2 import ProgrammingError, errorcodes
 
@@ -12,33 +13,55 @@ import ast
 import timeit
 import logging
 import re
+from collections import defaultdict
 
 from odoo.osv.expression import get_unaccent_wrapper
 
 _logger = logging.getLogger(__name__)
 
-# Merge list of list based on their common element
+# Merge list of list based on their common element, using a union-find structure
 #   Input: [['a', 'b'], ['b', 'c'], ['d', 'e']]
-#   Output: [['a', 'b', 'c'], ['d', 'e']]
-# https://stackoverflow.com/a/9112588
+#   Output: [{'a', 'b', 'c'}, {'d', 'e'}]
 def merge_common_lists(lsts):
-    sets = [set(lst) for lst in lsts if lst]
-    merged = True
-    while merged:
-        merged = False
-        results = []
-        while sets:
-            common, rest = sets[0], sets[1:]
-            sets = []
-            for x in rest:
-                if x.isdisjoint(common):
-                    sets.append(x)
-                else:
-                    merged = True
-                    common |= x
-            results.append(common)
-        sets = results
-    return sets
+    parents = {}
+
+    def find_root(x):
+        root = x
+        while parents[root] != root:
+            root = parents[root]
+        while x != root:
+            parents[x], x = root, parents[x]
+        return root
+
+    for lst in lsts:
+        if not lst:
+            continue
+        root = find_root(parents.setdefault(lst[0], lst[0]))
+        for x in lst[1:]:
+            other_root = find_root(parents.setdefault(x, x))
+            if other_root != root:
+                parents[other_root] = root
+
+    sets = defaultdict(set)
+    for x in parents:
+        sets[find_root(x)].add(x)
+    return list(sets.values())
+
+# Number of groups created, and whose master record is elected, at once when finding duplicates
+DM_CREATE_BATCH_SIZE = 1000
+
+# Blocks of candidates bigger than this are made of too common words to be meaningful, and are ignored
+DM_FUZZY_MAX_BLOCK_SIZE = 200
+
+# Split a text in its trigrams, the same way pg_trgm does:
+#   Input: 'ab cd'
+#   Output: {'  a', ' ab', 'ab ', '  c', ' cd', 'cd '}
+def get_trigrams(text):
+    trigrams = set()
+    for word in re.findall(r'\w+', text):
+        word = '  %s ' % word
+        trigrams.update(word[i:i + 3] for i in range(len(word) - 2))
+    return trigrams
 
 
 class DataMergeModel(models.Model):
@@ -194,7 +217,7 @@ class DataMergeModel(models.Model):
                     rhs_alias = query.join(lhs_alias, lhs_column, related_model._table, 'id', lhs_column)
                     field_name = related_model._inherits_join_calc(rhs_alias, related_model._rec_name, query)
 
-                if rule.match_mode == 'accent':
+                if rule.match_mode in ('accent', 'fuzzy'):
                     # Since unaccent is case sensitive, we must add a lower to make field_name insensitive
                     field_name = unaccent('lower(%s)' % field_name)
 
@@ -206,6 +229,10 @@ class DataMergeModel(models.Model):
                 tables, where_clause, where_clause_params = query.get_sql()
                 where_clause = where_clause and ('AND %s' % where_clause) or ''
 
+                if rule.match_mode == 'fuzzy':
+                    ids += dm_model._find_fuzzy_duplicates(rule, field_name, tables, where_clause, where_clause_params, group_by)
+                    continue
+
                 # Get all the rows matching the rule defined
                 # (e.g. exact match of the name) having at least 2 records
                 # Each row contains the matched value and an array of matching records:
@@ -238,15 +265,14 @@ class DataMergeModel(models.Model):
                 ids = ids + [row[1] for row in rows]
 
             # Fetches the IDs of all the records who already matched (and are not merged),
-            # as well as the discarded ones.
+            # as well as the discarded ones, indexed by record.
             # This prevents creating twice the same groups.
             self._cr.execute("""
-                SELECT
-                    ARRAY_AGG(res_id ORDER BY res_id ASC)
+                SELECT res_id, ARRAY_AGG(group_id)
                 FROM data_merge_record
                 WHERE model_id = %s
-                GROUP BY group_id""", [dm_model.id])
-            done_groups_res_ids = [set(x[0]) for x in self._cr.fetchall()]
+                GROUP BY res_id""", [dm_model.id])
+            done_group_ids_by_res_id = {res_id: set(group_ids) for res_id, group_ids in self._cr.fetchall()}
 
             _logger.info('Query identification done after %s' % str(timeit.default_timer() - t1))
             t1 = timeit.default_timer()
@@ -254,44 +280,141 @@ class DataMergeModel(models.Model):
                 merge_list = merge_common_lists
             else:
                 merge_list = lambda x: x
-            groups_to_create = [set(r) for r in merge_list(ids) if len(r) > 1]
+
+            # Check if the IDs of the group to create is already part of an existing group
+            # e.g.
+            #   The group with records A B C already exists:
+            #       1/ If group_to_create equals A B, do not create a new group
+            #       2/ If group_to_create equals A D, create the new group (A D is not a subset of A B C)
+            groups_to_create = []
+            for group_to_create in merge_list(ids):
+                group_to_create = set(group_to_create)
+                if len(group_to_create) <= 1:
+                    continue
+                common_group_ids = None
+                for res_id in group_to_create:
+                    done_group_ids = done_group_ids_by_res_id.get(res_id, set())
+                    common_group_ids = done_group_ids if common_group_ids is None else common_group_ids & done_group_ids
+                    if not common_group_ids:
+                        groups_to_create.append(group_to_create)
+                        break
+
             _logger.info('Merging lists done after %s' % str(timeit.default_timer() - t1))
             t1 = timeit.default_timer()
             _logger.info('Record creation started at %s', str(t1))
             groups_created = 0
             groups_to_create_count = len(groups_to_create)
-            for group_to_create in groups_to_create:
-                groups_created += 1
-                if groups_created % 100 == 0:
-                    _logger.info('Created groups %s / %s' % (groups_created, groups_to_create_count))
-
-                # Check if the IDs of the group to create is already part of an existing group
-                # e.g.
-                #   The group with records A B C already exists:
-                #       1/ If group_to_create equals A B, do not create a new group
-                #       2/ If group_to_create equals A D, create the new group (A D is not a subset of A B C)
-                if any(group_to_create <= x for x in done_groups_res_ids):
-                    continue
+            for groups_batch in split_every(DM_CREATE_BATCH_SIZE, groups_to_create):
+                groups = self.env['data_merge.group'].with_context(prefetch_fields=False).create([{'model_id': dm_model.id} for dummy in groups_batch])
+                self.env['data_merge.record'].with_context(prefetch_fields=False).create([
+                    {'group_id': group.id, 'res_id': rec}
+                    for group, group_to_create in zip(groups, groups_batch)
+                    for rec in group_to_create
+                ])
+                groups_created += len(groups_batch)
+                _logger.info('Created groups %s / %s' % (groups_created, groups_to_create_count))
+
+                groups._elect_master_record()
+
+                if dm_model.create_threshold > 0:
+                    groups_to_unlink = groups.filtered(lambda g: g.similarity * 100 <= dm_model.create_threshold)
+                    groups_to_unlink.unlink()
+                    groups -= groups_to_unlink
 
-                group = self.env['data_merge.group'].with_context(prefetch_fields=False).create({'model_id': dm_model.id})
-                d = [{'group_id': group.id, 'res_id': rec} for rec in group_to_create]
-                self.env['data_merge.record'].with_context(prefetch_fields=False).create(d)
+                if dm_model.merge_mode == 'automatic':
+                    for group in groups.filtered(lambda g: g.similarity * 100 >= dm_model.merge_threshold):
+                        group.merge_records()
+                        group.unlink()
 
-                if groups_created % 1000 == 0 and batch_commits:
+                if batch_commits:
                     self.env.cr.commit()
 
-                group._elect_master_record()
+            _logger.info('Record creation done after %s' % str(timeit.default_timer() - t1))
 
-                if dm_model.create_threshold > 0 and group.similarity * 100 <= dm_model.create_threshold:
-                    group.unlink()
-                    continue
+    def _find_fuzzy_duplicates(self, rule, field_name, tables, where_clause, where_clause_params, group_by):
+        """
+        Find the records whose values for the field of a fuzzy rule are similar, without comparing all the records two by two.
 
-                if dm_model.merge_mode == 'automatic':
-                    if group.similarity * 100 >= dm_model.merge_threshold:
-                        group.merge_records()
-                        group.unlink()
+        The candidates are first gathered in blocks, in SQL: two records end up in the same block when their values share the
+        first 4 characters of a word. Only the records of a same block are then compared, using the trigram similarity of their
+        values (as pg_trgm does). Similar records are finally grouped transitively.
 
-            _logger.info('Record creation done after %s' % str(timeit.default_timer() - t1))
+        :param rule: the data_merge.rule, whose match mode is 'fuzzy'
+        :param field_name: the SQL expression of the normalized (lowercase, unaccented) value of the field
+        :param group_by: an additional SQL expression, prefixed by a comma, the records should be split by (e.g. their company)
+        :return: a list of lists of similar record IDs
+        """
+        self.ensure_one()
+        table = self.env[self.res_model_name]._table
+
+        # Gather the blocks of candidates, ignoring the ones only made of a single record or of too common words:
+        #   | block key | {array of record IDs having a word starting with the block key}
+        self._cr.execute("""
+            SELECT
+                LEFT(tokens.token, 4) AS block_key,
+                ARRAY_AGG(DISTINCT tokens.id)
+            FROM (
+                SELECT
+                    %(model_table)s.id AS id,
+                    REGEXP_SPLIT_TO_TABLE(%(field)s, '\\W+') AS token
+                    %(group_by)s AS block_group
+                FROM %(tables)s
+                    WHERE length(%(field)s) > 0 %(where_clause)s
+            ) tokens
+            WHERE LENGTH(tokens.token) >= 3
+            GROUP BY block_key, tokens.block_group
+                HAVING COUNT(DISTINCT tokens.id) BETWEEN 2 AND %%s""" % {
+                    'field': field_name,
+                    'model_table': table,
+                    'tables': tables,
+                    'where_clause': where_clause,
+                    'group_by': group_by or ', NULL',
+                }, where_clause_params + [DM_FUZZY_MAX_BLOCK_SIZE])
+        blocks = [row[1] for row in self._cr.fetchall()]
+
+        # Fetch the values of the candidates, and compute their trigrams once
+        trigrams_by_id = {}
+        for ids_batch in split_every(10000, {res_id for block in blocks for res_id in block}):
+            self._cr.execute("""
+                SELECT %(model_table)s.id, %(field)s
+                FROM %(tables)s
+                    WHERE %(model_table)s.id IN %%s %(where_clause)s""" % {
+                        'field': field_name,
+                        'model_table': table,
+                        'tables': tables,
+                        'where_clause': where_clause,
+                    }, [tuple(ids_batch)] + where_clause_params)
+            trigrams_by_id.update((res_id, get_trigrams(value)) for res_id, value in self._cr.fetchall())
+
+        # Compare the candidates of each block, grouping the similar ones in a union-find structure
+        parent_by_id = {}
+
+        def find_root(res_id):
+            root = res_id
+            while parent_by_id.get(root, root) != root:
+                root = parent_by_id[root]
+            while res_id != root:
+                parent_by_id[res_id], res_id = root, parent_by_id[res_id]
+            return root
+
+        threshold = rule.fuzzy_threshold / 100
+        for block in blocks:
+            block = [res_id for res_id in block if trigrams_by_id.get(res_id)]
+            for i, res_id in enumerate(block):
+                trigrams = trigrams_by_id[res_id]
+                for other_id in block[i + 1:]:
+                    root, other_root = find_root(res_id), find_root(other_id)
+                    if root == other_root:
+                        continue
+                    other_trigrams = trigrams_by_id[other_id]
+                    if len(trigrams & other_trigrams) / len(trigrams | other_trigrams) >= threshold:
+                        parent_by_id[max(root, other_root)] = min(root, other_root)
+
+        groups = {}
+        for res_id in parent_by_id:
+            root = find_root(res_id)
+            groups.setdefault(root, {root}).add(res_id)
+        return [sorted(group) for group in groups.values()]
 
     ##############
     ### Overrides
@@ -7,6 +7,7 @@ from odoo.models import MAGIC_COLUMNS
 from odoo.osv.expression import FALSE_DOMAIN, OR, expression
 from odoo.tools import get_lang
 from odoo.tools.misc import format_datetime, format_date, partition as tools_partition
+from collections import defaultdict
 from collections.abc import Iterable
 
 from datetime import datetime, date
@@ -532,13 +533,17 @@ class DataMergeRecord(models.Model):
     #############
     @api.model_create_multi
     def create(self, vals_list):
-        for vals in vals_list:
-            group = self.env['data_merge.group'].browse(vals['group_id'])
-            if 'res_id' not in vals:
-                raise ValidationError(_('There is not referenced record'))
-            record = self.env[group.res_model_name].browse(vals['res_id'])
+        if any('res_id' not in vals for vals in vals_list):
+            raise ValidationError(_('There is not referenced record'))
 
-            if not record.exists():
+        # Check the existence of the referenced records with one query per model
+        groups = self.env['data_merge.group'].browse({vals['group_id'] for vals in vals_list})
+        res_model_name_by_group_id = {group.id: group.res_model_name for group in groups}
+        res_ids_by_model = defaultdict(set)
+        for vals in vals_list:
+            res_ids_by_model[res_model_name_by_group_id[vals['group_id']]].add(vals['res_id'])
+        for res_model_name, res_ids in res_ids_by_model.items():
+            if len(self.env[res_model_name].browse(res_ids).exists()) != len(res_ids):
                 raise ValidationError(_('The referenced record does not exist'))
         return super().create(vals_list)
 
@@ -17,9 +17,13 @@ class DataMergeRule(models.Model):
         lambda self: self._available_match_modes(),
         default='exact', string='Merge If', required=True)
     sequence = fields.Integer(string='Sequence', default=1)
+    fuzzy_threshold = fields.Integer(
+        string='Fuzzy Similarity', default=60,
+        help='Minimum similarity percentage of the words of two values for them to be considered as matching')
 
     _sql_constraints = [
         ('uniq_model_id_field_id', 'unique(model_id, field_id)', 'A field can only appear once!'),
+        ('check_fuzzy_threshold', 'CHECK(fuzzy_threshold > 0 AND fuzzy_threshold <= 100)', 'The fuzzy similarity should be between 1 and 100'),
     ]
 
     def _available_match_modes(self):
@@ -27,6 +31,7 @@ class DataMergeRule(models.Model):
         # can't conditionally set demo data...
         if self.env.context.get('install_mode') or self.env.registry.has_unaccent:
             modes.append(('accent', _("Case/Accent Insensitive Match")))
+        modes.append(('fuzzy', _("Fuzzy Match")))
         return modes
 
     def _update_default_rules(self):
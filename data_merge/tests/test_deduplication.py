@@ -39,6 +39,23 @@ class TestDeduplication(test_common.TestCommon):
 
         self.assertEqual(self.MyModel.records_to_merge_count, 2, '2 records should have been found')
 
+    def test_deduplication_fuzzy(self):
+        self._create_rule('x_name', 'fuzzy')
+
+        self._create_record('x_dm_test_model', x_name='Microsoft Corporation')
+        self._create_record('x_dm_test_model', x_name='Acme Corporation')
+        self._create_record('x_dm_test_model', x_name='Globex Corporation')
+        self.MyModel.find_duplicates()
+        self.MyModel._compute_records_to_merge_count()
+
+        self.assertEqual(self.MyModel.records_to_merge_count, 0, '0 record should have been found')
+
+        self._create_record('x_dm_test_model', x_name='Microsfot Corporation')
+        self.MyModel.find_duplicates()
+        self.MyModel._compute_records_to_merge_count()
+
+        self.assertEqual(self.MyModel.records_to_merge_count, 2, '2 records should have been found')
+
     def test_deduplication_multiple(self):
         self._create_rule('x_name', 'exact')
         self._create_rule('x_email', 'exact')
@@ -77,6 +94,26 @@ class TestDeduplication(test_common.TestCommon):
         self.assertEqual(self.MyModel.records_to_merge_count, 7, '7 records should have been found')
         self.assertEqual(self.DMGroup.search_count([('model_id', '=', self.MyModel.id)]), 2, '2 groups should have been created')
 
+    def test_deduplication_master_election(self):
+        self._create_rule('x_name', 'exact')
+
+        self._create_record('x_dm_test_model', x_name='toto')
+        self._create_record('x_dm_test_model', x_name='toto')
+        self._create_record('x_dm_test_model', x_name='titi')
+        self._create_record('x_dm_test_model', x_name='titi')
+        self._create_record('x_dm_test_model', x_name='titi')
+        self.MyModel.find_duplicates()
+
+        groups = self.DMGroup.search([('model_id', '=', self.MyModel.id)])
+        self.assertEqual(len(groups), 2, '2 groups should have been created')
+        masters = groups.record_ids.filtered('is_master')
+        self.assertEqual(len(masters), 2, 'Each group should have exactly one master record')
+        self.assertEqual(len(masters.group_id), 2, 'Each group should have its own master record')
+
+        # Finding the duplicates again must not create the same groups twice
+        self.MyModel.find_duplicates()
+        self.assertEqual(self.DMGroup.search_count([('model_id', '=', self.MyModel.id)]), 2, 'No new group should have been created')
+
     def test_deduplication_threshold(self):
         self._create_rule('x_name', 'exact')
         self._create_rule('x_email', 'exact')
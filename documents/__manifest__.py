@@ -29,6 +29,7 @@
         'data/workflow_data.xml',
         'data/files_data.xml',
         'data/mail_template_data.xml',
+        'data/ir_cron_data.xml',
         'views/res_config_settings_views.xml',
         'views/res_partner_views.xml',
         'views/documents_document_views.xml',
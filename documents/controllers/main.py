@@ -1,9 +1,9 @@
 # -*- coding: utf-8 -*-
 
 import base64
-import io
 import json
 import logging
+import time
 import zipfile
 from contextlib import ExitStack
 
@@ -17,6 +17,50 @@ from odoo.tools.translate import _
 
 logger = logging.getLogger(__name__)
 
+# Size of the chunks read from the filestore when streaming a zip file.
+ZIP_CHUNK_SIZE = 1024 * 1024
+# Mimetypes of the files already compressed, stored without compression in zip files.
+ZIP_STORED_MIMETYPES = {
+    'application/pdf',
+    'application/zip',
+    'application/gzip',
+    'application/x-7z-compressed',
+    'application/x-rar-compressed',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+    'application/vnd.oasis.opendocument.text',
+    'application/vnd.oasis.opendocument.spreadsheet',
+    'image/jpeg',
+    'image/png',
+    'image/gif',
+    'image/webp',
+    'audio/mpeg',
+    'video/mp4',
+    'video/mpeg',
+    'video/webm',
+}
+
+
+class _ZipOutput:
+    """ Write-only and non-seekable file object, buffering what zipfile writes
+    until it is popped to be streamed.
+    """
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
 
 class ShareRoute(http.Controller):
 
@@ -47,37 +91,58 @@ class ShareRoute(http.Controller):
     def _make_zip(self, name, documents):
         """returns zip files for the Document Inspector and the portal.
 
+        The zip file is built on-the-fly while it is streamed, the files being
+        read from the filestore by chunks, so that big folders can be
+        downloaded without loading them in memory.
+
         :param name: the name to give to the zip file.
         :param documents: files (documents.document) to be zipped.
         :return: a http response to download a zip file.
         """
-        # TODO: zip on-the-fly while streaming instead of loading the
-        #       entire zip in memory and sending it all at once.
-
-        stream = io.BytesIO()
         documents.check_access_rule('read')
-        try:
-            with zipfile.ZipFile(stream, 'w') as doc_zip:
-                for document in self._get_downloadable_documents(documents):
-                    if document.type != 'binary':
-                        continue
-                    binary_stream = request.env['ir.binary']._get_stream_from(document, 'raw')
-                    doc_zip.writestr(
-                        binary_stream.download_name,
-                        binary_stream.read(),  # Cf Todo: this is bad
-                        compress_type=zipfile.ZIP_DEFLATED
-                    )
-        except zipfile.BadZipfile:
-            logger.exception("BadZipfile exception")
-
-        content = stream.getvalue()  # Cf Todo: this is bad
+        binary_streams = [
+            request.env['ir.binary']._get_stream_from(document, 'raw')
+            for document in self._get_downloadable_documents(documents)
+            if document.type == 'binary'
+        ]
         headers = [
             ('Content-Type', 'zip'),
             ('X-Content-Type-Options', 'nosniff'),
-            ('Content-Length', len(content)),
             ('Content-Disposition', content_disposition(name))
         ]
-        return request.make_response(content, headers)
+        return request.make_response(self._generate_zip(binary_streams), headers)
+
+    def _generate_zip(self, binary_streams):
+        """ Generates the content of a zip file containing the given files, by
+        chunks. The files that are already compressed are stored as is.
+
+        As the generator is consumed while sending the response, after the
+        request's cursor has been released, it must not use the ORM.
+
+        :param binary_streams: the files (odoo.http.Stream) to be zipped.
+        :return: a generator of bytes.
+        """
+        output = _ZipOutput()
+        try:
+            with zipfile.ZipFile(output, 'w') as doc_zip:
+                for binary_stream in binary_streams:
+                    zip_info = zipfile.ZipInfo(binary_stream.download_name, time.localtime(time.time())[:6])
+                    zip_info.external_attr = 0o600 << 16
+                    zip_info.file_size = binary_stream.size or 0
+                    zip_info.compress_type = zipfile.ZIP_STORED \
+                        if binary_stream.mimetype in ZIP_STORED_MIMETYPES else zipfile.ZIP_DEFLATED
+                    with doc_zip.open(zip_info, 'w') as zip_file:
+                        if binary_stream.type == 'path':
+                            with open(binary_stream.path, 'rb') as file:
+                                for chunk in iter(lambda: file.read(ZIP_CHUNK_SIZE), b''):
+                                    zip_file.write(chunk)
+                                    yield output.pop()
+                        else:
+                            zip_file.write(binary_stream.read())
+                    yield output.pop()
+        except zipfile.BadZipfile:
+            logger.exception("BadZipfile exception")
+        yield output.pop()
 
     # Download & upload routes #####################################################################
 
@@ -162,13 +227,13 @@ class ShareRoute(http.Controller):
 
         with ExitStack() as stack:
             files = request.httprequest.files.getlist('ufile')
-            open_files = [stack.enter_context(io.BytesIO(file.read())) for file in files]
+            open_files = [file.stream for file in files]
 
             # merge together data from existing documents and from extra uploads
             document_id_index_map = {}
             current_index = len(open_files)
             for document in documents:
-                open_files.append(stack.enter_context(io.BytesIO(base64.b64decode(document.datas))))
+                open_files.append(stack.enter_context(document.attachment_id.sudo()._open_pdf_file()))
                 document_id_index_map[document.id] = current_index
                 current_index += 1
 
@@ -1,9 +1,9 @@
 # -*- coding: utf-8 -*-
 
 from odoo import models, fields, api, _
-from odoo.exceptions import AccessError, UserError
+from odoo.exceptions import AccessError
 from odoo.osv import expression
-from odoo.tools import image_process
+from odoo.tools import config, image_process
 from odoo.tools.misc import clean_context
 import base64
 from ast import literal_eval
@@ -43,6 +43,7 @@ class Document(models.Model):
     thumbnail = fields.Binary(readonly=False, store=True, attachment=True, compute='_compute_thumbnail')
     thumbnail_status = fields.Selection([
             ('present', 'Present'), # Document has a thumbnail
+            ('pending', 'Pending'), # Thumbnail to be generated by the cron
             ('error', 'Error'), # Error when generating the thumbnail
         ], compute="_compute_thumbnail_status", store=True, readonly=False,
     )
@@ -127,13 +128,12 @@ class Document(models.Model):
 
     @api.depends('checksum')
     def _compute_thumbnail(self):
+        # The thumbnails of the images are generated in background by _cron_generate_thumbnails,
+        # so that uploading many images does not require to decode them all within the request.
         for record in self:
-            try:
-                record.thumbnail = base64.b64encode(image_process(record.raw, size=(200, 140), crop='center'))
-            except (UserError, TypeError):
-                record.thumbnail = False
+            record.thumbnail = False
 
-    @api.depends("thumbnail")
+    @api.depends("thumbnail", "attachment_id.mimetype")
     def _compute_thumbnail_status(self):
         domain = [
             ('res_model', '=', self._name),
@@ -142,7 +142,38 @@ class Document(models.Model):
         ]
         documents_with_thumbnail = set(res['res_id'] for res in self.env['ir.attachment'].sudo().search_read(domain, ['res_id']))
         for document in self:
-            document.thumbnail_status = document.id in documents_with_thumbnail and 'present'
+            if document.id in documents_with_thumbnail:
+                document.thumbnail_status = 'present'
+            elif document._is_thumbnail_generated_in_background():
+                document.thumbnail_status = 'pending'
+            else:
+                document.thumbnail_status = False
+        if any(document.thumbnail_status == 'pending' for document in self):
+            cron = self.env.ref('documents.ir_cron_generate_thumbnails', raise_if_not_found=False)
+            if cron:
+                cron._trigger()
+
+    def _is_thumbnail_generated_in_background(self):
+        """ Whether the thumbnail of the document is generated from its file by _cron_generate_thumbnails. """
+        self.ensure_one()
+        return bool(self.attachment_id) and (self.mimetype or '').startswith('image/')
+
+    @api.model
+    def _cron_generate_thumbnails(self, batch_size=100):
+        """ Generates the thumbnails of the pending documents by batches of batch_size documents. """
+        documents = self.with_context(active_test=False).search([('thumbnail_status', '=', 'pending')], limit=batch_size + 1)
+        for document in documents[:batch_size]:
+            try:
+                with self.env.cr.savepoint():
+                    document.thumbnail = base64.b64encode(image_process(document.raw, size=(200, 140), crop='center'))
+            except Exception:
+                # Any file that cannot be decoded must leave the queue, or it would block the next batches
+                document.thumbnail_status = 'error'
+        if not config['test_enable']:
+            self.env.cr.commit()
+
+        if len(documents) > batch_size:
+            self.env.ref('documents.ir_cron_generate_thumbnails')._trigger()
 
     @api.depends('attachment_type', 'url')
     def _compute_type(self):
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 
-import base64
 import io
 
 from odoo import models, api
@@ -22,7 +21,7 @@ class IrAttachment(models.Model):
                     'old_page_number': 5,
                 }],
             }]
-        :param open_files: array of open file objects.
+        :param open_files: array of open file objects, as returned by _open_pdf_file for existing attachments.
         :returns: the new PDF attachments
         """
         vals_list = []
@@ -37,10 +36,25 @@ class IrAttachment(models.Model):
                 output.write(stream)
                 vals_list.append({
                     'name': new_file['name'] + ".pdf",
-                    'datas': base64.b64encode(stream.getvalue()),
+                    'raw': stream.getvalue(),
                 })
         return self.create(vals_list)
 
+    def _open_pdf_file(self):
+        """Returns a file object on the content of the attachment, to be parsed with PdfFileReader.
+
+        The file is opened directly from the filestore when possible, so that PdfFileReader only
+        reads the objects it needs instead of the whole base64-decoded content being loaded in memory.
+        The caller is responsible for closing the returned file.
+        """
+        self.ensure_one()
+        if self.store_fname:
+            try:
+                return open(self._full_path(self.store_fname), 'rb')
+            except OSError:
+                pass
+        return io.BytesIO(self.raw or b'')
+
     def _create_document(self, vals):
         """
         Implemented by bridge modules that create new documents if attachments are linked to
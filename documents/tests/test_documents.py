@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 from odoo.tests.common import TransactionCase, new_test_user
+from odoo.tools import image_process
+from unittest.mock import patch
 import base64
 
 GIF = b"R0lGODdhAQABAIAAAP///////ywAAAAAAQABAAACAkQBADs="
@@ -477,6 +479,59 @@ class TestCaseDocuments(TransactionCase):
         document.with_user(self.doc_user.id).write({'datas': TEXT, 'mimetype': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'})
         self.assertEqual(document.mimetype, 'application/vnd.openxmlformats-officedocument.wordprocessingml.document', "should preserve office mime type")
 
+    def test_generate_thumbnails(self):
+        """
+        Tests that the thumbnails of the images are generated by the cron, and not when the documents are uploaded.
+        """
+        document_gif = self.env['documents.document'].create({'datas': GIF, 'name': 'file.gif', 'folder_id': self.folder_b.id})
+        document_broken = self.env['documents.document'].create({
+            'datas': TEXT,
+            'name': 'broken.png',
+            'mimetype': 'image/png',
+            'folder_id': self.folder_b.id,
+        })
+        self.assertEqual(document_gif.thumbnail_status, 'pending', "the thumbnail should not be generated on upload")
+        self.assertFalse(document_gif.thumbnail)
+        self.assertFalse(self.document_txt.thumbnail_status, "only the images should get a thumbnail")
+
+        self.env['documents.document']._cron_generate_thumbnails()
+        self.assertEqual(document_gif.thumbnail_status, 'present')
+        self.assertTrue(document_gif.thumbnail)
+        self.assertEqual(document_broken.thumbnail_status, 'error')
+        self.assertFalse(document_broken.thumbnail)
+
+    def test_generate_thumbnails_decoding_error(self):
+        """
+        Tests that a file failing to be decoded does not prevent the other thumbnails of the batch from being generated.
+        """
+        truncated_gif = base64.b64decode(GIF)[:20]
+        document_truncated = self.env['documents.document'].create({
+            'datas': base64.b64encode(truncated_gif),
+            'name': 'truncated.gif',
+            'mimetype': 'image/gif',
+            'folder_id': self.folder_b.id,
+        })
+
+        def _image_process(source, *args, **kwargs):
+            if source == truncated_gif:
+                raise OSError("image file is truncated")
+            return image_process(source, *args, **kwargs)
+
+        with patch('odoo.addons.documents.models.document.image_process', side_effect=_image_process):
+            self.env['documents.document']._cron_generate_thumbnails()
+
+        self.assertEqual(document_truncated.thumbnail_status, 'error')
+        self.assertEqual(self.document_gif.thumbnail_status, 'present', "the batch should not be rolled back by a decoding error")
+        self.assertFalse(self.env['documents.document'].search_count([('thumbnail_status', '=', 'pending')]))
+
+    def test_open_pdf_file(self):
+        """
+        Tests that the file given to the PDF split matches the content of the attachment.
+        """
+        attachment = self.env['ir.attachment'].create({'raw': b'%PDF-1.4 content', 'name': 'file.pdf'})
+        with attachment._open_pdf_file() as pdf_file:
+            self.assertEqual(pdf_file.read(), b'%PDF-1.4 content')
+
     def test_cascade_delete(self):
         """
         Makes sure that documents are unlinked when their attachment is unlinked.
@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 
 import io
+import os
 import zipfile
+from unittest.mock import patch
 
 from odoo import http, fields
+from odoo.addons.documents.controllers.main import ShareRoute
 from odoo.tests.common import HttpCase
 
 
@@ -37,6 +40,48 @@ class TestDocumentsRoutes(HttpCase):
         with io.BytesIO(response.content) as buffer, zipfile.ZipFile(buffer) as zipfile_obj:
             self.assertEqual(zipfile_obj.read(self.document_txt.name), b'TEST')
 
+    def test_documents_zip_compress_type(self):
+        self.authenticate('admin', 'admin')
+        raw_pdf = b'%PDF-1.4\n' + b'0' * 100
+        document_pdf = self.env['documents.document'].create({
+            'raw': raw_pdf,
+            'name': 'file.pdf',
+            'mimetype': 'application/pdf',
+            'folder_id': self.folder_a.id,
+        })
+        response = self.url_open('/document/zip', data={
+            'file_ids': ','.join(str(document_id) for document_id in (self.document_txt + document_pdf).ids),
+            'zip_name': 'testZip.zip',
+            'csrf_token': http.Request.csrf_token(self),
+        })
+        self.assertEqual(response.status_code, 200)
+        with io.BytesIO(response.content) as buffer, zipfile.ZipFile(buffer) as zipfile_obj:
+            compress_types = {info.filename: info.compress_type for info in zipfile_obj.infolist()}
+            self.assertEqual(compress_types, {
+                'file.txt': zipfile.ZIP_DEFLATED,
+                'file.pdf': zipfile.ZIP_STORED,
+            }, "The files already compressed should be stored as is")
+            self.assertEqual(zipfile_obj.read('file.txt'), b'TEST')
+            self.assertEqual(zipfile_obj.read('file.pdf'), raw_pdf)
+
+    def test_documents_zip_large_file(self):
+        raw_pdf = b'%PDF-1.4\n' + os.urandom(64 * 1024)
+        document_pdf = self.env['documents.document'].create({
+            'raw': raw_pdf,
+            'name': 'large.pdf',
+            'mimetype': 'application/pdf',
+            'folder_id': self.folder_a.id,
+        })
+        binary_stream = self.env['ir.binary']._get_stream_from(document_pdf, 'raw')
+        self.assertEqual(binary_stream.type, 'path', "The file should be read from the filestore")
+
+        with patch('odoo.addons.documents.controllers.main.ZIP_CHUNK_SIZE', 4 * 1024):
+            chunks = list(ShareRoute()._generate_zip([binary_stream]))
+        self.assertGreaterEqual(len([chunk for chunk in chunks if chunk]), 16,
+                                "The file should be zipped and sent by chunks")
+        with io.BytesIO(b''.join(chunks)) as buffer, zipfile.ZipFile(buffer) as zipfile_obj:
+            self.assertEqual(zipfile_obj.read('large.pdf'), raw_pdf)
+
     def test_documents_from_web(self):
         self.authenticate('admin', 'admin')
         raw_gif = b"R0lGODdhAQABAIAAAP///////ywAAAAAAQABAAACAkQBADs="
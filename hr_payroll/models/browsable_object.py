@@ -19,11 +19,53 @@ class ValueChecker(JSONEncoder):
 
 valueChecker = ValueChecker()
 
+class PayslipsHistory(object):
+    """ Sums over the done and paid payslips of a batch of employees, used by the helpers of the browsable objects.
+
+    Each sum is computed for all the employees of the batch at once, the first time any of them needs it, and then served
+    from memory. The rules of a batch of payslips typically call the same helpers with the same periods for every employee
+    (e.g. the year-to-date totals), which hence only cost a single grouped query for the whole batch.
+    """
+    def __init__(self, employee_ids, env):
+        self.employee_ids = tuple(set(employee_ids))
+        self.env = env
+        self.sums = {}
+
+    def _get_sums(self, query, employee_id, code, from_date, to_date):
+        """ Returns the row of aggregated values query gives for employee_id, or None if there is none.
+
+        :param query: an SQL query using the parameters employee_ids, code, from_date and to_date, and whose first column is
+                      the employee grouped by.
+        """
+        if to_date is None:
+            to_date = fields.Date.today()
+        if employee_id not in self.employee_ids:
+            # An employee outside of the batch; don't pollute the sums of the batch with it
+            return PayslipsHistory([employee_id], self.env)._get_sums(query, employee_id, code, from_date, to_date)
+
+        key = (query, code, from_date, to_date)
+        if key not in self.sums:
+            self.env['hr.payslip'].flush_model(['employee_id', 'state', 'date_from', 'date_to'])
+            self.env['hr.payslip.line'].flush_model(['total', 'slip_id', 'category_id', 'code'])
+            self.env['hr.payslip.input'].flush_model(['amount', 'payslip_id', 'code'])
+            self.env['hr.payslip.worked_days'].flush_model(['number_of_days', 'number_of_hours', 'amount', 'payslip_id', 'work_entry_type_id'])
+            self.env['hr.salary.rule.category'].flush_model(['code'])
+            self.env['hr.work.entry.type'].flush_model(['code'])
+            self.env.cr.execute(query, {
+                'employee_ids': self.employee_ids,
+                'code': code,
+                'from_date': from_date,
+                'to_date': to_date,
+            })
+            self.sums[key] = {row[0]: row[1:] for row in self.env.cr.fetchall()}
+        return self.sums[key].get(employee_id)
+
 class BrowsableObject(object):
-    def __init__(self, employee_id, dict, env):
+    def __init__(self, employee_id, dict, env, history=None):
         self.employee_id = employee_id
         self.dict = dict
         self.env = env
+        self._history = history
 
     def __getattr__(self, attr):
         value = None
@@ -35,6 +77,10 @@ class BrowsableObject(object):
     def __getitem__(self, key):
         return self.dict[key] or 0.0
 
+    def _get_history_sums(self, query, code, from_date, to_date):
+        history = self._history or PayslipsHistory([self.employee_id], self.env)
+        return history._get_sums(query, self.employee_id, code, from_date, to_date)
+
 class ResultRules(BrowsableObject):
     def __getattr__(self, attr):
         return attr in self.dict and self.dict.__getitem__(attr) or {'total': 0, 'amount': 0, 'quantity': 0}
@@ -45,28 +91,23 @@ class ResultRules(BrowsableObject):
 class InputLine(BrowsableObject):
     """a class that will be used into the python code, mainly for usability purposes"""
     def sum(self, code, from_date, to_date=None):
-        if to_date is None:
-            to_date = fields.Date.today()
-        self.env.cr.execute("""
-            SELECT sum(amount) as sum
+        res = self._get_history_sums("""
+            SELECT hp.employee_id, sum(amount) as sum
             FROM hr_payslip as hp, hr_payslip_input as pi
-            WHERE hp.employee_id = %s AND hp.state in ('done', 'paid')
-            AND hp.date_from >= %s AND hp.date_to <= %s AND hp.id = pi.payslip_id AND pi.code = %s""",
-            (self.employee_id, from_date, to_date, code))
-        return self.env.cr.fetchone()[0] or 0.0
+            WHERE hp.employee_id IN %(employee_ids)s AND hp.state in ('done', 'paid')
+            AND hp.date_from >= %(from_date)s AND hp.date_to <= %(to_date)s AND hp.id = pi.payslip_id AND pi.code = %(code)s
+            GROUP BY hp.employee_id""", code, from_date, to_date)
+        return res and res[0] or 0.0
 
 class WorkedDays(BrowsableObject):
     """a class that will be used into the python code, mainly for usability purposes"""
     def _sum(self, code, from_date, to_date=None):
-        if to_date is None:
-            to_date = fields.Date.today()
-        self.env.cr.execute("""
-            SELECT sum(number_of_days) as number_of_days, sum(number_of_hours) as number_of_hours
+        return self._get_history_sums("""
+            SELECT hp.employee_id, sum(number_of_days) as number_of_days, sum(number_of_hours) as number_of_hours
             FROM hr_payslip as hp, hr_payslip_worked_days as pi
-            WHERE hp.employee_id = %s AND hp.state in ('done', 'paid')
-            AND hp.date_from >= %s AND hp.date_to <= %s AND hp.id = pi.payslip_id AND pi.work_entry_type_id IN (SELECT id FROM hr_work_entry_type WHERE code = %s)""",
-            (self.employee_id, from_date, to_date, code))
-        return self.env.cr.fetchone()
+            WHERE hp.employee_id IN %(employee_ids)s AND hp.state in ('done', 'paid')
+            AND hp.date_from >= %(from_date)s AND hp.date_to <= %(to_date)s AND hp.id = pi.payslip_id AND pi.work_entry_type_id IN (SELECT id FROM hr_work_entry_type WHERE code = %(code)s)
+            GROUP BY hp.employee_id""", code, from_date, to_date)
 
     def sum(self, code, from_date, to_date=None):
         res = self._sum(code, from_date, to_date)
@@ -80,65 +121,47 @@ class Payslips(BrowsableObject):
     """a class that will be used into the python code, mainly for usability purposes"""
 
     def sum(self, code, from_date, to_date=None):
-        if to_date is None:
-            to_date = fields.Date.today()
-        self.env.cr.execute("""
-            SELECT sum(pl.total)
+        res = self._get_history_sums("""
+            SELECT hp.employee_id, sum(pl.total)
             FROM hr_payslip as hp, hr_payslip_line as pl
-            WHERE hp.employee_id = %s
+            WHERE hp.employee_id IN %(employee_ids)s
             AND hp.state in ('done', 'paid')
-            AND hp.date_from >= %s
-            AND hp.date_to <= %s
+            AND hp.date_from >= %(from_date)s
+            AND hp.date_to <= %(to_date)s
             AND hp.id = pl.slip_id
-            AND pl.code = %s""", (self.employee_id, from_date, to_date, code))
-        res = self.env.cr.fetchone()
+            AND pl.code = %(code)s
+            GROUP BY hp.employee_id""", code, from_date, to_date)
         return res and res[0] or 0.0
 
     def rule_parameter(self, code):
         return self.env['hr.rule.parameter']._get_parameter_from_code(code, self.dict.date_to)
 
     def sum_category(self, code, from_date, to_date=None):
-        if to_date is None:
-            to_date = fields.Date.today()
-
-        self.env['hr.payslip'].flush_model(['employee_id', 'state', 'date_from', 'date_to'])
-        self.env['hr.payslip.line'].flush_model(['total', 'slip_id', 'category_id'])
-        self.env['hr.salary.rule.category'].flush_model(['code'])
-
-        self.env.cr.execute("""
-            SELECT sum(pl.total)
+        res = self._get_history_sums("""
+            SELECT hp.employee_id, sum(pl.total)
             FROM hr_payslip as hp, hr_payslip_line as pl, hr_salary_rule_category as rc
-            WHERE hp.employee_id = %s
+            WHERE hp.employee_id IN %(employee_ids)s
             AND hp.state in ('done', 'paid')
-            AND hp.date_from >= %s
-            AND hp.date_to <= %s
+            AND hp.date_from >= %(from_date)s
+            AND hp.date_to <= %(to_date)s
             AND hp.id = pl.slip_id
             AND rc.id = pl.category_id
-            AND rc.code = %s""", (self.employee_id, from_date, to_date, code))
-        res = self.env.cr.fetchone()
+            AND rc.code = %(code)s
+            GROUP BY hp.employee_id""", code, from_date, to_date)
         return res and res[0] or 0.0
 
     def sum_worked_days(self, code, from_date, to_date=None):
-        if to_date is None:
-            to_date = fields.Date.today()
-
-        query = """
-            SELECT sum(hwd.amount)
+        res = self._get_history_sums("""
+            SELECT hp.employee_id, sum(hwd.amount)
             FROM hr_payslip hp, hr_payslip_worked_days hwd, hr_work_entry_type hwet
             WHERE hp.state in ('done', 'paid')
             AND hp.id = hwd.payslip_id
             AND hwet.id = hwd.work_entry_type_id
-            AND hp.employee_id = %(employee)s
-            AND hp.date_to <= %(stop)s
+            AND hp.employee_id IN %(employee_ids)s
+            AND hp.date_to <= %(to_date)s
             AND hwet.code = %(code)s
-            AND hp.date_from >= %(start)s"""
-
-        self.env.cr.execute(query, {
-            'employee': self.employee_id,
-            'code': code,
-            'start': from_date,
-            'stop': to_date})
-        res = self.env.cr.fetchone()
+            AND hp.date_from >= %(from_date)s
+            GROUP BY hp.employee_id""", code, from_date, to_date)
         return res[0] if res else 0.0
 
     @property
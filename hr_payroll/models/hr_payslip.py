@@ -4,22 +4,26 @@
 import base64
 import logging
 import random
+import time
 
 from collections import defaultdict, Counter
 from datetime import date, datetime
 from dateutil.relativedelta import relativedelta
 
 from odoo import api, Command, fields, models, _
-from odoo.addons.hr_payroll.models.browsable_object import BrowsableObject, InputLine, WorkedDays, Payslips, ResultRules
+from odoo.addons.hr_payroll.models.browsable_object import BrowsableObject, InputLine, WorkedDays, Payslips, PayslipsHistory, ResultRules
 from odoo.exceptions import UserError, ValidationError
 from odoo.osv.expression import AND
-from odoo.tools import float_round, date_utils, convert_file, html2plaintext, is_html_empty, format_amount
+from odoo.tools import config, float_round, date_utils, convert_file, exception_to_unicode, html2plaintext, is_html_empty, format_amount, split_every
 from odoo.tools.float_utils import float_compare
 from odoo.tools.misc import format_date
 from odoo.tools.safe_eval import safe_eval
 
 _logger = logging.getLogger(__name__)
 
+# Number of payslips rendered by a single wkhtmltopdf invocation
+PDF_RENDER_BATCH_SIZE = 50
+
 
 class HrPayslip(models.Model):
     _name = 'hr.payslip'
@@ -126,6 +130,8 @@ class HrPayslip(models.Model):
     is_superuser = fields.Boolean(compute="_compute_is_superuser")
     edited = fields.Boolean()
     queued_for_pdf = fields.Boolean(default=False)
+    queued_for_compute = fields.Boolean(default=False, copy=False)
+    compute_error = fields.Text(readonly=True, copy=False)
 
     salary_attachment_ids = fields.Many2many(
         'hr.salary.attachment',
@@ -359,14 +365,47 @@ class HrPayslip(models.Model):
                 result[payslip.struct_id.report_id] |= payslip
         return result
 
+    def _render_pdfs(self, report):
+        """ Renders the pdf of each payslip with the given report, in as few wkhtmltopdf invocations as possible.
+        The payslips are rendered by chunks sharing the same language, and the resulting document is split back
+        per payslip.
+
+        :return: A dict mapping the id of each payslip to its pdf content.
+        """
+        pdf_content_by_id = {}
+        payslips_by_lang = defaultdict(lambda: self.env['hr.payslip'])
+        for payslip in self:
+            payslips_by_lang[payslip.employee_id.address_home_id.lang] |= payslip
+        # The reports are rendered in html during the tests (see _render_qweb_pdf), which can't be split
+        bulk_rendering = not (config['test_enable'] or config['test_file']) or self.env.context.get('force_report_rendering')
+        for lang, payslips in payslips_by_lang.items():
+            IrActionsReport = self.env['ir.actions.report'].sudo().with_context(lang=lang)
+            for payslips_chunk in split_every(PDF_RENDER_BATCH_SIZE, payslips.ids):
+                if bulk_rendering:
+                    streams = IrActionsReport._render_qweb_pdf_prepare_streams(report, None, res_ids=list(payslips_chunk))
+                    for payslip_id, stream_data in streams.items():
+                        # When the document can't be split, the payslips get no stream and the whole document is
+                        # returned under the False key
+                        stream = stream_data['stream']
+                        if not stream:
+                            continue
+                        if payslip_id:
+                            pdf_content_by_id[payslip_id] = stream.getvalue()
+                        stream.close()
+                # Render separately the payslips that couldn't be split from the bulk document
+                for payslip_id in payslips_chunk:
+                    if payslip_id not in pdf_content_by_id:
+                        pdf_content_by_id[payslip_id] = IrActionsReport._render_qweb_pdf(report, payslip_id)[0]
+        return pdf_content_by_id
+
     def _generate_pdf(self):
         mapped_reports = self._get_pdf_reports()
         attachments_vals_list = []
         generic_name = _("Payslip")
         template = self.env.ref('hr_payroll.mail_template_new_payslip', raise_if_not_found=False)
         for report, payslips in mapped_reports.items():
+            pdf_content_by_id = payslips._render_pdfs(report)
             for payslip in payslips:
-                pdf_content, dummy = self.env['ir.actions.report'].sudo().with_context(lang=payslip.employee_id.address_home_id.lang)._render_qweb_pdf(report, payslip.id)
                 if report.print_report_name:
                     pdf_name = safe_eval(report.print_report_name, {'object': payslip})
                 else:
@@ -374,7 +413,7 @@ class HrPayslip(models.Model):
                 attachments_vals_list.append({
                     'name': pdf_name,
                     'type': 'binary',
-                    'raw': pdf_content,
+                    'raw': pdf_content_by_id[payslip.id],
                     'res_model': payslip._name,
                     'res_id': payslip.id
                 })
@@ -490,11 +529,50 @@ class HrPayslip(models.Model):
             payslip.write({
                 'number': number,
                 'state': 'verify',
-                'compute_date': today
+                'compute_date': today,
+                # computed now, the cron must not compute it again
+                'queued_for_compute': False,
+                'compute_error': False,
             })
         self.env['hr.payslip.line'].create(payslips._get_payslip_lines())
         return True
 
+    def _queue_compute_sheet(self):
+        """ Computes the payslips in background, by chunks committed independently (see _cron_compute_sheet). """
+        payslips = self.filtered(lambda slip: slip.state in ['draft', 'verify'])
+        if not payslips:
+            return
+        payslips.write({
+            'queued_for_compute': True,
+            'compute_error': False,
+        })
+        self.env.ref('hr_payroll.ir_cron_compute_payslips')._trigger()
+
+    def _compute_sheet_isolated(self):
+        """ Same as compute_sheet, except that a failing payslip does not prevent the other ones from being computed.
+        The payslips are computed all together, and one by one only if that fails, in order to find the faulty ones.
+
+        :return: A dict mapping each payslip that could not be computed to its error message.
+        """
+        try:
+            with self.env.cr.savepoint():
+                self.compute_sheet()
+            return {}
+        except Exception as e:
+            self.env.invalidate_all()
+            if len(self) == 1:
+                return {self: exception_to_unicode(e)}
+
+        errors = {}
+        for payslip in self:
+            try:
+                with self.env.cr.savepoint():
+                    payslip.compute_sheet()
+            except Exception as e:
+                self.env.invalidate_all()
+                errors[payslip] = exception_to_unicode(e)
+        return errors
+
     def action_refresh_from_work_entries(self):
         # Refresh the whole payslip in case the HR has modified some work entries
         # after the payslip generation
@@ -655,6 +733,8 @@ class HrPayslip(models.Model):
 
     def _get_payslip_lines(self):
         line_vals = []
+        # Share the sums over the previous payslips between all the payslips computed together (see PayslipsHistory)
+        history = PayslipsHistory(self.employee_id.ids, self.env)
         for payslip in self:
             if not payslip.contract_id:
                 raise UserError(_("There's no contract set on payslip %s for %s. Check that there is at least a contract set on the employee form.", payslip.name, payslip.employee_id.name))
@@ -662,12 +742,21 @@ class HrPayslip(models.Model):
             localdict = self.env.context.get('force_payslip_localdict', None)
             if localdict is None:
                 localdict = payslip._get_localdict()
+            for browsable_object in (localdict['payslip'], localdict['worked_days'], localdict['inputs']):
+                browsable_object._history = history
+            # The rules are evaluated directly in localdict (see hr.salary.rule's _eval_code): let safe_eval check it once
+            # for all of them
+            safe_eval('True', localdict, nocopy=True)
 
             rules_dict = localdict['rules'].dict
             result_rules_dict = localdict['result_rules'].dict
 
             blacklisted_rule_ids = self.env.context.get('prevent_payslip_computation_line_ids', [])
 
+            # Retrieve the line name in the employee's lang
+            employee_lang = payslip.employee_id.sudo().address_home_id.lang
+            # This actually has an impact, don't remove this line
+            context = {'lang': employee_lang}
             result = {}
             for rule in sorted(payslip.struct_id.rule_ids, key=lambda x: x.sequence):
                 if rule.id in blacklisted_rule_ids:
@@ -679,10 +768,6 @@ class HrPayslip(models.Model):
                     'result_name': False
                 })
                 if rule._satisfy_condition(localdict):
-                    # Retrieve the line name in the employee's lang
-                    employee_lang = payslip.employee_id.sudo().address_home_id.lang
-                    # This actually has an impact, don't remove this line
-                    context = {'lang': employee_lang}
                     if rule.code in localdict['same_type_input_lines']:
                         for multi_line_rule in localdict['same_type_input_lines'][rule.code]:
                             localdict['inputs'].dict[rule.code] = multi_line_rule
@@ -997,16 +1082,41 @@ class HrPayslip(models.Model):
         ])
         if not payslips:
             return False
-        BATCH_SIZE = batch_size or 50
+        BATCH_SIZE = batch_size or 200
         payslips_batch = payslips[:BATCH_SIZE]
+        start_time = time.monotonic()
         payslips_batch._generate_pdf()
         payslips_batch.write({'queued_for_pdf': False})
+        duration = time.monotonic() - start_time
+        _logger.info("Generated the pdfs of %s payslips in %.2fs (%.1f payslips/min), %s remaining.",
+            len(payslips_batch), duration, len(payslips_batch) * 60 / duration if duration else 0, len(payslips) - len(payslips_batch))
         # if necessary, retrigger the cron to generate more pdfs
         if len(payslips) > BATCH_SIZE:
             self.env.ref('hr_payroll.ir_cron_generate_payslip_pdfs')._trigger()
             return True
         return False
 
+    @api.model
+    def _cron_compute_sheet(self, batch_size=False):
+        BATCH_SIZE = batch_size or 100
+        payslips = self.search([('queued_for_compute', '=', True)], order='payslip_run_id, id', limit=BATCH_SIZE + 1)
+        if not payslips:
+            return False
+        payslips_batch = payslips[:BATCH_SIZE]
+        errors = payslips_batch._compute_sheet_isolated()
+        payslips_batch.write({'queued_for_compute': False})
+        for payslip, error in errors.items():
+            _logger.warning("Computation of payslip %s failed: %s", payslip.id, error)
+            payslip.compute_error = error
+        payslips_batch.payslip_run_id.filtered(lambda run: not run.payslip_queued_count)._notify_compute_done()
+        if not config['test_enable']:
+            self.env.cr.commit()
+        # if necessary, retrigger the cron to compute the next payslips
+        if len(payslips) > BATCH_SIZE:
+            self.env.ref('hr_payroll.ir_cron_compute_payslips')._trigger()
+            return True
+        return False
+
     # Payroll Dashboard
     @api.model
     def _dashboard_default_action(self, name, res_model, res_ids, additional_context=None):
@@ -29,6 +29,10 @@ class HrPayslipRun(models.Model):
         states={'draft': [('readonly', False)]},
         default=lambda self: fields.Date.to_string((datetime.now() + relativedelta(months=+1, day=1, days=-1)).date()))
     payslip_count = fields.Integer(compute='_compute_payslip_count')
+    payslip_queued_count = fields.Integer(compute='_compute_payslip_compute_progress')
+    payslip_error_count = fields.Integer(compute='_compute_payslip_compute_progress')
+    compute_progress = fields.Float(compute='_compute_payslip_compute_progress',
+        help="Percentage of the payslips of the batch already computed in background.")
     company_id = fields.Many2one('res.company', string='Company', readonly=True, required=True,
         default=lambda self: self.env.company)
     country_id = fields.Many2one(
@@ -41,6 +45,23 @@ class HrPayslipRun(models.Model):
         for payslip_run in self:
             payslip_run.payslip_count = len(payslip_run.slip_ids)
 
+    @api.depends('slip_ids.queued_for_compute', 'slip_ids.compute_error')
+    def _compute_payslip_compute_progress(self):
+        def count_by_run(domain):
+            groups = self.env['hr.payslip']._read_group(
+                [('payslip_run_id', 'in', self.ids)] + domain, ['payslip_run_id'], ['payslip_run_id'])
+            return {group['payslip_run_id'][0]: group['payslip_run_id_count'] for group in groups}
+
+        total_count = count_by_run([])
+        queued_count = count_by_run([('queued_for_compute', '=', True)])
+        error_count = count_by_run([('compute_error', '!=', False)])
+        for payslip_run in self:
+            total = total_count.get(payslip_run.id, 0)
+            queued = queued_count.get(payslip_run.id, 0)
+            payslip_run.payslip_queued_count = queued
+            payslip_run.payslip_error_count = error_count.get(payslip_run.id, 0)
+            payslip_run.compute_progress = 100.0 * (total - queued) / total if total else 100.0
+
     @api.depends('slip_ids', 'state')
     def _compute_state_change(self):
         for payslip_run in self:
@@ -65,6 +86,8 @@ class HrPayslipRun(models.Model):
         self.write({'state': 'paid'})
 
     def action_validate(self):
+        if any(self.mapped('payslip_queued_count')):
+            raise UserError(_('You cannot validate a batch whose payslips are still being computed.'))
         payslip_done_result = self.mapped('slip_ids').filtered(lambda slip: slip.state not in ['draft', 'cancel']).action_payslip_done()
         self.action_close()
         return payslip_done_result
@@ -89,6 +112,23 @@ class HrPayslipRun(models.Model):
             'res_id': self.id,
         }
 
+    def action_open_payslips_in_error(self):
+        self.ensure_one()
+        action = self.action_open_payslips()
+        action['domain'] = [('payslip_run_id', '=', self.id), ('compute_error', '!=', False)]
+        action['name'] = _("Payslips in Error")
+        return action
+
+    def _notify_compute_done(self):
+        """ Posts a summary on the batches whose payslips were all computed in background. """
+        for payslip_run in self:
+            if payslip_run.payslip_error_count:
+                payslip_run.message_post(body=_(
+                    "The payslips of the batch have been computed. %s payslip(s) could not be computed, "
+                    "check their error message.", payslip_run.payslip_error_count))
+            else:
+                payslip_run.message_post(body=_("All the payslips of the batch have been computed."))
+
     def _generate_payslips(self):
         action = self.env["ir.actions.actions"]._for_xml_id("hr_payroll.action_hr_payslip_by_employees")
         action['context'] = repr(self.env.context)
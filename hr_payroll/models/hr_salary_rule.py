@@ -1,9 +1,9 @@
 # -*- coding:utf-8 -*-
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
-from odoo import api, fields, models, _
+from odoo import api, fields, models, tools, _
 from odoo.exceptions import UserError
-from odoo.tools.safe_eval import safe_eval
+from odoo.tools.safe_eval import _BUILTINS, test_python_expr, unsafe_eval
 
 
 class HrSalaryRule(models.Model):
@@ -101,6 +101,28 @@ result = rules.NET > categories.NET * 0.10''',
             self.code,
             e))
 
+    @api.model
+    @tools.ormcache('expr', 'mode')
+    def _get_compiled_code(self, expr, mode):
+        """ Compiles and validates the python code of a rule, the same way safe_eval does, but only once per code and worker.
+        As the cache is keyed by the code itself, modifying a rule never lets the previous version of its code be used.
+        """
+        message = test_python_expr(expr, mode=mode)
+        if message:
+            raise ValueError(message)
+        return compile(expr.strip(), '', mode)
+
+    @api.model
+    def _eval_code(self, expr, localdict, mode='eval'):
+        """ Evaluates the python code of a rule directly in localdict.
+
+        Unlike safe_eval, localdict is neither copied nor checked at each evaluation, as the rules of a payslip are evaluated
+        hundreds of times in the same dict: _get_payslip_lines lets safe_eval check it once per payslip instead. The
+        restricted builtins of safe_eval are set here, whoever the caller is.
+        """
+        localdict['__builtins__'] = _BUILTINS
+        return unsafe_eval(self._get_compiled_code(expr, mode), localdict)
+
     def _compute_rule(self, localdict):
 
         """
@@ -111,19 +133,19 @@ result = rules.NET > categories.NET * 0.10''',
         self.ensure_one()
         if self.amount_select == 'fix':
             try:
-                return self.amount_fix or 0.0, float(safe_eval(self.quantity, localdict)), 100.0
+                return self.amount_fix or 0.0, float(self._eval_code(self.quantity, localdict)), 100.0
             except Exception as e:
                 self._raise_error(localdict, _("Wrong quantity defined for:"), e)
         if self.amount_select == 'percentage':
             try:
-                return (float(safe_eval(self.amount_percentage_base, localdict)),
-                        float(safe_eval(self.quantity, localdict)),
+                return (float(self._eval_code(self.amount_percentage_base, localdict)),
+                        float(self._eval_code(self.quantity, localdict)),
                         self.amount_percentage or 0.0)
             except Exception as e:
                 self._raise_error(localdict, _("Wrong percentage base or quantity defined for:"), e)
         else:  # python code
             try:
-                safe_eval(self.amount_python_compute or 0.0, localdict, mode='exec', nocopy=True)
+                self._eval_code(self.amount_python_compute or 0.0, localdict, mode='exec')
                 return float(localdict['result']), localdict.get('result_qty', 1.0), localdict.get('result_rate', 100.0)
             except Exception as e:
                 self._raise_error(localdict, _("Wrong python code defined for:"), e)
@@ -134,13 +156,13 @@ result = rules.NET > categories.NET * 0.10''',
             return True
         if self.condition_select == 'range':
             try:
-                result = safe_eval(self.condition_range, localdict)
+                result = self._eval_code(self.condition_range, localdict)
                 return self.condition_range_min <= result <= self.condition_range_max
             except Exception as e:
                 self._raise_error(localdict, _("Wrong range condition defined for:"), e)
         else:  # python code
             try:
-                safe_eval(self.condition_python, localdict, mode='exec', nocopy=True)
+                self._eval_code(self.condition_python, localdict, mode='exec')
                 return localdict.get('result', False)
             except Exception as e:
                 self._raise_error(localdict, _("Wrong python condition defined for:"), e)
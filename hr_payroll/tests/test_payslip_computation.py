@@ -4,8 +4,10 @@
 from dateutil.rrule import rrule, DAILY
 from datetime import datetime, date, timedelta
 from dateutil.relativedelta import relativedelta
+from odoo.exceptions import UserError
 from odoo.fields import Date
 from odoo.tests import tagged
+from odoo.addons.hr_payroll.models.browsable_object import Payslips, PayslipsHistory
 from odoo.addons.hr_payroll.tests.common import TestPayslipContractBase
 
 
@@ -216,6 +218,55 @@ class TestPayslipComputation(TestPayslipContractBase):
         self.richard_payslip2.compute_sheet()
         self.assertEqual(3010.13, self.richard_payslip2.line_ids.filtered(lambda x: x.code == 'SUMALW').total)
 
+    def test_sum_category_history(self):
+        self.richard_payslip.compute_sheet()
+        self.richard_payslip.action_payslip_done()
+        self.env.flush_all()
+
+        expected_sum = Payslips(self.richard_emp.id, self.richard_payslip, self.env).sum_category('ALW', date(2016, 1, 1), date(2016, 1, 31))
+
+        # The sums of all the employees sharing the history are loaded with a single query
+        history = PayslipsHistory((self.richard_emp | self.jules_emp).ids, self.env)
+        richard_payslips = Payslips(self.richard_emp.id, self.richard_payslip, self.env, history)
+        jules_payslips = Payslips(self.jules_emp.id, self.env['hr.payslip'], self.env, history)
+        with self.assertQueryCount(1):
+            richard_sum = richard_payslips.sum_category('ALW', date(2016, 1, 1), date(2016, 1, 31))
+            jules_sum = jules_payslips.sum_category('ALW', date(2016, 1, 1), date(2016, 1, 31))
+        self.assertEqual(richard_sum, expected_sum)
+        self.assertEqual(jules_sum, 0.0)
+
+    def test_rule_code_restricted_builtins(self):
+        # The rules are evaluated in place in the payslip's localdict, they must still only get safe_eval's builtins
+        self.env['hr.salary.rule'].create({
+            'name': 'Forbidden Builtin',
+            'code': 'FORBIDDEN',
+            'sequence': 200,
+            'struct_id': self.developer_pay_structure.id,
+            'category_id': self.env.ref('hr_payroll.ALW').id,
+            'amount_select': 'code',
+            'amount_python_compute': "result = len(open('/etc/passwd').read())",
+        })
+        with self.assertRaises(UserError):
+            self.richard_payslip.compute_sheet()
+
+    def test_rule_condition_restricted_builtins(self):
+        # Rules evaluated outside of a payslip computation must not get the real builtins either
+        rule = self.env['hr.salary.rule'].create({
+            'name': 'Forbidden Import',
+            'code': 'FORBIDDEN',
+            'struct_id': self.developer_pay_structure.id,
+            'category_id': self.env.ref('hr_payroll.ALW').id,
+            'condition_select': 'python',
+            'condition_python': "result = __import__('os').getcwd()",
+        })
+        localdict = self.richard_payslip._get_localdict()
+        with self.assertRaises(UserError):
+            rule._satisfy_condition(localdict)
+        self.assertNotIn('open', localdict['__builtins__'])
+        rule.condition_python = "result = open('/etc/passwd')"
+        with self.assertRaises(UserError):
+            rule._satisfy_condition(localdict)
+
     def test_payslip_generation_with_extra_work(self):
         # /!\ this is in the weekend (Sunday) => no calendar attendance at this time
         start = datetime(2015, 11, 1, 10, 0, 0)
@@ -2,8 +2,11 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
 import datetime
+import io
+from unittest.mock import patch
 
 from odoo.addons.hr_payroll.tests.common import TestPayslipBase
+from odoo.exceptions import UserError
 from dateutil.relativedelta import relativedelta
 
 
@@ -113,3 +116,90 @@ class TestPayslipFlow(TestPayslipBase):
         payslip_employee.with_context(active_id=payslip_run.id).compute_sheet()
 
         self.assertEqual(len(payslip_run.slip_ids), 1)
+
+    def test_03_payslip_batch_computed_in_background(self):
+        self.richard_emp.contract_ids[0].state = 'open'
+        self.env['ir.config_parameter'].sudo().set_param('hr_payroll.payslip_compute_background_threshold', 1)
+
+        payslip_run = self.env['hr.payslip.run'].create({
+            'date_start': datetime.date.today() + relativedelta(years=-1, month=8, day=1),
+            'date_end': datetime.date.today() + relativedelta(years=-1, month=8, day=31),
+            'name': 'Batch computed in background',
+        })
+        payslip_employee = self.env['hr.payslip.employees'].create({
+            'employee_ids': [(4, self.richard_emp.id)],
+        })
+        payslip_employee.with_context(active_id=payslip_run.id).compute_sheet()
+
+        payslip = payslip_run.slip_ids
+        self.assertTrue(payslip.queued_for_compute)
+        self.assertFalse(payslip.line_ids)
+        self.assertEqual(payslip_run.payslip_queued_count, 1)
+        self.assertEqual(payslip_run.compute_progress, 0)
+        with self.assertRaises(UserError, msg='A batch cannot be validated while its payslips are being computed'):
+            payslip_run.action_validate()
+
+        # A failing payslip is flagged instead of rolling back the whole chunk
+        with patch.object(type(payslip), '_get_payslip_lines', side_effect=UserError('Missing parameter')):
+            self.env['hr.payslip']._cron_compute_sheet()
+        self.assertFalse(payslip.queued_for_compute)
+        self.assertEqual(payslip.compute_error, 'Missing parameter')
+        self.assertEqual(payslip_run.payslip_error_count, 1)
+        self.assertEqual(payslip_run.compute_progress, 100)
+
+        # Computing the payslip by hand clears its error and removes it from the queue
+        payslip.compute_sheet()
+        self.assertFalse(payslip.compute_error)
+        self.assertEqual(payslip_run.payslip_error_count, 0)
+        payslip._queue_compute_sheet()
+        payslip.compute_sheet()
+        self.assertFalse(payslip.queued_for_compute)
+        self.assertEqual(payslip_run.payslip_queued_count, 0)
+
+        payslip._queue_compute_sheet()
+        self.env['hr.payslip']._cron_compute_sheet()
+        self.assertFalse(payslip.compute_error)
+        self.assertEqual(payslip.state, 'verify')
+        self.assertTrue(payslip.line_ids)
+        self.assertEqual(payslip_run.payslip_error_count, 0)
+
+    def test_04_render_payslip_pdfs(self):
+        """ The payslips are rendered in one document split back per payslip, the ones that can't be split are rendered
+        separately """
+        payslips = self.env['hr.payslip'].create([{
+            'name': 'Payslip of %s' % employee.name,
+            'employee_id': employee.id,
+        } for employee in self.richard_emp + self.jules_emp])
+        richard_payslip, jules_payslip = payslips
+        report = self.env.ref('hr_payroll.action_report_payslip')
+
+        IrActionsReport = self.registry['ir.actions.report']
+        with patch.object(IrActionsReport, '_render_qweb_pdf_prepare_streams', return_value={
+                # Jules' payslip couldn't be found in the rendered document
+                richard_payslip.id: {'stream': io.BytesIO(b'richard pdf')},
+                False: {'stream': io.BytesIO(b'whole pdf')},
+            }) as prepare_streams, \
+                patch.object(IrActionsReport, '_render_qweb_pdf', return_value=(b'jules pdf', 'pdf')) as render_pdf:
+            pdf_content_by_id = payslips.with_context(force_report_rendering=True)._render_pdfs(report)
+
+        prepare_streams.assert_called_once_with(report, None, res_ids=payslips.ids)
+        render_pdf.assert_called_once_with(report, jules_payslip.id)
+        self.assertEqual(pdf_content_by_id, {
+            richard_payslip.id: b'richard pdf',
+            jules_payslip.id: b'jules pdf',
+        })
+
+        # The outlines of the document don't match the payslips: none of them could be split
+        with patch.object(IrActionsReport, '_render_qweb_pdf_prepare_streams', return_value={
+                richard_payslip.id: {'stream': None, 'attachment': None},
+                jules_payslip.id: {'stream': None, 'attachment': None},
+                False: {'stream': io.BytesIO(b'whole pdf'), 'attachment': None},
+            }), \
+                patch.object(IrActionsReport, '_render_qweb_pdf', side_effect=lambda report, res_id: (b'pdf %d' % res_id, 'pdf')) as render_pdf:
+            pdf_content_by_id = payslips.with_context(force_report_rendering=True)._render_pdfs(report)
+
+        self.assertEqual(render_pdf.call_count, 2)
+        self.assertEqual(pdf_content_by_id, {
+            richard_payslip.id: b'pdf %d' % richard_payslip.id,
+            jules_payslip.id: b'pdf %d' % jules_payslip.id,
+        })
@@ -1,9 +1,16 @@
 # -*- coding: utf-8 -*-
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
+import logging
+import time
 from datetime import date, datetime
+from unittest.mock import patch
 
 from odoo.addons.hr_payroll.tests.common import TestPayslipBase
+from odoo.tests import tagged
 from odoo.tests.common import users, warmup
+from odoo.tools.safe_eval import safe_eval
+
+_logger = logging.getLogger(__name__)
 
 
 class TestPayrollPerformance(TestPayslipBase):
@@ -84,3 +91,58 @@ class TestPayrollPerformance(TestPayslipBase):
         with self.assertQueryCount(__system__=0, admin=0):  # already cached from warmup
             self.env['hr.rule.parameter']._get_parameter_from_code('test_parameter_cache')
         parameter.unlink()
+
+
+@tagged('payroll_rule_engine_benchmark', '-standard')
+class TestSalaryRuleEngineBenchmark(TestPayslipBase):
+    """ Compares the compiled salary rule engine with the previous one, evaluating each code with safe_eval.
+    Run with --test-tags payroll_rule_engine_benchmark.
+    """
+
+    RULES_COUNT = 250
+    COMPUTATIONS_COUNT = 20
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.benchmark_structure = cls.env['hr.payroll.structure'].create({
+            'name': 'Rule Engine Benchmark',
+            'type_id': cls.structure_type.id,
+            'rule_ids': [(0, 0, {
+                'name': 'Generated Rule %s' % i,
+                'code': 'GEN%s' % i,
+                'sequence': 200 + i,
+                'category_id': cls.env.ref('hr_payroll.ALW').id,
+                'condition_select': 'python',
+                'condition_python': 'result = contract.wage > %s' % (i * 10),
+                'amount_select': 'code',
+                'amount_python_compute': 'result = (%s if %s else contract.wage) * 0.001\nresult_qty = 2' % (
+                    'GEN%s' % (i - 1) if i else '0', 'GEN%s' % (i - 1) if i else 'False'),
+            }) for i in range(cls.RULES_COUNT)],
+        })
+        cls.benchmark_payslip = cls.env['hr.payslip'].create({
+            'name': 'Rule Engine Benchmark Payslip',
+            'employee_id': cls.richard_emp.id,
+            'struct_id': cls.benchmark_structure.id,
+        })
+
+    def _benchmark_payslip_lines(self):
+        start = time.perf_counter()
+        for dummy in range(self.COMPUTATIONS_COUNT):
+            lines = self.benchmark_payslip._get_payslip_lines()
+        return lines, time.perf_counter() - start
+
+    def test_salary_rule_engine_benchmark(self):
+        def safe_eval_code(rule, expr, localdict, mode='eval'):
+            return safe_eval(expr, localdict, mode=mode, nocopy=mode == 'exec')
+
+        with patch.object(type(self.env['hr.salary.rule']), '_eval_code', safe_eval_code):
+            safe_eval_lines, safe_eval_duration = self._benchmark_payslip_lines()
+        compiled_lines, compiled_duration = self._benchmark_payslip_lines()
+
+        _logger.info(
+            "Salary rule engine benchmark (%s rules, %s computations): safe_eval %.3fs, compiled %.3fs (x%.1f)",
+            len(self.benchmark_structure.rule_ids), self.COMPUTATIONS_COUNT,
+            safe_eval_duration, compiled_duration, safe_eval_duration / compiled_duration,
+        )
+        self.assertEqual(compiled_lines, safe_eval_lines)
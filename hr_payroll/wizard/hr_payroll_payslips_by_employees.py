@@ -65,6 +65,10 @@ class HrPayslipEmployees(models.TransientModel):
         # Could be overriden to avoid having 2 'end of the year bonus' payslips, etc.
         return contracts
 
+    @api.model
+    def _get_compute_in_background_threshold(self):
+        return int(self.env['ir.config_parameter'].sudo().get_param('hr_payroll.payslip_compute_background_threshold', 500))
+
     def compute_sheet(self):
         self.ensure_one()
         if not self.env.context.get('active_id'):
@@ -151,7 +155,12 @@ class HrPayslipEmployees(models.TransientModel):
             payslips_vals.append(values)
         payslips = Payslip.with_context(tracking_disable=True).create(payslips_vals)
         payslips._compute_name()
-        payslips.compute_sheet()
+        if len(payslips) >= self._get_compute_in_background_threshold():
+            # Big batches are computed by chunks in a cron, so that they don't block a worker
+            # for the whole duration and a failing payslip doesn't roll back the other ones.
+            payslips._queue_compute_sheet()
+        else:
+            payslips.compute_sheet()
         payslip_run.state = 'verify'
 
         return success_result
@@ -4,6 +4,7 @@
 from . import knowledge_article_favorite
 from . import knowledge_article_member
 from . import knowledge_article
+from . import knowledge_article_ancestor
 from . import knowledge_cover
 from . import res_partner
 from . import res_users
@@ -711,6 +711,7 @@ class Article(models.Model):
             else:
                 articles += next(notsudo_articles)
 
+        self.env['knowledge.article.ancestor']._update_articles(articles)
         return articles
 
     def write(self, vals):
@@ -732,8 +733,18 @@ class Article(models.Model):
             else:
                 _resequence = True
 
+        # articles (and their descendants) whose members inheritance changes
+        moved_or_desynchronized = self.env['knowledge.article']
+        if 'parent_id' in vals:
+            moved_or_desynchronized |= self.filtered(lambda article: article.parent_id.id != (vals['parent_id'] or False))
+        if 'is_desynchronized' in vals:
+            moved_or_desynchronized |= self.filtered(lambda article: article.is_desynchronized != bool(vals['is_desynchronized']))
+
         result = super(Article, self).write(vals)
 
+        if moved_or_desynchronized:
+            self.env['knowledge.article.ancestor']._update_articles(moved_or_desynchronized, with_descendants=True)
+
         # resequence only if a sequence was not already computed based on current
         # parent maximum to avoid unnecessary recomputation of sequences
         if _resequence:
@@ -1692,47 +1703,24 @@ class Article(models.Model):
 
     @api.model
     def _get_internal_permission(self, filter_domain=None):
-        """ Compute article based permissions.
+        """ Compute article based permissions, i.e. the internal permission of
+        the articles or the one they inherit from their ancestors, which is
+        materialized in the stored 'inherited_permission' field.
 
-        Note: we don't use domain because we cannot include properly the where clause
-        in the custom sql query. The query's output table and fields names does not match
-        the model we are working on.
+        The filter_domain applies on those permissions, using 'internal_permission'
+        as field name (e.g. [('internal_permission', '=', 'write')]).
         """
-        self.flush_model()
-
-        args = []
-        base_where_domain = ''
-        if self.ids:
-            base_where_domain = "WHERE id in %s"
-            args.append(tuple(self.ids))
+        self.flush_model(['inherited_permission'])
 
-        where_clause = ''
+        domain = [('id', 'in', self.ids)] if self.ids else []
         if filter_domain:
-            query = self.with_context(active_test=False)._where_calc(filter_domain)
-            table_name, where_clause, where_params = query.get_sql()
-            where_clause = f'WHERE {where_clause.replace(table_name, "article_perms")}'
-            args += where_params
-
-        sql = f'''
-    WITH RECURSIVE article_perms as (
-        SELECT id, id as article_id, parent_id, internal_permission, is_desynchronized
-          FROM knowledge_article
-          {base_where_domain}
-         UNION
-        SELECT parents.id, perms.article_id, parents.parent_id,
-               COALESCE(perms.internal_permission, parents.internal_permission),
-               perms.is_desynchronized
-          FROM knowledge_article parents
-    INNER JOIN article_perms perms
-            ON perms.parent_id=parents.id
-               AND perms.is_desynchronized IS NOT TRUE
-               AND perms.internal_permission IS NULL
-    )
-    SELECT article_id, max(internal_permission)
-      FROM article_perms
-           {where_clause}
-  GROUP BY article_id'''
-        self._cr.execute(sql, args)
+            domain = expression.AND([domain, [
+                ('inherited_permission', leaf[1], leaf[2])
+                if expression.is_leaf(leaf) and leaf[0] == 'internal_permission' else leaf
+                for leaf in filter_domain
+            ]])
+        query = self.with_context(active_test=False)._where_calc(domain)
+        self._cr.execute(*query.select('"knowledge_article"."id"', '"knowledge_article"."inherited_permission"'))
         return dict(self._cr.fetchall())
 
     @api.model
@@ -1740,6 +1728,10 @@ class Article(models.Model):
         """ Retrieve the permission for the given partner for all articles.
         The articles can be filtered using the article_ids param.
 
+        The permission of an article is the one of the closest membership of
+        the partner among the article and the ancestors it inherits from, as
+        listed in the knowledge.article.ancestor table.
+
         The member model is fully flushed before running the request. """
         self.env['knowledge.article'].flush_model()
         self.env['knowledge.article.member'].flush_model()
@@ -1747,34 +1739,17 @@ class Article(models.Model):
         args = [partner.id]
         base_where_domain = ''
         if self.ids:
-            base_where_domain = "WHERE perms1.id in %s"
+            base_where_domain = "AND ancestor.article_id in %s"
             args.append(tuple(self.ids))
 
         sql = f'''
-    WITH RECURSIVE article_perms as (
-        SELECT a.id, a.parent_id, m.permission, a.is_desynchronized
-          FROM knowledge_article a
-     LEFT JOIN knowledge_article_member m
-            ON a.id=m.article_id and partner_id = %s
-    ), article_rec as (
-        SELECT perms1.id, perms1.id as article_id, perms1.parent_id,
-               perms1.permission, perms1.is_desynchronized
-          FROM article_perms as perms1
-          {base_where_domain}
-         UNION
-        SELECT perms2.id, perms_rec.article_id, perms2.parent_id,
-               COALESCE(perms_rec.permission, perms2.permission),
-               perms2.is_desynchronized
-          FROM article_perms as perms2
-    INNER JOIN article_rec perms_rec
-            ON perms_rec.parent_id=perms2.id
-               AND perms_rec.is_desynchronized IS NOT TRUE
-               AND perms_rec.permission IS NULL
-    )
-    SELECT article_id, max(permission)
-      FROM article_rec
-     WHERE permission IS NOT NULL
-  GROUP BY article_id'''
+    SELECT DISTINCT ON (ancestor.article_id) ancestor.article_id, member.permission
+      FROM knowledge_article_member member
+      JOIN knowledge_article_ancestor ancestor
+        ON ancestor.ancestor_id = member.article_id
+     WHERE member.partner_id = %s
+           {base_where_domain}
+  ORDER BY ancestor.article_id, ancestor.depth'''
         self._cr.execute(sql, args)
         return dict(self._cr.fetchall())
 
@@ -244,6 +244,38 @@ class TestKnowledgeArticleUtilities(KnowledgeCommonWData):
         self.assertSetEqual((article_8 | article_4)._get_ancestor_ids(), {article_2.id, article_4.id})
         self.assertSetEqual((article_8 | article_11)._get_ancestor_ids(), {article_2.id, article_4.id, article_6.id})
 
+    @users('admin')
+    def test_article_member_permissions_inheritance(self):
+        """ Check that the member permissions inherited from the ancestors follow
+        the moves and (de)synchronizations of the articles and of their parents. """
+        shared_child = self.shared_children[0].with_env(self.env)
+        grandchild = self.env['knowledge.article'].create({'name': 'Grand Child', 'parent_id': shared_child.id})
+        great_grandchild = self.env['knowledge.article'].create({'name': 'Great Grand Child', 'parent_id': grandchild.id})
+        articles = grandchild | great_grandchild
+        self.assertDictEqual(
+            articles._get_partner_member_permissions(self.partner_employee),
+            {grandchild.id: 'write', great_grandchild.id: 'write'},
+            'Closest membership is the one on the parent')
+
+        grandchild.write({'parent_id': self.article_shared.id})
+        self.assertDictEqual(
+            articles._get_partner_member_permissions(self.partner_employee),
+            {grandchild.id: 'read', great_grandchild.id: 'read'},
+            'Descendants of a moved article should inherit from its new ancestors')
+        self.assertDictEqual(
+            articles._get_internal_permission(),
+            {grandchild.id: 'none', great_grandchild.id: 'none'})
+
+        grandchild.write({'internal_permission': 'read', 'is_desynchronized': True})
+        self.assertDictEqual(
+            articles._get_partner_member_permissions(self.partner_employee), {},
+            'Desynchronized articles should not inherit members from their ancestors')
+        self.assertDictEqual(
+            articles._get_internal_permission(),
+            {grandchild.id: 'read', great_grandchild.id: 'read'})
+        self.assertDictEqual(
+            articles._get_internal_permission(filter_domain=[('internal_permission', '=', 'write')]), {})
+
 
 @tagged('knowledge_internals', 'knowledge_management')
 class TestKnowledgeCommonWDataInitialValue(KnowledgeCommonWData):
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
+from bisect import bisect_left, bisect_right
 from collections import defaultdict, namedtuple
 from dateutil.relativedelta import relativedelta
 from math import log10
@@ -325,8 +326,9 @@ class MrpProductionSchedule(models.Model):
         # We need to get the schedule that impact the schedules in self. Since
         # the state is not saved, it needs to recompute the quantity to
         # replenish of finished products. It will modify the indirect
-        # demand and replenish_qty of schedules in self.
-        schedules_to_compute = self.env['mrp.production.schedule'].browse(self.get_impacted_schedule()) | self
+        # demand and replenish_qty of schedules in self. The schedules of
+        # the components are not needed as they don't impact self.
+        schedules_to_compute = self._get_supplying_schedules() | self
 
         # Dependencies between schedules
         indirect_demand_trees = schedules_to_compute._get_indirect_demand_tree()
@@ -337,10 +339,16 @@ class MrpProductionSchedule(models.Model):
         # order to compute the schedule state only once.
         indirect_demand_order = schedules_to_compute._get_indirect_demand_order(indirect_demand_trees)
         indirect_demand_qty = defaultdict(float)
-        incoming_qty, incoming_qty_done = self._get_incoming_qty(date_range)
-        outgoing_qty, outgoing_qty_done = self._get_outgoing_qty(date_range)
-        dummy, outgoing_qty_year_minus_1 = self._get_outgoing_qty(date_range_year_minus_1)
-        dummy, outgoing_qty_year_minus_2 = self._get_outgoing_qty(date_range_year_minus_2)
+        # The lead days, forecasts and quantities available are fetched once
+        # for all the schedules instead of once per schedule and period.
+        lead_days_by_schedule = schedules_to_compute._get_lead_days_by_schedule()
+        forecasts_by_period = schedules_to_compute._get_forecasts_by_period(date_range)
+        qty_available = schedules_to_compute._get_qty_available()
+        date_stops = [date_stop for dummy, date_stop in date_range]
+        incoming_qty, incoming_qty_done = self._get_incoming_qty(date_range, lead_days_by_schedule=lead_days_by_schedule)
+        outgoing_qty, outgoing_qty_done = self._get_outgoing_qty(date_range, lead_days_by_schedule=lead_days_by_schedule)
+        dummy, outgoing_qty_year_minus_1 = self._get_outgoing_qty(date_range_year_minus_1, lead_days_by_schedule=lead_days_by_schedule)
+        dummy, outgoing_qty_year_minus_2 = self._get_outgoing_qty(date_range_year_minus_2, lead_days_by_schedule=lead_days_by_schedule)
         read_fields = [
             'forecast_target_qty',
             'min_to_replenish_qty',
@@ -357,7 +365,7 @@ class MrpProductionSchedule(models.Model):
             # Bypass if the schedule is only used in order to compute indirect
             # demand.
             rounding = production_schedule.product_id.uom_id.rounding
-            lead_time = production_schedule._get_lead_times()
+            lead_time = lead_days_by_schedule[production_schedule.id][0]
             # Ignore "Days to Supply Components" when set demand for components since it's normally taken care by the
             # components themselves
             lead_time_ignore_components = lead_time - production_schedule.product_id.product_tmpl_id.days_to_prepare_mo
@@ -368,7 +376,7 @@ class MrpProductionSchedule(models.Model):
                 production_schedule_state['precision_digits'] = precision_digits
                 production_schedule_state['forecast_ids'] = []
 
-            starting_inventory_qty = production_schedule.product_id.with_context(warehouse=production_schedule.warehouse_id.id).qty_available
+            starting_inventory_qty = qty_available[production_schedule.product_id.id, production_schedule.warehouse_id.id]
             if len(date_range):
                 starting_inventory_qty -= incoming_qty_done.get((date_range[0], production_schedule.product_id, production_schedule.warehouse_id), 0.0)
                 starting_inventory_qty += outgoing_qty_done.get((date_range[0], production_schedule.product_id, production_schedule.warehouse_id), 0.0)
@@ -378,7 +386,7 @@ class MrpProductionSchedule(models.Model):
                 key = ((date_start, date_stop), production_schedule.product_id, production_schedule.warehouse_id)
                 key_y_1 = (date_range_year_minus_1[index], *key[1:])
                 key_y_2 = (date_range_year_minus_2[index], *key[1:])
-                existing_forecasts = production_schedule.forecast_ids.filtered(lambda p: p.date >= date_start and p.date <= date_stop)
+                existing_forecasts = forecasts_by_period[production_schedule.id, index]
                 if production_schedule in self:
                     forecast_values['date_start'] = date_start
                     forecast_values['date_stop'] = date_stop
@@ -416,14 +424,15 @@ class MrpProductionSchedule(models.Model):
                 # Set the indirect demand qty for children schedules.
                 for (product, ratio) in indirect_ratio_mps[(production_schedule.warehouse_id, production_schedule.product_id)].items():
                     related_date = max(subtract(date_start, days=lead_time_ignore_components), fields.Date.today())
-                    index = next(i for i, (dstart, dstop) in enumerate(date_range) if related_date <= dstart or (related_date >= dstart and related_date <= dstop))
-                    related_key = (date_range[index], product, production_schedule.warehouse_id)
+                    # First period ending after the related date
+                    related_index = bisect_left(date_stops, related_date)
+                    related_key = (date_range[related_index], product, production_schedule.warehouse_id)
                     indirect_demand_qty[related_key] += ratio * forecast_values['replenish_qty']
 
             if production_schedule in self:
                 # The state is computed after all because it needs the final
                 # quantity to replenish.
-                forecasts_state = production_schedule._get_forecasts_state(production_schedule_states_by_id, date_range, procurement_date)
+                forecasts_state = production_schedule._get_forecasts_state(production_schedule_states_by_id, date_range, procurement_date, forecasts_by_period=forecasts_by_period)
                 forecasts_state = forecasts_state[production_schedule.id]
                 for index, forecast_state in enumerate(forecasts_state):
                     production_schedule_state['forecast_ids'][index].update(forecast_state)
@@ -448,23 +457,7 @@ class MrpProductionSchedule(models.Model):
         if not domain:
             domain = []
 
-        def _used_in_bom(products, related_products):
-            """ Bottom up from bom line to finished products in order to get
-            all the finished products that use 'products' as component.
-            """
-            if not products:
-                return related_products
-            boms = products.bom_line_ids.mapped('bom_id')
-            products = boms.mapped('product_id') | boms.mapped('product_tmpl_id.product_variant_ids')
-            products -= related_products
-            related_products |= products
-            return _used_in_bom(products, related_products)
-
-        supplying_mps = self.env['mrp.production.schedule'].search(
-            AND([domain, [
-                ('warehouse_id', 'in', self.mapped('warehouse_id').ids),
-                ('product_id', 'in', _used_in_bom(self.mapped('product_id'), self.env['product.product']).ids)
-            ]]))
+        supplying_mps = self._get_supplying_schedules(domain)
 
         def _use_boms(products, related_products):
             """ Explore bom line from products's BoMs in order to get components
@@ -485,6 +478,32 @@ class MrpProductionSchedule(models.Model):
             ]]))
         return (supplying_mps | supplied_mps).ids
 
+    def _get_supplying_schedules(self, domain=False):
+        """ Return the schedules of the finished products that use the products
+        in self as component (no matter at which BoM level). They are the only
+        ones impacting the indirect demand of self.
+
+        :param domain: filter the supplying schedules with the domain
+        :rtype: mrp.production.schedule
+        """
+        def _used_in_bom(products, related_products):
+            """ Bottom up from bom line to finished products in order to get
+            all the finished products that use 'products' as component.
+            """
+            if not products:
+                return related_products
+            boms = products.bom_line_ids.mapped('bom_id')
+            products = boms.mapped('product_id') | boms.mapped('product_tmpl_id.product_variant_ids')
+            products -= related_products
+            related_products |= products
+            return _used_in_bom(products, related_products)
+
+        return self.env['mrp.production.schedule'].search(
+            AND([domain or [], [
+                ('warehouse_id', 'in', self.mapped('warehouse_id').ids),
+                ('product_id', 'in', _used_in_bom(self.mapped('product_id'), self.env['product.product']).ids)
+            ]]))
+
     def remove_replenish_qty(self, date_index):
         """ Remove the quantity to replenish on the forecast cell.
 
@@ -573,7 +592,7 @@ class MrpProductionSchedule(models.Model):
             'warehouse_id': self.warehouse_id,
         }
 
-    def _get_forecasts_state(self, production_schedule_states, date_range, procurement_date):
+    def _get_forecasts_state(self, production_schedule_states, date_range, procurement_date, forecasts_by_period=None):
         """ Return the state for each forecast cells.
         - to_relaunch: A procurement has been launched for the same date range
         but a replenish modification require a new procurement.
@@ -593,10 +612,14 @@ class MrpProductionSchedule(models.Model):
         param production_schedule_states: schedules with a state to compute
         param date_range: list of period where a state should be computed
         param procurement_date: today + lead times for products in self
+        param forecasts_by_period: forecasts of the schedules in self per
+        period, as returned by _get_forecasts_by_period
         return: the state for each time slot in date_range for each schedule in
         production_schedule_states
         rtype: dict
         """
+        if forecasts_by_period is None:
+            forecasts_by_period = self._get_forecasts_by_period(date_range)
         forecasts_state = defaultdict(list)
         for production_schedule in self:
             forecast_values = production_schedule_states[production_schedule.id]['forecast_ids']
@@ -604,7 +627,7 @@ class MrpProductionSchedule(models.Model):
             for index, (date_start, date_stop) in enumerate(date_range):
                 forecast_state = {}
                 forecast_value = forecast_values[index]
-                existing_forecasts = production_schedule.forecast_ids.filtered(lambda p: p.date >= date_start and p.date <= date_stop)
+                existing_forecasts = forecasts_by_period[production_schedule.id, index]
                 procurement_launched = any(existing_forecasts.mapped('procurement_launched'))
 
                 replenish_qty = forecast_value['replenish_qty']
@@ -640,6 +663,64 @@ class MrpProductionSchedule(models.Model):
         rules = self.product_id._get_rules_from_location(self.warehouse_id.lot_stock_id)
         return rules._get_lead_days(self.product_id)[0]
 
+    def _get_lead_days_by_schedule(self):
+        """ Get the lead days of the schedules in self, looking for the rules of
+        each schedule only once.
+
+        return: a dict with as key a production schedule id and as value a
+        tuple with the lead days of all the rules (see _get_lead_times) and the
+        lead days of the rules that neither buy nor manufacture (used to find
+        the moves impacting the schedule).
+        rtype: dict
+        """
+        lead_days_by_schedule = {}
+        for schedule in self:
+            rules = schedule.product_id._get_rules_from_location(schedule.warehouse_id.lot_stock_id)
+            lead_days, dummy = rules._get_lead_days(schedule.product_id)
+            moves_lead_days, dummy = rules.filtered(lambda r: r.action not in ['buy', 'manufacture'])._get_lead_days(schedule.product_id)
+            lead_days_by_schedule[schedule.id] = (lead_days, moves_lead_days)
+        return lead_days_by_schedule
+
+    def _get_forecasts_by_period(self, date_range):
+        """ Get the forecasts of the schedules in self for each period of
+        date_range, with a single search.
+
+        return: a dict with as key a tuple (production schedule id, index of the
+        period in date_range) and as value the forecasts.
+        rtype: dict
+        """
+        forecasts_by_period = defaultdict(lambda: self.env['mrp.product.forecast'])
+        if not date_range:
+            return forecasts_by_period
+        forecasts = self.env['mrp.product.forecast'].search([
+            ('production_schedule_id', 'in', self.ids),
+            ('date', '>=', date_range[0][0]),
+            ('date', '<=', date_range[-1][1]),
+        ])
+        date_starts = [date_start for date_start, dummy in date_range]
+        for forecast in forecasts:
+            index = bisect_right(date_starts, forecast.date) - 1
+            if forecast.date <= date_range[index][1]:
+                forecasts_by_period[forecast.production_schedule_id.id, index] |= forecast
+        return forecasts_by_period
+
+    def _get_qty_available(self):
+        """ Get the quantity available of the products of the schedules in self
+        in their warehouse, computed once per warehouse.
+
+        return: a dict with as key a tuple (product id, warehouse id) and as
+        value the quantity available.
+        rtype: dict
+        """
+        schedules_by_warehouse = defaultdict(lambda: self.env['mrp.production.schedule'])
+        for schedule in self:
+            schedules_by_warehouse[schedule.warehouse_id] |= schedule
+        qty_available = {}
+        for warehouse, schedules in schedules_by_warehouse.items():
+            for product in schedules.product_id.with_context(warehouse=warehouse.id):
+                qty_available[product.id, warehouse.id] = product.qty_available
+        return qty_available
+
     def _get_replenish_qty(self, after_forecast_qty):
         """ Modify the quantity to replenish depending the min/max and targeted
         quantity for safety stock.
@@ -662,10 +743,12 @@ class MrpProductionSchedule(models.Model):
 
         return replenish_qty
 
-    def _get_incoming_qty(self, date_range):
+    def _get_incoming_qty(self, date_range, lead_days_by_schedule=None):
         """ Get the incoming quantity from RFQ and existing moves.
 
         param: list of time slots used in order to group incoming quantity.
+        param lead_days_by_schedule: lead days of the schedules in self, as
+        returned by _get_lead_days_by_schedule.
         return: a dict with as key a production schedule and as values a list
         of incoming quantity for each date range.
         """
@@ -674,7 +757,7 @@ class MrpProductionSchedule(models.Model):
         after_date = date_range[0][0]
         before_date = date_range[-1][1]
         # Get quantity in RFQ
-        rfq_domain = self._get_rfq_domain(after_date, before_date)
+        rfq_domain = self._get_rfq_domain(after_date, before_date, lead_days_by_schedule=lead_days_by_schedule)
         rfq_lines_date_planned = self._get_rfq_and_planned_date(rfq_domain, order='date_planned')
         rfq_lines_date_planned = sorted(rfq_lines_date_planned, key=lambda i: i[1])
         index = 0
@@ -696,7 +779,7 @@ class MrpProductionSchedule(models.Model):
         # Get quantity on incoming moves
         # TODO: issue since it will use one search by move. Should use a
         # read_group with a group by location.
-        domain_moves = self._get_moves_domain(after_date, before_date, 'incoming')
+        domain_moves = self._get_moves_domain(after_date, before_date, 'incoming', lead_days_by_schedule=lead_days_by_schedule)
         stock_moves_and_date = self._get_moves_and_date(domain_moves)
         stock_moves_and_date = sorted(stock_moves_and_date, key=lambda m: m[1])
         index = 0
@@ -824,7 +907,7 @@ class MrpProductionSchedule(models.Model):
 
         return [tree for tree in indirect_demand_trees.values()]
 
-    def _get_moves_domain(self, date_start, date_stop, type):
+    def _get_moves_domain(self, date_start, date_stop, type, lead_days_by_schedule=None):
         """ Return domain for incoming or outgoing moves """
         if not self:
             return [('id', '=', False)]
@@ -843,10 +926,11 @@ class MrpProductionSchedule(models.Model):
             ('is_inventory', '=', False),
             ('date', '<=', date_stop),
         ]
+        if lead_days_by_schedule is None:
+            lead_days_by_schedule = self._get_lead_days_by_schedule()
         groupby_delay = defaultdict(list)
         for schedule in self:
-            rules = schedule.product_id._get_rules_from_location(schedule.warehouse_id.lot_stock_id)
-            delay, dummy = rules.filtered(lambda r: r.action not in ['buy', 'manufacture'])._get_lead_days(schedule.product_id)
+            dummy, delay = lead_days_by_schedule[schedule.id]
             groupby_delay[delay].append((schedule.product_id, schedule.warehouse_id))
         for delay in groupby_delay:
             products, warehouses = zip(*groupby_delay[delay])
@@ -883,8 +967,10 @@ class MrpProductionSchedule(models.Model):
             res_moves.append((move, date))
         return res_moves
 
-    def _get_outgoing_qty(self, date_range):
+    def _get_outgoing_qty(self, date_range, lead_days_by_schedule=None):
         """ Get the outgoing quantity from existing moves.
+        param lead_days_by_schedule: lead days of the schedules in self, as
+        returned by _get_lead_days_by_schedule.
         return a dict with as key a production schedule and as values a list
         of outgoing quantity for each date range.
         """
@@ -894,7 +980,7 @@ class MrpProductionSchedule(models.Model):
         before_date = date_range[-1][1]
         # Get quantity on incoming moves
 
-        domain_moves = self._get_moves_domain(after_date, before_date, 'outgoing')
+        domain_moves = self._get_moves_domain(after_date, before_date, 'outgoing', lead_days_by_schedule=lead_days_by_schedule)
         domain_moves = AND([domain_moves, [('raw_material_production_id', '=', False)]])
         stock_moves_by_date = self._get_moves_and_date(domain_moves)
         stock_moves_by_date = sorted(stock_moves_by_date, key=lambda m: m[1])
@@ -917,12 +1003,14 @@ class MrpProductionSchedule(models.Model):
 
         return outgoing_qty, outgoing_qty_done
 
-    def _get_rfq_domain(self, date_start, date_stop):
+    def _get_rfq_domain(self, date_start, date_stop, lead_days_by_schedule=None):
         """ Return a domain used to compute the incoming quantity for a given
         product/warehouse/company.
 
         :param date_start: start date of the forecast domain
         :param date_stop: end date of the forecast domain
+        :param lead_days_by_schedule: lead days of the schedules in self, as
+            returned by _get_lead_days_by_schedule
         """
         if not self:
             return [('id', '=', False)]
@@ -931,10 +1019,11 @@ class MrpProductionSchedule(models.Model):
             ('state', 'in', ('draft', 'sent', 'to approve')),
             ('date_planned', '<=', date_stop)
         ]
+        if lead_days_by_schedule is None:
+            lead_days_by_schedule = self._get_lead_days_by_schedule()
         groupby_delay = defaultdict(list)
         for schedule in self:
-            rules = schedule.product_id._get_rules_from_location(schedule.warehouse_id.lot_stock_id)
-            delay, dummy = rules._get_lead_days(schedule.product_id)
+            delay, dummy = lead_days_by_schedule[schedule.id]
             groupby_delay[delay].append((schedule.product_id, schedule.warehouse_id))
 
         for delay in groupby_delay:
@@ -522,6 +522,30 @@ class TestMpsMps(common.TransactionCase):
         self.assertEqual(sorted(impacted_schedules), sorted((self.mps_table |
             self.mps_wardrobe | self.mps_table_leg | self.mps_screw).ids))
 
+    def test_supplying_schedule(self):
+        """ Only the schedules of the finished products impact the state of a
+        schedule, computing it alone or along the other schedules gives the
+        same state.
+        """
+        self.assertEqual(self.mps_drawer._get_supplying_schedules(), self.mps_table | self.mps_wardrobe)
+        self.assertFalse(self.mps_table._get_supplying_schedules())
+
+        mps_dates = self.env.company._get_date_range()
+        self.env['mrp.product.forecast'].create([{
+            'production_schedule_id': self.mps_table.id,
+            'date': mps_dates[0][0],
+            'forecast_qty': 2,
+        }, {
+            'production_schedule_id': self.mps_wardrobe.id,
+            'date': mps_dates[1][1],
+            'forecast_qty': 3,
+        }])
+        mps_drawer = self.mps_drawer.get_production_schedule_view_state()[0]
+        all_mps_drawer = next(state for state in self.mps.get_production_schedule_view_state() if state['id'] == self.mps_drawer.id)
+        self.assertEqual(mps_drawer, all_mps_drawer)
+        self.assertEqual(mps_drawer['forecast_ids'][0]['indirect_demand_qty'], 2)
+        self.assertEqual(mps_drawer['forecast_ids'][1]['indirect_demand_qty'], 9)
+
     def test_3_steps(self):
         self.warehouse.manufacture_steps = 'pbm_sam'
         self.table_leg.write({
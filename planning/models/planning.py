@@ -15,6 +15,7 @@ from odoo.addons.resource.models.resource_mixin import timezone_datetime
 from odoo.exceptions import UserError, AccessError
 from odoo.osv import expression
 from odoo.tools import DEFAULT_SERVER_DATETIME_FORMAT, float_utils, format_datetime
+from odoo.tools.sql import create_index
 
 _logger = logging.getLogger(__name__)
 
@@ -309,22 +310,56 @@ class Planning(models.Model):
                     day_total[slot.resource_id.id]
                 )['days']
 
+    def init(self):
+        super().init()
+        # Used by _get_conflicting_slots_query to only scan the slots of a resource starting in a bounded range
+        create_index(self.env.cr, 'planning_slot_resource_start_end_index', self._table, ['resource_id', 'start_datetime', 'end_datetime'])
+
+    @api.model
+    def _get_conflicting_slots_query(self, where_clause='TRUE', where_params=None):
+        """ Returns the query listing the pairs of overlapping slots of a same resource whose allocated percentages sum over 100.
+
+        Instead of comparing each slot to all the slots of its resource, a slot S1 is only compared to the slots starting in
+        [S1.start - D, S1.end[, D being the longest duration of the slots of the resource: no slot starting before that can end
+        after S1 starts. This range is scanned using planning_slot_resource_start_end_index, so that the cost only depends on
+        the number of slots around each one, and not on the whole history of the resource.
+
+        :param where_clause: An SQL condition on the slots S1 to get the conflicts of.
+        :param where_params: The parameters of where_clause.
+        :return: A tuple (query, params), the query selecting the columns slot_id and conflict_id.
+        """
+        where_params = list(where_params or [])
+        query = f"""
+            WITH max_durations AS (
+                SELECT S.resource_id, MAX(S.end_datetime - S.start_datetime) AS max_duration
+                  FROM planning_slot S
+                 WHERE S.resource_id IN (SELECT S1.resource_id FROM planning_slot S1 WHERE {where_clause})
+              GROUP BY S.resource_id
+            )
+            SELECT S1.id AS slot_id, S2.id AS conflict_id
+              FROM planning_slot S1
+              JOIN max_durations D ON D.resource_id = S1.resource_id
+              JOIN planning_slot S2
+                ON S2.resource_id = S1.resource_id
+               AND S2.start_datetime >= S1.start_datetime - D.max_duration
+               AND S2.start_datetime < S1.end_datetime
+               AND S2.end_datetime > S1.start_datetime
+               AND S2.id <> S1.id
+               AND S1.allocated_percentage + S2.allocated_percentage > 100
+             WHERE {where_clause}
+        """
+        return query, where_params + where_params
+
     @api.depends('start_datetime', 'end_datetime', 'resource_id')
     def _compute_overlap_slot_count(self):
         if self.ids:
-            self.flush_model(['start_datetime', 'end_datetime', 'resource_id'])
-            query = """
-                SELECT S1.id,ARRAY_AGG(DISTINCT S2.id) as conflict_ids FROM
-                    planning_slot S1, planning_slot S2
-                WHERE
-                    S1.start_datetime < S2.end_datetime
-                    AND S1.end_datetime > S2.start_datetime
-                    AND S1.id <> S2.id AND S1.resource_id = S2.resource_id
-                    AND S1.allocated_percentage + S2.allocated_percentage > 100
-                    and S1.id in %s
-                GROUP BY S1.id;
-            """
-            self.env.cr.execute(query, (tuple(self.ids),))
+            self.flush_model(['start_datetime', 'end_datetime', 'resource_id', 'allocated_percentage'])
+            conflicts_query, conflicts_params = self._get_conflicting_slots_query('S1.id IN %s', [tuple(self.ids)])
+            self.env.cr.execute(f"""
+                SELECT conflicts.slot_id, ARRAY_AGG(DISTINCT conflicts.conflict_id) AS conflict_ids
+                  FROM ({conflicts_query}) conflicts
+              GROUP BY conflicts.slot_id
+            """, conflicts_params)
             overlap_mapping = dict(self.env.cr.fetchall())
             for slot in self:
                 slot_result = overlap_mapping.get(slot.id, [])
@@ -358,21 +393,11 @@ class Planning(models.Model):
         if operator not in ['=', '>'] or not isinstance(value, int) or value != 0:
             raise NotImplementedError(_('Operation not supported, you should always compare overlap_slot_count to 0 value with = or > operator.'))
 
-        query = """
-            SELECT S1.id
-            FROM planning_slot S1
-            WHERE EXISTS (
-                SELECT 1
-                  FROM planning_slot S2
-                 WHERE S1.id <> S2.id
-                   AND S1.resource_id = S2.resource_id
-                   AND S1.start_datetime < S2.end_datetime
-                   AND S1.end_datetime > S2.start_datetime
-                   AND S1.allocated_percentage + S2.allocated_percentage > 100
-            )
-        """
+        self.flush_model(['start_datetime', 'end_datetime', 'resource_id', 'allocated_percentage'])
+        conflicts_query, conflicts_params = self._get_conflicting_slots_query()
+        query = f"SELECT conflicts.slot_id FROM ({conflicts_query}) conflicts"
         operator_new = (operator == ">") and "inselect" or "not inselect"
-        return [('id', operator_new, (query, ()))]
+        return [('id', operator_new, (query, conflicts_params))]
 
     @api.depends('start_datetime', 'end_datetime')
     def _compute_slot_duration(self):
@@ -905,62 +930,15 @@ class Planning(models.Model):
     def gantt_unavailability(self, start_date, end_date, scale, group_bys=None, rows=None):
         start_datetime = fields.Datetime.from_string(start_date)
         end_datetime = fields.Datetime.from_string(end_date)
-        resource_ids = set()
-
-        # function to "mark" top level rows concerning resources
-        # the propagation of that item to subrows is taken care of in the traverse function below
-        def tag_resource_rows(rows):
-            for row in rows:
-                group_bys = row.get('groupedBy')
-                res_id = row.get('resId')
-                if group_bys:
-                    # if resource_id is the first grouping attribute, we mark the row
-                    if group_bys[0] == 'resource_id' and res_id:
-                        resource_id = res_id
-                        resource_ids.add(resource_id)
-                        row['resource_id'] = resource_id
-                    # else we recursively traverse the rows where resource_id appears in the group_by
-                    elif 'resource_id' in group_bys:
-                        tag_resource_rows(row.get('rows'))
-
-        tag_resource_rows(rows)
-        resources = self.env['resource.resource'] \
-            .browse(resource_ids) \
-            .filtered(lambda r: not r.flexible_hours)
-        leaves_mapping = resources._get_unavailable_intervals(start_datetime, end_datetime)
+
+        resources = self.env['resource.resource'].browse(self._gantt_unavailability_get_rows_res_ids(rows, 'resource_id')).exists()
+        flexible_resources = resources.filtered('flexible_hours')
+        # the unavailabilities of the resources sharing a calendar are computed together
+        leaves_mapping = (resources - flexible_resources)._get_unavailable_intervals(start_datetime, end_datetime)
+        leaves_mapping.update(dict.fromkeys(flexible_resources.ids))
         company_leaves = self.env.company.resource_calendar_id._unavailable_intervals(start_datetime.replace(tzinfo=pytz.utc), end_datetime.replace(tzinfo=pytz.utc))
 
-        # function to recursively replace subrows with the ones returned by func
-        def traverse(func, row):
-            new_row = dict(row)
-            if new_row.get('resource_id'):
-                for sub_row in new_row.get('rows'):
-                    sub_row['resource_id'] = new_row['resource_id']
-            new_row['rows'] = [traverse(func, row) for row in new_row.get('rows')]
-            return func(new_row)
-
-        cell_dt = timedelta(hours=1) if scale in ['day', 'week'] else timedelta(hours=12)
-
-        # for a single row, inject unavailability data
-        def inject_unavailability(row):
-            new_row = dict(row)
-
-            calendar = company_leaves
-            if row.get('resource_id'):
-                resource_id = self.env['resource.resource'].browse(row.get('resource_id'))
-                if resource_id:
-                    if resource_id.flexible_hours:
-                        return new_row
-                    calendar = leaves_mapping[resource_id.id]
-
-            # remove intervals smaller than a cell, as they will cause half a cell to turn grey
-            # ie: when looking at a week, a employee start everyday at 8, so there is a unavailability
-            # like: 2019-05-22 20:00 -> 2019-05-23 08:00 which will make the first half of the 23's cell grey
-            notable_intervals = filter(lambda interval: interval[1] - interval[0] >= cell_dt, calendar)
-            new_row['unavailabilities'] = [{'start': interval[0], 'stop': interval[1]} for interval in notable_intervals]
-            return new_row
-
-        return [traverse(inject_unavailability, row) for row in rows]
+        return self._gantt_unavailability_fill_rows(rows, 'resource_id', scale, leaves_mapping, company_leaves)
 
     @api.model
     def get_unusual_days(self, date_from, date_to=None):
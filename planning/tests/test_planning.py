@@ -220,6 +220,37 @@ class TestPlanning(TestCommonPlanning):
         self.assertEqual(2, self.slot_6_2.overlap_slot_count, '2 slots overlap')
         self.assertEqual(0, self.slot_6_3.overlap_slot_count, 'no slot overlap')
 
+    def test_search_overlap_count(self):
+        long_slot = self.env['planning.slot'].create({
+            'resource_id': self.resource_bert.id,
+            'start_datetime': datetime(2018, 5, 1, 8, 0),
+            'end_datetime': datetime(2018, 6, 30, 17, 0),
+        })
+        short_slot = self.env['planning.slot'].create({
+            'resource_id': self.resource_bert.id,
+            'start_datetime': datetime(2018, 6, 20, 8, 0),
+            'end_datetime': datetime(2018, 6, 20, 17, 0),
+        })
+        free_slot = self.env['planning.slot'].create({
+            'resource_id': self.resource_bert.id,
+            'start_datetime': datetime(2018, 7, 1, 8, 0),
+            'end_datetime': datetime(2018, 7, 1, 17, 0),
+        })
+        slots = long_slot + short_slot + free_slot
+
+        # The long slot starts way before the short one, but must still be detected as conflicting with it
+        self.assertEqual(long_slot.conflicting_slot_ids, short_slot)
+        self.assertEqual(short_slot.conflicting_slot_ids, long_slot)
+        self.assertEqual(slots.filtered_domain([('overlap_slot_count', '>', 0)]), long_slot + short_slot)
+        self.assertEqual(
+            self.env['planning.slot'].search([('id', 'in', slots.ids), ('overlap_slot_count', '>', 0)]),
+            long_slot + short_slot,
+        )
+        self.assertEqual(
+            self.env['planning.slot'].search([('id', 'in', slots.ids), ('overlap_slot_count', '=', 0)]),
+            free_slot,
+        )
+
     def test_compute_datetime_with_template_slot(self):
         """ Test if the start and end datetimes of a planning.slot are correctly computed with the template slot
 
@@ -18,13 +18,22 @@ class SignRequest(models.Model):
                     subtype_id=self.env.ref("mail.mt_note").id,
                     author_id=self.env.user.partner_id.id,
                 )
-                # attach a copy of the signed document to the SO for easy retrieval
-                self.env["ir.attachment"].create(
-                    {
-                        "name": request.reference,
-                        "datas": request.completed_document,
-                        "type": "binary",
-                        "res_model": self.env["sale.order"]._name,
-                        "res_id": request.sale_order_id.id,
-                    }
-                )
+
+    def _send_completed_document(self):
+        super()._send_completed_document()
+        # the document can be sent again (e.g. once decrypted), but is attached only once
+        if self.sale_order_id and not self.env["ir.attachment"].search_count([
+            ("res_model", "=", self.env["sale.order"]._name),
+            ("res_id", "=", self.sale_order_id.id),
+            ("name", "=", self.reference),
+        ]):
+            # attach a copy of the signed document to the SO for easy retrieval
+            self.env["ir.attachment"].create(
+                {
+                    "name": self.reference,
+                    "datas": self.completed_document,
+                    "type": "binary",
+                    "res_model": self.env["sale.order"]._name,
+                    "res_id": self.sale_order_id.id,
+                }
+            )
@@ -4,12 +4,20 @@ from collections import defaultdict
 
 from dateutil.relativedelta import relativedelta
 
-from odoo import models, _
+from odoo import fields, models, _
+from odoo.tools.sql import create_index
 
 
 class AccountMove(models.Model):
     _inherit = 'account.move'
 
+    subscription_to_send = fields.Boolean(copy=False, readonly=True,
+        help="Recurring invoice waiting to be sent by the subscriptions invoicing cron.")
+
+    def init(self):
+        super().init()
+        create_index(self._cr, 'account_move_subscription_to_send_index', self._table, ['id'], where='subscription_to_send')
+
     def _post(self, soft=True):
         posted_moves = super()._post(soft=soft)
         for move in posted_moves:
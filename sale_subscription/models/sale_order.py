@@ -2,6 +2,7 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
 import logging
+import time
 from dateutil.relativedelta import relativedelta
 from psycopg2.extensions import TransactionRollbackError
 from ast import literal_eval
@@ -965,7 +966,11 @@ class SaleOrder(models.Model):
 
     @api.model
     def _cron_recurring_create_invoice(self):
-        return self._create_recurring_invoice(automatic=True)
+        return self._create_recurring_invoice(automatic=True, batch_size=self._get_recurring_invoice_batch_size())
+
+    @api.model
+    def _get_recurring_invoice_batch_size(self):
+        return int(self.env['ir.config_parameter'].sudo().get_param('sale_subscription.invoice_batch_size', 30))
 
     def _get_invoiceable_lines(self, final=False):
         date_from = fields.Date.today()
@@ -1143,7 +1148,6 @@ class SaleOrder(models.Model):
     def _create_recurring_invoice(self, automatic=False, batch_size=30):
         automatic = bool(automatic)
         auto_commit = automatic and not bool(config['test_enable'] or config['test_file'])
-        Mail = self.env['mail.mail']
         today = fields.Date.today()
         invoiceable_categories = ['progress']
         if len(self) > 0:
@@ -1174,6 +1178,12 @@ class SaleOrder(models.Model):
         all_invoiceable_lines._reset_subscription_qty_to_invoice()
         if auto_commit:
             self.env.cr.commit()
+        # Stage 1: select the subscriptions to invoice, and handle the ones having nothing to invoice
+        prepare_start = time.monotonic()
+        invoiceable_lines_by_subscription = defaultdict(lambda: self.env['sale.order.line'])
+        for line in all_invoiceable_lines:
+            invoiceable_lines_by_subscription[line.order_id.id] |= line
+        subscriptions_to_invoice = self.env['sale.order']
         for subscription in all_subscriptions:
             # We only invoice contract in sale state. Locked contracts are invoiced in advance. They are frozen.
             if not (subscription.state == 'sale' and subscription.stage_category in invoiceable_categories):
@@ -1186,8 +1196,6 @@ class SaleOrder(models.Model):
                 # by a different worker, we check that it has not already been set to "in exception"
                 if subscription.payment_exception:
                     continue
-                if auto_commit:
-                    self.env.cr.commit() # To avoid a rollback in case something is wrong, we create the invoices one by one
                 draft_invoices = subscription.invoice_ids.filtered(lambda am: am.state == 'draft')
                 if not subscription.payment_token_id and draft_invoices:
                     if not automatic:
@@ -1196,7 +1204,7 @@ class SaleOrder(models.Model):
                     continue
                 if subscription.payment_token_id:
                     draft_invoices.button_cancel()
-                invoiceable_lines = all_invoiceable_lines.filtered(lambda l: l.order_id.id == subscription.id)
+                invoiceable_lines = invoiceable_lines_by_subscription[subscription.id]
                 invoice_is_free, is_exception = subscription._invoice_is_considered_free(invoiceable_lines)
                 if not invoiceable_lines or invoice_is_free:
                     if is_exception and automatic:
@@ -1215,34 +1223,8 @@ class SaleOrder(models.Model):
                             for line in invoiceable_lines:
                                 line.qty_invoiced = line.product_uom_qty
                             subscription._subscription_post_success_free_renewal()
-                    if auto_commit:
-                        self.env.cr.commit()
-                    continue
-                try:
-                    invoice = subscription.with_context(recurring_automatic=automatic)._create_invoices()
-                    lines_to_reset_qty |= invoiceable_lines
-                except Exception as e:
-                    if auto_commit:
-                        self.env.cr.rollback()
-                    elif isinstance(e, TransactionRollbackError) or not automatic:
-                        # the transaction is broken we should raise the exception
-                        raise
-                    # we suppose that the payment is run only once a day
-                    email_context = subscription._get_subscription_mail_payment_context()
-                    error_message = _("Error during renewal of contract %s (Payment not recorded)", subscription.name)
-                    _logger.exception(error_message)
-                    mail = Mail.sudo().create({'body_html': error_message, 'subject': error_message, 'email_to': email_context['responsible_email'], 'auto_delete': True})
-                    mail.send()
-                    continue
-                if auto_commit:
-                    self.env.cr.commit()
-                # Handle automatic payment or invoice posting
-                if automatic:
-                    existing_invoices = subscription._handle_automatic_invoices(auto_commit, invoice)
-                    account_moves |= existing_invoices
                 else:
-                    account_moves |= invoice
-                subscription.with_context(mail_notrack=True).write({'payment_exception': False})
+                    subscriptions_to_invoice |= subscription
             except Exception as error:
                 _logger.exception("Error during renewal of contract %s", subscription.client_order_ref or subscription.name)
                 if auto_commit:
@@ -1252,8 +1234,56 @@ class SaleOrder(models.Model):
             else:
                 if auto_commit:
                     self.env.cr.commit()
-        lines_to_reset_qty._reset_subscription_quantity_post_invoice()
+
+        selection_duration = time.monotonic() - prepare_start
+        # Stages 2 and 3: create the invoices in bulk, then handle the automatic payment or posting of each invoice.
+        # Both are done by chunks of subscriptions, so that an interrupted run never leaves more than a chunk of draft
+        # invoices behind, which would prevent their subscriptions from being invoiced by the next runs.
+        create_duration = payment_duration = 0.0
+        invoices_count = 0
+        for subscriptions_chunk in split_every(10, subscriptions_to_invoice.ids, self.env['sale.order'].browse):
+            create_start = time.monotonic()
+            invoice_by_subscription = subscriptions_chunk._create_recurring_invoice_moves(automatic, auto_commit)
+            invoices_count += len(invoice_by_subscription)
+            payment_start = time.monotonic()
+            for subscription in subscriptions_chunk:
+                invoice = invoice_by_subscription.get(subscription.id)
+                if not invoice:
+                    continue
+                lines_to_reset_qty |= invoiceable_lines_by_subscription[subscription.id]
+                try:
+                    if automatic:
+                        existing_invoices = subscription._handle_automatic_invoices(auto_commit, invoice)
+                        account_moves |= existing_invoices
+                    else:
+                        account_moves |= invoice
+                    subscription.with_context(mail_notrack=True).write({'payment_exception': False})
+                except Exception as error:
+                    _logger.exception("Error during renewal of contract %s", subscription.client_order_ref or subscription.name)
+                    if auto_commit:
+                        self.env.cr.rollback()
+                    if not automatic:
+                        raise error
+                else:
+                    if auto_commit:
+                        self.env.cr.commit()
+            lines_to_reset_qty._reset_subscription_quantity_post_invoice()
+            lines_to_reset_qty = self.env['sale.order.line']
+            if auto_commit:
+                self.env.cr.commit()
+            create_duration += payment_start - create_start
+            payment_duration += time.monotonic() - payment_start
+        send_start = time.monotonic()
+        # Stage 4: send the invoices, queued in a separate cron for the automatic invoicing
         all_subscriptions._process_invoices_to_send(account_moves, auto_commit)
+        if automatic:
+            end_time = time.monotonic()
+            _logger.info(
+                "Recurring invoicing of %s subscriptions: selection in %.2fs, creation of %s invoices in %.2fs, "
+                "payment and posting in %.2fs, sending in %.2fs.",
+                len(all_subscriptions), selection_duration, invoices_count, create_duration, payment_duration,
+                end_time - send_start,
+            )
         # There is still some subscriptions to process. Then, make sure the CRON will be triggered again asap.
         if need_cron_trigger:
             if config['test_enable'] or config['test_file']:
@@ -1272,6 +1302,47 @@ class SaleOrder(models.Model):
 
         return account_moves
 
+    def _create_recurring_invoice_moves(self, automatic, auto_commit):
+        """ Creates the recurring invoices of the subscriptions, all at once when possible.
+        If the bulk creation fails, the invoices are created one by one, so that a faulty subscription doesn't
+        prevent the other ones from being invoiced.
+
+        :return: A dict mapping the id of each subscription that got invoiced to its invoice.
+        """
+        if len(self) > 1:
+            try:
+                with self.env.cr.savepoint():
+                    invoices = self.with_context(recurring_automatic=automatic)._create_invoices(grouped=True)
+            except Exception:
+                _logger.info("Bulk creation of the invoices of %s subscriptions failed, creating them one by one.", len(self), exc_info=True)
+                self.env.invalidate_all()
+            else:
+                if auto_commit:
+                    self.env.cr.commit()
+                return {invoice.invoice_line_ids.sale_line_ids.order_id[:1].id: invoice for invoice in invoices}
+
+        Mail = self.env['mail.mail']
+        invoice_by_subscription = {}
+        for subscription in self:
+            try:
+                invoice_by_subscription[subscription.id] = subscription.with_context(recurring_automatic=automatic)._create_invoices()
+            except Exception as e:
+                if auto_commit:
+                    self.env.cr.rollback()
+                elif isinstance(e, TransactionRollbackError) or not automatic:
+                    # the transaction is broken we should raise the exception
+                    raise
+                # we suppose that the payment is run only once a day
+                email_context = subscription._get_subscription_mail_payment_context()
+                error_message = _("Error during renewal of contract %s (Payment not recorded)", subscription.name)
+                _logger.exception(error_message)
+                mail = Mail.sudo().create({'body_html': error_message, 'subject': error_message, 'email_to': email_context['responsible_email'], 'auto_delete': True})
+                mail.send()
+                continue
+            if auto_commit:
+                self.env.cr.commit()
+        return invoice_by_subscription
+
     def _create_invoices(self, grouped=False, final=False, date=None):
         """ Override to increment periods when needed """
         order_already_invoiced = self.env['sale.order']
@@ -1559,6 +1630,35 @@ class SaleOrder(models.Model):
 
     @api.model
     def _process_invoices_to_send(self, account_moves, auto_commit):
+        if auto_commit:
+            # Rendering and sending the invoices is slow, it is done by a dedicated cron not to delay the invoicing
+            account_moves.write({'subscription_to_send': True})
+            self.env.ref('sale_subscription.account_analytic_cron_for_invoice_send')._trigger()
+            return
+        self._send_recurring_invoices(account_moves, auto_commit)
+
+    @api.model
+    def _cron_send_recurring_invoices(self, batch_size=100):
+        invoices = self.env['account.move'].search([('subscription_to_send', '=', True)], limit=batch_size + 1)
+        auto_commit = not bool(config['test_enable'] or config['test_file'])
+        invoices_batch = invoices[:batch_size]
+        start_time = time.monotonic()
+        for invoice in invoices_batch:
+            # An invoice that can't be rendered or sent must leave the queue, or it would block the next batches
+            try:
+                with self.env.cr.savepoint():
+                    self._send_recurring_invoices(invoice, auto_commit=False)
+            except Exception:
+                _logger.exception("Error while sending the recurring invoice %s", invoice.name)
+            invoice.subscription_to_send = False
+            if auto_commit:
+                self.env.cr.commit()
+        _logger.info("Sent %s recurring invoices in %.2fs.", len(invoices_batch), time.monotonic() - start_time)
+        if len(invoices) > batch_size:
+            self.env.ref('sale_subscription.account_analytic_cron_for_invoice_send')._trigger()
+
+    @api.model
+    def _send_recurring_invoices(self, account_moves, auto_commit):
         for invoice in account_moves:
             if not invoice.is_move_sent and invoice._is_ready_to_be_sent() and invoice.state == 'posted':
                 subscription = invoice.line_ids.subscription_id
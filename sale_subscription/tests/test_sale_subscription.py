@@ -2359,3 +2359,73 @@ class TestSubscription(TestSubscriptionCommon):
                       in renew_logs]
 
         self.assertEqual(renew_data, [('0_creation', today, 'progress', 63, 63)])
+
+    def test_recurring_invoice_bulk_creation(self):
+        with freeze_time("2021-01-03"):
+            subscriptions = self.subscription | self.subscription.copy() | self.subscription.copy()
+            subscriptions.action_confirm()
+            self.env['sale.order']._cron_recurring_create_invoice()
+            for subscription in subscriptions:
+                self.assertEqual(subscription.invoice_count, 1)
+                self.assertEqual(subscription.invoice_ids.invoice_origin, subscription.name)
+                self.assertEqual(subscription.invoice_ids.invoice_line_ids.sale_line_ids.order_id, subscription)
+
+    def test_recurring_invoice_creation_by_chunks(self):
+        with freeze_time("2021-01-03"):
+            subscriptions = self.subscription
+            for dummy in range(10):
+                subscriptions |= self.subscription.copy()
+            subscriptions.action_confirm()
+            SaleOrder = self.registry['sale.order']
+            with patch.object(SaleOrder, '_create_recurring_invoice_moves', autospec=True,
+                              side_effect=SaleOrder._create_recurring_invoice_moves) as create_invoice_moves:
+                self.env['sale.order']._cron_recurring_create_invoice()
+            # the invoices are created, then paid or posted, by chunks of 10 subscriptions
+            self.assertEqual([len(call.args[0]) for call in create_invoice_moves.call_args_list], [10, 1])
+            for subscription in subscriptions:
+                self.assertEqual(subscription.invoice_count, 1)
+                self.assertEqual(subscription.invoice_ids.state, 'posted')
+
+    def test_cron_send_recurring_invoices(self):
+        with freeze_time("2021-01-03"):
+            subscriptions = self.subscription | self.subscription.copy() | self.subscription.copy()
+            subscriptions.action_confirm()
+            self.env['sale.order']._cron_recurring_create_invoice()
+            invoices = subscriptions.invoice_ids
+            self.assertEqual(len(invoices), 3)
+            # outside of the tests, the invoicing cron queues the invoices to send to a dedicated cron
+            invoices.write({'is_move_sent': False, 'subscription_to_send': True})
+
+            self.env['sale.order']._cron_send_recurring_invoices(batch_size=2)
+            sent_invoices = invoices.filtered('is_move_sent')
+            self.assertEqual(len(sent_invoices), 2)
+            self.assertFalse(any(sent_invoices.mapped('subscription_to_send')))
+            self.assertTrue((invoices - sent_invoices).subscription_to_send)
+
+            self.env['sale.order']._cron_send_recurring_invoices(batch_size=2)
+            self.assertTrue(all(invoices.mapped('is_move_sent')))
+            self.assertFalse(any(invoices.mapped('subscription_to_send')))
+
+    @mute_logger('odoo.addons.sale_subscription.models.sale_order')
+    def test_cron_send_recurring_invoices_failure(self):
+        with freeze_time("2021-01-03"):
+            subscriptions = self.subscription | self.subscription.copy() | self.subscription.copy()
+            subscriptions.action_confirm()
+            self.env['sale.order']._cron_recurring_create_invoice()
+            invoices = subscriptions.invoice_ids
+            invoices.write({'is_move_sent': False, 'subscription_to_send': True})
+            failing_invoice = invoices[1]
+
+            SaleOrder = self.registry['sale.order']
+            validate_and_send_invoice = SaleOrder.validate_and_send_invoice
+
+            def _validate_and_send_invoice(subscription, auto_commit, invoice):
+                if invoice == failing_invoice:
+                    raise UserError("Rendering error")
+                return validate_and_send_invoice(subscription, auto_commit, invoice)
+
+            with patch.object(SaleOrder, 'validate_and_send_invoice', autospec=True, side_effect=_validate_and_send_invoice):
+                self.env['sale.order']._cron_send_recurring_invoices()
+            # the other invoices are sent, and the failing one leaves the queue
+            self.assertEqual(invoices.filtered('is_move_sent'), invoices - failing_invoice)
+            self.assertFalse(any(invoices.mapped('subscription_to_send')))
@@ -15,6 +15,8 @@ It adds dashboards to :
     'website': 'https://www.odoo.com/app/accounting',
     'category': 'Sales/Subscriptions',
     'data': [
+        'security/ir.model.access.csv',
+        'data/ir_cron.xml',
         'views/sale_subscription_dashboard_views.xml',
         'views/report_dashboard.xml',
     ],
@@ -47,7 +47,61 @@ def make_filters_query(filters):
     return join, where, args
 
 
+def split_snapshot_dates(dates):
+    """ Splits the dates between the ones summarized by the MRR snapshots, and the ones that must be computed
+    from the journal items.
+    """
+    snapshot_date = request.env['sale.subscription.mrr.snapshot'].sudo()._get_snapshot_date()
+    if not snapshot_date:
+        return [], dates
+    return [date for date in dates if date <= snapshot_date], [date for date in dates if date > snapshot_date]
+
+
+def compute_snapshot_batch(dates, filters, value_expression, currency_date):
+    """ Computes the value of each date from the MRR snapshots.
+
+    :param value_expression:    The SQL aggregate giving the value of a date from its snapshot rows, aliased as s.
+    :param currency_date:       The date of the currency rates used to convert the amounts.
+    """
+    where = ""
+    query_args = {
+        'dates': tuple(dates),
+        'currency_date': currency_date,
+    }
+    if filters.get('template_ids'):
+        where += "\nAND s.template_id IN %(template_ids)s"
+        query_args['template_ids'] = tuple(filters['template_ids'])
+    if filters.get('sale_team_ids'):
+        where += "\nAND s.team_id IN %(team_ids)s"
+        query_args['team_ids'] = tuple(filters['sale_team_ids'])
+    if filters.get('company_ids'):
+        where += "\nAND s.company_id IN %(company_ids)s"
+        query_args['company_ids'] = tuple(filters['company_ids'])
+
+    query = f"""
+        WITH currency_rate AS ({currency_rate_table()})
+        SELECT s.date, {value_expression} AS value
+        FROM sale_subscription_mrr_snapshot s
+        LEFT JOIN currency_rate cr ON cr.currency_id = s.currency_id
+        WHERE s.date IN %(dates)s
+        {where}
+        GROUP BY s.date
+    """
+    request.cr.execute(query, query_args)
+    value_by_date = dict(request.cr.fetchall())
+    return [{'date': date, 'value': value_by_date.get(date, 0)} for date in dates]
+
+
 def compute_nb_contracts_batch(dates, filters):
+    currency_date = dates[-1]
+    snapshot_dates, dates = split_snapshot_dates(dates)
+    res = compute_snapshot_batch(snapshot_dates, filters, 'SUM(s.contract_count)', currency_date) if snapshot_dates else []
+    if dates:
+        res += _compute_nb_contracts_batch(dates, filters)
+    return sorted(res, key=lambda datapoint: datapoint['date'])
+
+
+def _compute_nb_contracts_batch(dates, filters):
     join, where, query_args = make_filters_query(filters)
     dates_datapoints, date_args = get_dates_datapoints(dates)
     query_args = {**query_args, **date_args}
@@ -302,6 +356,15 @@ def compute_nrr_batch(dates, filters):
     return request.cr.dictfetchall()
 
 def compute_mrr_batch(dates, filters):
+    currency_date = dates[-1]
+    snapshot_dates, dates = split_snapshot_dates(dates)
+    res = compute_snapshot_batch(snapshot_dates, filters, 'SUM(s.mrr * COALESCE(cr.rate, 1))', currency_date) if snapshot_dates else []
+    if dates:
+        res += _compute_mrr_batch(dates, filters, currency_date)
+    return sorted(res, key=lambda datapoint: datapoint['date'])
+
+
+def _compute_mrr_batch(dates, filters, currency_date):
     join, where, query_args = make_filters_query(filters)
     dates_datapoints, date_args = get_dates_datapoints(dates)
     query_args = {**query_args, **date_args}
@@ -360,7 +423,7 @@ def compute_mrr_batch(dates, filters):
     query_args.update(
         start_date=dates[0],
         end_date=dates[-1],
-        currency_date=dates[-1],
+        currency_date=currency_date,
     )
 
     request.cr.execute(query, query_args)
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import models
+
+
+class AccountMove(models.Model):
+    _inherit = 'account.move'
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'state' in vals or 'team_id' in vals:
+            invoices = self.filtered(lambda move: move.move_type in ('out_invoice', 'out_refund'))
+            if invoices:
+                self.env['sale.subscription.mrr.snapshot']._invalidate_from_subscription_lines('aml.move_id IN %s', [tuple(invoices.ids)])
+        return res
@@ -27,6 +27,14 @@ class SaleOrder(models.Model):
         """)
         super().init()
 
+    def write(self, vals):
+        res = super().write(vals)
+        if 'sale_order_template_id' in vals:
+            subscriptions = self.filtered('is_subscription')
+            if subscriptions:
+                self.env['sale.subscription.mrr.snapshot']._invalidate_from_subscription_lines('aml.subscription_id IN %s', [tuple(subscriptions.ids)])
+        return res
+
     @api.model
     def _get_subscription_dates_ranges(self):
         today = fields.Date.context_today(self)
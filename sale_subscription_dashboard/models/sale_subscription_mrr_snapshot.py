@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from datetime import timedelta
+
+from odoo import api, fields, models
+from odoo.tools import config
+from odoo.tools.sql import create_index
+
+
+class SaleSubscriptionMrrSnapshot(models.Model):
+    """ Daily summary of the subscriptions invoiced, used by the dashboard instead of aggregating account_move_line for
+    every datapoint of the MRR and subscriptions count graphs.
+
+    Each row holds, for a day and a (company, template, sales team, currency) key, the MRR of the subscription invoice
+    lines covering that day (in the currency of the lines, as the rate used to convert them depends on the graph) and the
+    number of subscriptions running that day.
+    The table is filled day by day by a cron, up to the date stored in sale.subscription.mrr.snapshot.state. Posting or
+    resetting an invoice covering days already summarized removes the rows of these days, to have them recomputed.
+    """
+    _name = 'sale.subscription.mrr.snapshot'
+    _description = "Subscription MRR Snapshot"
+    _log_access = False
+
+    date = fields.Date(required=True, readonly=True)
+    company_id = fields.Many2one('res.company', required=True, readonly=True, ondelete='cascade')
+    template_id = fields.Many2one('sale.order.template', readonly=True, ondelete='cascade')
+    team_id = fields.Many2one('crm.team', readonly=True, ondelete='cascade')
+    currency_id = fields.Many2one('res.currency', readonly=True, ondelete='cascade')
+    mrr = fields.Float(readonly=True)
+    contract_count = fields.Integer(readonly=True)
+
+    def init(self):
+        super().init()
+        create_index(self._cr, 'sale_subscription_mrr_snapshot_date_index', self._table, ['date', 'company_id'])
+
+    @api.model
+    def _get_snapshot_date(self):
+        """ Returns the last day summarized by the table, or None if it has not been built yet. """
+        self.env.cr.execute("SELECT snapshot_date FROM sale_subscription_mrr_snapshot_state")
+        row = self.env.cr.fetchone()
+        return row[0] if row else None
+
+    @api.model
+    def _set_snapshot_date(self, snapshot_date):
+        self.env.cr.execute("UPDATE sale_subscription_mrr_snapshot_state SET snapshot_date = %s", [snapshot_date])
+        if not self.env.cr.rowcount:
+            self.env.cr.execute("INSERT INTO sale_subscription_mrr_snapshot_state (snapshot_date) VALUES (%s)", [snapshot_date])
+
+    @api.model
+    def _compute_snapshots(self, date_from, date_to):
+        """ (Re)computes the rows of the days between date_from and date_to, both included. """
+        self.env['account.move.line'].flush_model([
+            'move_id', 'currency_id', 'subscription_id', 'subscription_start_date', 'subscription_end_date', 'subscription_mrr',
+        ])
+        self.env['account.move'].flush_model(['move_type', 'state', 'company_id', 'team_id'])
+        self.env['sale.order'].flush_model(['sale_order_template_id'])
+        self.env.cr.execute("DELETE FROM sale_subscription_mrr_snapshot WHERE date BETWEEN %s AND %s", [date_from, date_to])
+        self.env.cr.execute("""
+            WITH days AS (
+                SELECT day::date AS date
+                FROM generate_series(%(date_from)s::date, %(date_to)s::date, interval '1 day') AS day
+            ),
+            subscription_lines AS (
+                SELECT
+                    aml.subscription_id,
+                    am.company_id,
+                    so.sale_order_template_id AS template_id,
+                    am.team_id,
+                    aml.currency_id,
+                    aml.subscription_start_date AS start_date,
+                    aml.subscription_end_date AS end_date,
+                    aml.subscription_mrr AS mrr
+                FROM account_move_line aml
+                JOIN account_move am ON am.id = aml.move_id
+                JOIN sale_order so ON so.id = aml.subscription_id
+                WHERE   am.move_type IN ('out_invoice', 'out_refund')
+                AND     am.state NOT IN ('draft', 'cancel')
+                AND     aml.subscription_id IS NOT NULL
+            ),
+            contracts AS (
+                -- A subscription counts once, under the key of its last invoiced period
+                SELECT subscription_id,
+                       (ARRAY_AGG(company_id ORDER BY end_date DESC))[1] AS company_id,
+                       (ARRAY_AGG(template_id ORDER BY end_date DESC))[1] AS template_id,
+                       (ARRAY_AGG(team_id ORDER BY end_date DESC))[1] AS team_id,
+                       (ARRAY_AGG(currency_id ORDER BY end_date DESC))[1] AS currency_id,
+                       MIN(start_date) AS start_date, MAX(end_date) AS end_date
+                FROM subscription_lines
+                GROUP BY subscription_id
+                HAVING MIN(start_date) <= %(date_to)s AND MAX(end_date) >= %(date_from)s
+            )
+            INSERT INTO sale_subscription_mrr_snapshot (date, company_id, template_id, team_id, currency_id, mrr, contract_count)
+            SELECT date, company_id, template_id, team_id, currency_id, SUM(mrr), SUM(contract_count)
+            FROM (
+                SELECT days.date, line.company_id, line.template_id, line.team_id, line.currency_id, line.mrr, 0 AS contract_count
+                FROM days
+                JOIN subscription_lines line ON line.start_date <= days.date AND line.end_date >= days.date
+                WHERE line.mrr != 0
+                UNION ALL
+                SELECT days.date, contract.company_id, contract.template_id, contract.team_id, contract.currency_id, 0 AS mrr, 1 AS contract_count
+                FROM days
+                JOIN contracts contract ON contract.start_date <= days.date AND contract.end_date >= days.date
+            ) day_values
+            GROUP BY date, company_id, template_id, team_id, currency_id
+        """, {'date_from': date_from, 'date_to': date_to})
+
+    @api.model
+    def _cron_update_snapshots(self, days_limit=31):
+        """ Summarizes the days following the last summarized one, up to yesterday, by chunks of days_limit days. """
+        date_to = fields.Date.context_today(self) - timedelta(days=1)
+        snapshot_date = self._get_snapshot_date()
+        if snapshot_date:
+            date_from = snapshot_date + timedelta(days=1)
+        else:
+            self.env['account.move.line'].flush_model(['subscription_id', 'subscription_start_date'])
+            self.env.cr.execute("SELECT MIN(subscription_start_date) FROM account_move_line WHERE subscription_id IS NOT NULL")
+            date_from = self.env.cr.fetchone()[0] or date_to
+        if date_from > date_to:
+            return
+
+        chunk_date_to = min(date_to, date_from + timedelta(days=days_limit - 1))
+        self._compute_snapshots(date_from, chunk_date_to)
+        self._set_snapshot_date(chunk_date_to)
+        if not config['test_enable']:
+            self.env.cr.commit()
+
+        if chunk_date_to < date_to:
+            self.env.ref('sale_subscription_dashboard.ir_cron_sale_subscription_mrr_snapshot')._trigger()
+
+    @api.model
+    def _invalidate(self, date_from):
+        """ Removes the rows from date_from on, so that the cron recomputes them. """
+        snapshot_date = self._get_snapshot_date()
+        if not snapshot_date or not date_from or date_from > snapshot_date:
+            return
+        self.env.cr.execute("DELETE FROM sale_subscription_mrr_snapshot WHERE date >= %s", [date_from])
+        # Only move the date backwards, a concurrent invalidation may have set an earlier one
+        self.env.cr.execute("""
+            UPDATE sale_subscription_mrr_snapshot_state
+            SET snapshot_date = %(snapshot_date)s
+            WHERE snapshot_date > %(snapshot_date)s
+        """, {'snapshot_date': date_from - timedelta(days=1)})
+        self.env.ref('sale_subscription_dashboard.ir_cron_sale_subscription_mrr_snapshot')._trigger()
+
+    @api.model
+    def _invalidate_from_subscription_lines(self, where_clause, where_params):
+        """ Invalidates the rows covered by the subscription invoice lines matching the provided SQL condition on
+        account_move_line, aliased as aml.
+        """
+        if not self._get_snapshot_date():
+            return
+        self.env['account.move.line'].flush_model(['move_id', 'subscription_id', 'subscription_start_date'])
+        self.env.cr.execute(f"""
+            SELECT MIN(aml.subscription_start_date)
+            FROM account_move_line aml
+            WHERE aml.subscription_id IS NOT NULL
+            AND ({where_clause})
+        """, where_params)
+        self._invalidate(self.env.cr.fetchone()[0])
+
+
+class SaleSubscriptionMrrSnapshotState(models.Model):
+    """ Single row holding the last day summarized by sale.subscription.mrr.snapshot.
+
+    It is kept out of the system parameters, whose writes clear the registry caches of every worker, as it is updated
+    each time an invoice covering summarized days is posted or reset.
+    """
+    _name = 'sale.subscription.mrr.snapshot.state'
+    _description = "Subscription MRR Snapshot State"
+    _log_access = False
+
+    snapshot_date = fields.Date(readonly=True)
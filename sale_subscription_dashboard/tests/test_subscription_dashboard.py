@@ -179,6 +179,24 @@ class TestSubscriptionDashboard(HttpCase):
 
         self._check_mrr(start_date, end_date, 0)
 
+    def _get_stat_trend(self, start_date, end_date):
+        self.authenticate("test_user_1", "P@ssw0rd!")
+        res = self.url_open(
+            '/sale_subscription_dashboard/compute_graph_and_stats',
+            data=json.dumps(
+                {
+                    "params": {
+                        "stat_type": "mrr",
+                        "start_date": start_date,
+                        "end_date": end_date,
+                        "filters": {},
+                    },
+                }
+            ),
+            headers={"Content-Type": "application/json"},
+        )
+        return res.json()['result']['stats']
+
     def _check_mrr(self, start_date, end_date, value):
         self.authenticate("test_user_1", "P@ssw0rd!")
         url = '/sale_subscription_dashboard/compute_stat'
@@ -197,3 +215,40 @@ class TestSubscriptionDashboard(HttpCase):
             headers={"Content-Type": "application/json"},
         )
         self.assertEqual(res.json()['result'][0][1], value)
+
+    def test_mrr_snapshot(self):
+        with freeze_time("2021-01-03"):
+            self.subscription.write({
+                "order_line": [(0, 0, {
+                    "product_id": self.product.id,
+                    "name": "TestRecurringLine",
+                    "product_uom": self.product.uom_id.id,
+                })],
+            })
+            self.subscription.order_line.price_unit = 50
+            self.subscription.action_confirm()
+            self.subscription._create_recurring_invoice()
+            invoice = self.subscription.invoice_ids
+            invoice._post()
+
+        Snapshot = self.env['sale.subscription.mrr.snapshot']
+        with freeze_time("2021-01-20"):
+            Snapshot._cron_update_snapshots(days_limit=366)
+            self.assertEqual(Snapshot._get_snapshot_date(), datetime.date(2021, 1, 19))
+            snapshot = Snapshot.search([('date', '=', datetime.date(2021, 1, 10))])
+            self.assertRecordValues(snapshot, [{'mrr': 50, 'contract_count': 1}])
+            self._check_mrr("2021-01-10", "2021-01-10", 50)
+
+            # The datapoints read from the snapshots are ordered like the ones computed from the journal items
+            stats_with_snapshots = self._get_stat_trend("2020-12-01", "2021-02-15")
+            self.env.cr.execute("DELETE FROM sale_subscription_mrr_snapshot_state")
+            self.assertEqual(stats_with_snapshots, self._get_stat_trend("2020-12-01", "2021-02-15"))
+            Snapshot._set_snapshot_date(datetime.date(2021, 1, 19))
+
+            # Resetting the invoice removes the rows of the days it covers
+            invoice.button_draft()
+            self.assertEqual(Snapshot._get_snapshot_date(), datetime.date(2021, 1, 2))
+            self.assertFalse(Snapshot.search([('date', '>=', datetime.date(2021, 1, 3))]))
+            Snapshot._cron_update_snapshots(days_limit=366)
+            self.assertFalse(Snapshot.search([('date', '=', datetime.date(2021, 1, 10))]))
+            self._check_mrr("2021-01-10", "2021-01-10", 0)
@@ -1,13 +1,10 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
 import base64
-import io
 import logging
 import mimetypes
 import re
 
-from PyPDF2 import PdfFileReader
-
 from odoo import http, models, tools, Command, _
 from odoo.http import request, content_disposition
 from odoo.addons.iap.tools import iap_tools
@@ -199,8 +196,7 @@ class Sign(http.Controller):
         password = http.request.params['password']
         template_id = request_item.sign_request_id.template_id
 
-        old_pdf = PdfFileReader(io.BytesIO(base64.b64decode(template_id.attachment_id.datas)), strict=False, overwriteWarnings=False)
-        if old_pdf.isEncrypted and not old_pdf.decrypt(password):
+        if not template_id._check_pdf_password(password):
             values['error'] = _("Wrong password")
             return http.request.render('sign.encrypted_ask_password', values)
 
@@ -354,8 +350,7 @@ class Sign(http.Controller):
             return False
         template_id = request_item.sign_request_id.template_id
 
-        old_pdf = PdfFileReader(io.BytesIO(base64.b64decode(template_id.attachment_id.datas)), strict=False, overwriteWarnings=False)
-        if old_pdf.isEncrypted and not old_pdf.decrypt(password):
+        if not template_id._check_pdf_password(password):
             return False
 
         # if the password is correct, we generate document and send it
@@ -374,8 +369,7 @@ class Sign(http.Controller):
             return False
         template_id = request_item.sign_request_id.template_id
 
-        old_pdf = PdfFileReader(io.BytesIO(base64.b64decode(template_id.attachment_id.datas)), strict=False, overwriteWarnings=False)
-        return True if old_pdf.isEncrypted else False
+        return template_id._is_pdf_encrypted()
 
     @http.route(['/sign/save_location/<int:id>/<token>'], type='json', auth='public')
     def save_location(self, id, token, latitude=0, longitude=0):
@@ -3,6 +3,7 @@
 
 import base64
 import io
+import logging
 import os
 import time
 import unicodedata
@@ -31,6 +32,8 @@ from odoo import api, fields, models, http, _, Command
 from odoo.tools import config, get_lang, is_html_empty, formataddr, groupby, format_date
 from odoo.exceptions import UserError, ValidationError
 
+_logger = logging.getLogger(__name__)
+
 TTFSearchPath.append(os.path.join(config["root_path"], "..", "addons", "web", "static", "fonts", "sign"))
 
 
@@ -84,6 +87,7 @@ class SignRequest(models.Model):
     ], default='sent', tracking=True, group_expand='_expand_states', copy=False)
 
     completed_document = fields.Binary(readonly=True, string="Completed Document", attachment=True, copy=False)
+    completed_document_pending = fields.Boolean(readonly=True, copy=False, help="The completed document is yet to be generated and sent by the cron.")
 
     nb_wait = fields.Integer(string="Sent Requests", compute="_compute_stats", store=True)
     nb_closed = fields.Integer(string="Completed Signatures", compute="_compute_stats", store=True)
@@ -371,15 +375,41 @@ class SignRequest(models.Model):
             self.env.cr.commit()
         if not self._check_is_encrypted():
             # if the file is encrypted, we must wait that the document is decrypted
-            self._send_completed_document()
+            # The completed document is generated and sent in background, so that the last signer does not wait for it
+            self.completed_document_pending = True
+            self.env.ref('sign.ir_cron_send_completed_documents')._trigger()
+
+    @api.model
+    def _cron_send_completed_documents(self, batch_size=20):
+        """ Generates and sends the completed documents of the fully signed requests, by batches of batch_size requests. """
+        sign_requests = self.search([('completed_document_pending', '=', True)], limit=batch_size + 1)
+        for sign_request in sign_requests[:batch_size]:
+            try:
+                with self.env.cr.savepoint():
+                    sign_request._send_completed_document()
+            except Exception as e:
+                _logger.exception("Sending the completed document of sign request %s failed.", sign_request.id)
+                # The signers were not notified, let the requester know so that they can send it again
+                sign_request.activity_schedule(
+                    'mail.mail_activity_data_warning',
+                    user_id=sign_request.create_uid.id,
+                    summary=_("The completed document could not be sent"),
+                    note=_("The completed document could not be sent to the signers: %s", str(e)),
+                )
+            sign_request.completed_document_pending = False
+
+            if not config['test_enable']:
+                self.env.cr.commit()
+
+        if len(sign_requests) > batch_size:
+            self.env.ref('sign.ir_cron_send_completed_documents')._trigger()
 
     def _check_is_encrypted(self):
         self.ensure_one()
         if not self.template_id.sign_item_ids:
             return False
 
-        old_pdf = PdfFileReader(io.BytesIO(base64.b64decode(self.template_id.attachment_id.datas)), strict=False, overwriteWarnings=False)
-        return old_pdf.isEncrypted
+        return self.template_id._is_pdf_encrypted()
 
     def cancel(self):
         for sign_request in self:
@@ -451,7 +481,9 @@ class SignRequest(models.Model):
         custom_font = self.env["ir.config_parameter"].sudo().get_param("sign.use_custom_font")
         # The font must be a TTF font. The tool 'otf2ttf' may be useful for conversion.
         if custom_font:
-            pdfmetrics.registerFont(TTFont(custom_font, custom_font + ".ttf"))
+            # Registered once per process, as loading the font requires to parse the whole TTF file
+            if custom_font not in pdfmetrics.getRegisteredFontNames():
+                pdfmetrics.registerFont(TTFont(custom_font, custom_font + ".ttf"))
             return custom_font
         return "Helvetica"
 
@@ -495,154 +527,158 @@ class SignRequest(models.Model):
         if not self.template_id.sign_item_ids:
             self.completed_document = self.template_id.attachment_id.datas
         else:
-            try:
-                old_pdf = PdfFileReader(io.BytesIO(base64.b64decode(self.template_id.attachment_id.datas)), strict=False, overwriteWarnings=False)
-                old_pdf.getNumPages()
-            except:
-                raise ValidationError(_("ERROR: Invalid PDF file!"))
-
-            isEncrypted = old_pdf.isEncrypted
-            if isEncrypted and not old_pdf.decrypt(password):
-                # password is not correct
-                return
-
-            font = self._get_font()
-            normalFontSize = self._get_normal_font_size()
-
-            packet = io.BytesIO()
-            can = canvas.Canvas(packet)
-            itemsByPage = self.template_id._get_sign_items_by_page()
-            items_ids = [id for items in itemsByPage.values() for id in items.ids]
-            values_dict = self.env['sign.request.item.value'].read_group(
-                [('sign_item_id', 'in', items_ids), ('sign_request_id', '=', self.id)],
-                fields=['value:array_agg', 'frame_value:array_agg', 'frame_has_hash:array_agg'],
-                groupby=['sign_item_id']
-            )
-            values = {
-                val['sign_item_id'][0] : {
-                    'value': val['value'][0],
-                    'frame': val['frame_value'][0],
-                    'frame_has_hash': val['frame_has_hash'][0],
-                } for val in values_dict if 'value' in val
-            }
-
-            for p in range(0, old_pdf.getNumPages()):
-                page = old_pdf.getPage(p)
-                # Absolute values are taken as it depends on the MediaBox template PDF metadata, they may be negative
-                width = float(abs(page.mediaBox.getWidth()))
-                height = float(abs(page.mediaBox.getHeight()))
-
-                # Set page orientation (either 0, 90, 180 or 270)
-                rotation = page['/Rotate'] if '/Rotate' in page else 0
-                if rotation and isinstance(rotation, int):
-                    can.rotate(rotation)
-                    # Translate system so that elements are placed correctly
-                    # despite of the orientation
-                    if rotation == 90:
-                        width, height = height, width
-                        can.translate(0, -height)
-                    elif rotation == 180:
-                        can.translate(-width, -height)
-                    elif rotation == 270:
-                        width, height = height, width
-                        can.translate(-width, 0)
-
-                items = itemsByPage[p + 1] if p + 1 in itemsByPage else []
-                for item in items:
-                    value_dict = values.get(item.id)
-                    if not value_dict:
-                        continue
-                    # only get the 1st
-                    value = value_dict['value']
-                    frame = value_dict['frame']
-
-                    if frame:
-                        try:
-                            image_reader = ImageReader(io.BytesIO(base64.b64decode(frame[frame.find(',')+1:])))
-                        except UnidentifiedImageError:
-                            raise ValidationError(_("There was an issue downloading your document. Please contact an administrator."))
-                        _fix_image_transparency(image_reader._image)
-                        can.drawImage(
-                            image_reader,
-                            width*item.posX,
-                            height*(1-item.posY-item.height),
-                            width*item.width,
-                            height*item.height,
-                            'auto',
-                            True
-                        )
-
-                    if item.type_id.item_type == "text":
-                        value = self._get_displayed_text(value)
-                        can.setFont(font, height*item.height*0.8)
-                        if item.alignment == "left":
-                            can.drawString(width*item.posX, height*(1-item.posY-item.height*0.9), value)
-                        elif item.alignment == "right":
-                            can.drawRightString(width*(item.posX+item.width), height*(1-item.posY-item.height*0.9), value)
-                        else:
-                            can.drawCentredString(width*(item.posX+item.width/2), height*(1-item.posY-item.height*0.9), value)
-
-                    elif item.type_id.item_type == "selection":
-                        content = []
-                        for option in item.option_ids:
-                            if option.id != int(value):
-                                content.append("<strike>%s</strike>" % (option.value))
+            # The template is read from the filestore, PdfFileReader only loads the objects it needs from it
+            with self.template_id._open_pdf_file() as template_file:
+                try:
+                    old_pdf = PdfFileReader(template_file, strict=False, overwriteWarnings=False)
+                    old_pdf.getNumPages()
+                except:
+                    raise ValidationError(_("ERROR: Invalid PDF file!"))
+
+                isEncrypted = old_pdf.isEncrypted
+                if isEncrypted and not old_pdf.decrypt(password):
+                    # password is not correct
+                    return
+
+                font = self._get_font()
+                normalFontSize = self._get_normal_font_size()
+
+                packet = io.BytesIO()
+                can = canvas.Canvas(packet)
+                itemsByPage = self.template_id._get_sign_items_by_page()
+                items_ids = [id for items in itemsByPage.values() for id in items.ids]
+                values_dict = self.env['sign.request.item.value'].read_group(
+                    [('sign_item_id', 'in', items_ids), ('sign_request_id', '=', self.id)],
+                    fields=['value:array_agg', 'frame_value:array_agg', 'frame_has_hash:array_agg'],
+                    groupby=['sign_item_id']
+                )
+                values = {
+                    val['sign_item_id'][0] : {
+                        'value': val['value'][0],
+                        'frame': val['frame_value'][0],
+                        'frame_has_hash': val['frame_has_hash'][0],
+                    } for val in values_dict if 'value' in val
+                }
+
+                for p in range(0, old_pdf.getNumPages()):
+                    page = old_pdf.getPage(p)
+                    # Absolute values are taken as it depends on the MediaBox template PDF metadata, they may be negative
+                    width = float(abs(page.mediaBox.getWidth()))
+                    height = float(abs(page.mediaBox.getHeight()))
+
+                    # Set page orientation (either 0, 90, 180 or 270)
+                    rotation = page['/Rotate'] if '/Rotate' in page else 0
+                    if rotation and isinstance(rotation, int):
+                        can.rotate(rotation)
+                        # Translate system so that elements are placed correctly
+                        # despite of the orientation
+                        if rotation == 90:
+                            width, height = height, width
+                            can.translate(0, -height)
+                        elif rotation == 180:
+                            can.translate(-width, -height)
+                        elif rotation == 270:
+                            width, height = height, width
+                            can.translate(-width, 0)
+
+                    items = itemsByPage[p + 1] if p + 1 in itemsByPage else []
+                    for item in items:
+                        value_dict = values.get(item.id)
+                        if not value_dict:
+                            continue
+                        # only get the 1st
+                        value = value_dict['value']
+                        frame = value_dict['frame']
+
+                        if frame:
+                            try:
+                                image_reader = ImageReader(io.BytesIO(base64.b64decode(frame[frame.find(',')+1:])))
+                            except UnidentifiedImageError:
+                                raise ValidationError(_("There was an issue downloading your document. Please contact an administrator."))
+                            _fix_image_transparency(image_reader._image)
+                            can.drawImage(
+                                image_reader,
+                                width*item.posX,
+                                height*(1-item.posY-item.height),
+                                width*item.width,
+                                height*item.height,
+                                'auto',
+                                True
+                            )
+
+                        if item.type_id.item_type == "text":
+                            value = self._get_displayed_text(value)
+                            can.setFont(font, height*item.height*0.8)
+                            if item.alignment == "left":
+                                can.drawString(width*item.posX, height*(1-item.posY-item.height*0.9), value)
+                            elif item.alignment == "right":
+                                can.drawRightString(width*(item.posX+item.width), height*(1-item.posY-item.height*0.9), value)
                             else:
-                                content.append(option.value)
-                        font_size = height * normalFontSize * 0.8
-                        can.setFont(font, font_size)
-                        text = " / ".join(content)
-                        string_width = stringWidth(text.replace("<strike>", "").replace("</strike>", ""), font, font_size)
-                        p = Paragraph(text, getSampleStyleSheet()["Normal"])
-                        posX = width * (item.posX + item.width * 0.5) - string_width // 2
-                        posY = height * (1 - item.posY - item.height * 0.5) - p.wrap(width, height)[1] // 2
-                        p.drawOn(can, posX, posY)
-
-                    elif item.type_id.item_type == "textarea":
-                        can.setFont(font, height*normalFontSize*0.8)
-                        lines = value.split('\n')
-                        y = (1-item.posY)
-                        for line in lines:
-                            y -= normalFontSize*0.9
-                            can.drawString(width*item.posX, height*y, line)
-                            y -= normalFontSize*0.1
-
-                    elif item.type_id.item_type == "checkbox":
-                        can.setFont(font, height*item.height*0.8)
-                        value = 'X' if value == 'on' else ''
-                        can.drawString(width*item.posX, height*(1-item.posY-item.height*0.9), value)
-
-                    elif item.type_id.item_type == "signature" or item.type_id.item_type == "initial":
-                        try:
-                            image_reader = ImageReader(io.BytesIO(base64.b64decode(value[value.find(',')+1:])))
-                        except UnidentifiedImageError:
-                            raise ValidationError(_("There was an issue downloading your document. Please contact an administrator."))
-                        _fix_image_transparency(image_reader._image)
-                        can.drawImage(image_reader, width*item.posX, height*(1-item.posY-item.height), width*item.width, height*item.height, 'auto', True)
-
-                can.showPage()
-
-            can.save()
-
-            item_pdf = PdfFileReader(packet, overwriteWarnings=False)
-            new_pdf = PdfFileWriter()
-
-            for p in range(0, old_pdf.getNumPages()):
-                page = old_pdf.getPage(p)
-                page.mergePage(item_pdf.getPage(p))
-                new_pdf.addPage(page)
-
-            if isEncrypted:
-                new_pdf.encrypt(password)
+                                can.drawCentredString(width*(item.posX+item.width/2), height*(1-item.posY-item.height*0.9), value)
+
+                        elif item.type_id.item_type == "selection":
+                            content = []
+                            for option in item.option_ids:
+                                if option.id != int(value):
+                                    content.append("<strike>%s</strike>" % (option.value))
+                                else:
+                                    content.append(option.value)
+                            font_size = height * normalFontSize * 0.8
+                            can.setFont(font, font_size)
+                            text = " / ".join(content)
+                            string_width = stringWidth(text.replace("<strike>", "").replace("</strike>", ""), font, font_size)
+                            p = Paragraph(text, getSampleStyleSheet()["Normal"])
+                            posX = width * (item.posX + item.width * 0.5) - string_width // 2
+                            posY = height * (1 - item.posY - item.height * 0.5) - p.wrap(width, height)[1] // 2
+                            p.drawOn(can, posX, posY)
+
+                        elif item.type_id.item_type == "textarea":
+                            can.setFont(font, height*normalFontSize*0.8)
+                            lines = value.split('\n')
+                            y = (1-item.posY)
+                            for line in lines:
+                                y -= normalFontSize*0.9
+                                can.drawString(width*item.posX, height*y, line)
+                                y -= normalFontSize*0.1
+
+                        elif item.type_id.item_type == "checkbox":
+                            can.setFont(font, height*item.height*0.8)
+                            value = 'X' if value == 'on' else ''
+                            can.drawString(width*item.posX, height*(1-item.posY-item.height*0.9), value)
 
-            try:
-                output = io.BytesIO()
-                new_pdf.write(output)
-            except PdfReadError:
-                raise ValidationError(_("There was an issue downloading your document. Please contact an administrator."))
+                        elif item.type_id.item_type == "signature" or item.type_id.item_type == "initial":
+                            try:
+                                image_reader = ImageReader(io.BytesIO(base64.b64decode(value[value.find(',')+1:])))
+                            except UnidentifiedImageError:
+                                raise ValidationError(_("There was an issue downloading your document. Please contact an administrator."))
+                            _fix_image_transparency(image_reader._image)
+                            can.drawImage(image_reader, width*item.posX, height*(1-item.posY-item.height), width*item.width, height*item.height, 'auto', True)
+
+                    can.showPage()
+
+                can.save()
+
+                item_pdf = PdfFileReader(packet, overwriteWarnings=False)
+                new_pdf = PdfFileWriter()
+
+                for p in range(0, old_pdf.getNumPages()):
+                    page = old_pdf.getPage(p)
+                    # Only the pages holding values need their content to be rewritten, the other ones are copied as is
+                    if any(item.id in values for item in itemsByPage.get(p + 1, [])):
+                        page.mergePage(item_pdf.getPage(p))
+                    new_pdf.addPage(page)
+
+                if isEncrypted:
+                    new_pdf.encrypt(password)
+
+                try:
+                    output = io.BytesIO()
+                    new_pdf.write(output)
+                except PdfReadError:
+                    raise ValidationError(_("There was an issue downloading your document. Please contact an administrator."))
 
-            self.completed_document = base64.b64encode(output.getvalue())
-            output.close()
+                self.completed_document = base64.b64encode(output.getvalue())
+                output.close()
 
         attachment = self.env['ir.attachment'].create({
             'name': "%s.pdf" % self.reference if self.reference.split('.')[-1] != 'pdf' else self.reference,
@@ -10,7 +10,7 @@ from collections import defaultdict
 
 from odoo import api, fields, models, Command, _
 from odoo.exceptions import UserError, AccessError, ValidationError
-from odoo.tools import pdf
+from odoo.tools import ormcache, pdf
 
 
 class SignTemplate(models.Model):
@@ -61,7 +61,7 @@ class SignTemplate(models.Model):
     def _compute_num_pages(self):
         for record in self:
             try:
-                record.num_pages = self._get_pdf_number_of_pages(base64.b64decode(record.attachment_id.datas))
+                record.num_pages = self._get_pdf_number_of_pages(record.attachment_id.raw)
             except Exception:
                 record.num_pages = 0
 
@@ -155,6 +155,34 @@ class SignTemplate(models.Model):
         file_pdf = PdfFileReader(io.BytesIO(pdf_data), strict=False, overwriteWarnings=False)
         return file_pdf.getNumPages()
 
+    def _open_pdf_file(self):
+        """ Returns a file object on the PDF of the template, to be parsed with PdfFileReader. The file is opened directly
+        from the filestore when possible, so that PdfFileReader only reads the objects it needs instead of the whole
+        content being loaded in memory. The caller is responsible for closing the returned file. """
+        self.ensure_one()
+        attachment = self.attachment_id
+        if attachment.store_fname:
+            try:
+                return open(attachment._full_path(attachment.store_fname), 'rb')
+            except OSError:
+                pass
+        return io.BytesIO(attachment.raw or b'')
+
+    @ormcache('self.attachment_id.checksum')
+    def _is_pdf_encrypted(self):
+        """ Whether the PDF of the template is encrypted, cached by content to avoid parsing the same file at each signature. """
+        self.ensure_one()
+        with self._open_pdf_file() as pdf_file:
+            return PdfFileReader(pdf_file, strict=False, overwriteWarnings=False).isEncrypted
+
+    def _check_pdf_password(self, password):
+        """ Whether the password decrypts the PDF of the template, which is always the case when it isn't encrypted. """
+        self.ensure_one()
+        if not self._is_pdf_encrypted():
+            return True
+        with self._open_pdf_file() as pdf_file:
+            return bool(PdfFileReader(pdf_file, strict=False, overwriteWarnings=False).decrypt(password or ''))
+
     def go_to_custom_template(self, sign_directly_without_mail=False):
         self.ensure_one()
         return {
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import base64
+import io
+import logging
+import time
+from unittest.mock import patch
+
+from PyPDF2 import PdfFileReader, PdfFileWriter
+
+from .sign_request_common import SignRequestCommon
+from odoo.tests import tagged
+from odoo.tools import file_open
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged('sign_pdf_benchmark', '-standard')
+class TestSignPdfBenchmark(SignRequestCommon):
+    """ Compares the generation of the completed document reading the template from the filestore with the previous one,
+    decoding the whole template in memory.
+    Run with --test-tags sign_pdf_benchmark.
+    """
+
+    PAGES_COUNT = 300
+    GENERATIONS_COUNT = 5
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with file_open('sign/static/demo/sample_contract.pdf', "rb") as f:
+            sample_pdf = PdfFileReader(io.BytesIO(f.read()), strict=False)
+            large_pdf = PdfFileWriter()
+            for page_number in range(cls.PAGES_COUNT):
+                large_pdf.addPage(sample_pdf.getPage(page_number % sample_pdf.getNumPages()))
+            with io.BytesIO() as stream:
+                large_pdf.write(stream)
+                large_pdf_content = stream.getvalue()
+
+        cls.benchmark_template = cls.env['sign.template'].create({
+            'name': 'Sign Benchmark',
+            'attachment_id': cls.env['ir.attachment'].create({
+                'type': 'binary',
+                'raw': large_pdf_content,
+                'name': 'sign_benchmark.pdf',
+            }).id,
+        })
+        cls.env['sign.item'].create([
+            dict(cls.get_sign_item_config(cls, cls.role_customer.id), page=page, template_id=cls.benchmark_template.id)
+            for page in (1, cls.PAGES_COUNT)
+        ])
+        cls.benchmark_sign_request = cls.env['sign.request'].create({
+            'template_id': cls.benchmark_template.id,
+            'reference': cls.benchmark_template.display_name,
+            'request_item_ids': [(0, 0, {
+                'partner_id': cls.partner_1.id,
+                'role_id': cls.role_customer.id,
+            })],
+        })
+        cls.benchmark_sign_request.request_item_ids._edit_and_sign(
+            cls.create_sign_values(cls, cls.benchmark_template.sign_item_ids, cls.role_customer.id))
+
+    def _benchmark_completed_document(self):
+        start = time.perf_counter()
+        for dummy in range(self.GENERATIONS_COUNT):
+            self.benchmark_sign_request._generate_completed_document()
+        completed_pdf = PdfFileReader(io.BytesIO(base64.b64decode(self.benchmark_sign_request.completed_document)), strict=False)
+        return completed_pdf.getNumPages(), time.perf_counter() - start
+
+    def test_completed_document_benchmark(self):
+        def open_decoded_pdf_file(template):
+            return io.BytesIO(base64.b64decode(template.attachment_id.datas))
+
+        with patch.object(type(self.env['sign.template']), '_open_pdf_file', open_decoded_pdf_file):
+            decoded_pages_count, decoded_duration = self._benchmark_completed_document()
+        filestore_pages_count, filestore_duration = self._benchmark_completed_document()
+
+        _logger.info(
+            "Sign completed document benchmark (%s pages, %s generations): decoded %.3fs, filestore %.3fs (x%.1f)",
+            self.PAGES_COUNT, self.GENERATIONS_COUNT,
+            decoded_duration, filestore_duration, decoded_duration / filestore_duration,
+        )
+        self.assertEqual(filestore_pages_count, self.PAGES_COUNT)
+        self.assertEqual(filestore_pages_count, decoded_pages_count)
@@ -52,4 +52,5 @@ class TestSignMulticompany(SignRequestCommon, MockEmail):
 
             # Followup mail should contain reference to company_2
             sign_request.request_item_ids.with_company(self.company_3)._edit_and_sign(self.single_role_customer_sign_values)
+            self.env['sign.request']._cron_send_completed_documents()
             self.assertSentEmail('"OdooBot" <odoobot@example.com>', self.partner_1, body_content='Company2')
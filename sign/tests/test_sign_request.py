@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
+from unittest.mock import patch
+
 from .sign_request_common import SignRequestCommon
 from odoo import Command
 from odoo.exceptions import UserError, ValidationError
@@ -75,6 +77,17 @@ class TestSignRequest(SignRequestCommon):
                 'reference': self.template_3_roles.display_name,
             })
 
+    def test_sign_request_send_completed_document_failure(self):
+        sign_request_no_item = self.create_sign_request_no_item(signer=self.partner_1, cc_partners=self.partner_4)
+        sign_request_no_item.request_item_ids[0]._edit_and_sign(self.signature_fake)
+        self.assertTrue(sign_request_no_item.completed_document_pending)
+
+        with patch.object(self.registry['sign.request'], '_send_completed_document', side_effect=UserError("Invalid email")):
+            self.env['sign.request']._cron_send_completed_documents()
+        self.assertFalse(sign_request_no_item.completed_document_pending)
+        self.assertEqual(len(sign_request_no_item.activity_search(['mail.mail_activity_data_warning'], user_id=sign_request_no_item.create_uid.id)), 1,
+                         'The requester should be warned that the completed document was not sent')
+
     def test_sign_request_no_item_create_sign_cancel_copy(self):
         # create
         sign_request_no_item = self.create_sign_request_no_item(signer=self.partner_1, cc_partners=self.partner_4)
@@ -86,6 +99,9 @@ class TestSignRequest(SignRequestCommon):
         sign_request_item._edit_and_sign(self.signature_fake)
         self.assertEqual(sign_request_item.state, 'completed', 'The sign.request.item should be completed')
         self.assertEqual(sign_request_no_item.state, 'signed', 'The sign request should be signed')
+        self.assertTrue(sign_request_no_item.completed_document_pending, 'The completed document should be generated in background')
+        self.env['sign.request']._cron_send_completed_documents()
+        self.assertFalse(sign_request_no_item.completed_document_pending)
         self.assertEqual(len(sign_request_no_item.completed_document_attachment_ids), 2, 'The completed document and the certificate should be created')
         self.assertEqual(len(sign_request_no_item.sign_log_ids.filtered(
             lambda log: log.action == 'sign' and log.sign_request_item_id == sign_request_item)),
@@ -322,6 +338,9 @@ class TestSignRequest(SignRequestCommon):
         sign_request_item._edit_and_sign({'-1': value}, new_sign_items={'-1': new_sign_item_config})
         self.assertEqual(sign_request_item.state, 'completed', 'The sign.request.item should be completed')
         self.assertEqual(sign_request_no_item.state, 'signed', 'The sign request should be signed')
+        self.assertTrue(sign_request_no_item.completed_document_pending, 'The completed document should be generated in background')
+        self.env['sign.request']._cron_send_completed_documents()
+        self.assertFalse(sign_request_no_item.completed_document_pending)
         self.assertEqual(len(sign_request_no_item.completed_document_attachment_ids), 2, 'The completed document and the certificate should be created')
         self.assertNotEqual(sign_request_no_item.template_id, template, 'An edited sign request should use a different template')
         self.assertEqual(template.sign_item_ids.ids, sign_item_ids, 'The original template should not be changed')
@@ -379,6 +398,9 @@ class TestSignRequest(SignRequestCommon):
         self.assertEqual(sign_request_item_employee.state, 'completed', 'The sign.request.item should be completed')
         self.assertEqual(sign_request_item_company.state, 'completed', 'The sign.request.item should be completed')
         self.assertEqual(sign_request_3_roles.state, 'signed', 'The sign request should be signed')
+        self.assertTrue(sign_request_3_roles.completed_document_pending, 'The completed document should be generated in background')
+        self.env['sign.request']._cron_send_completed_documents()
+        self.assertFalse(sign_request_3_roles.completed_document_pending)
         self.assertEqual(len(sign_request_3_roles.completed_document_attachment_ids), 2, 'The completed document and the certificate should be created')
         self.assertEqual(len(sign_request_3_roles.sign_log_ids.filtered(
             lambda log: log.action == 'sign' and log.sign_request_item_id == sign_request_item_company)),
@@ -418,3 +418,29 @@ class TestWebGanttReschedule(TestWebGantt):
             self.pill_4_slave_in_conflict[self.date_start_field_name], self.pill_4_slave_in_conflict_start_date,
             'Pill in conflict with Pill 4 should not have been rescheduled.'
         )
+
+    def test_cascade_forward_long_chain(self):
+        """ This test purpose is to ensure that the rescheduling cascades along a dependency chain longer than the
+            python recursion limit.
+        """
+        chain_start_date = self.pill_4_stop_date + timedelta(days=1)
+        chain = self.TestWebGanttPill
+        for i in range(1100):
+            start_date = chain_start_date + timedelta(hours=i)
+            chain |= self.create_pill(f'Chain Pill {i}', start_date, start_date + timedelta(minutes=30), chain[-1:].ids)
+        chain_end_start_date = chain[-1][self.date_stop_field_name] + timedelta(days=1)
+        chain_end = self.create_pill(
+            'Chain End', chain_end_start_date, chain_end_start_date + timedelta(hours=8), chain[-1:].ids
+        )
+
+        self.gantt_reschedule_forward(chain[-1], chain_end)
+
+        self.assertEqual(
+            chain[-1][self.date_stop_field_name], chain_end[self.date_start_field_name],
+            'The last Pill of the chain should move forward up to start of Chain End.'
+        )
+        for master, slave in zip(chain[:-1], chain[1:]):
+            self.assertEqual(
+                master[self.date_stop_field_name], slave[self.date_start_field_name],
+                'Reschedule of the last Pill of the chain should have cascaded to all the Pills of the chain.'
+            )
@@ -131,3 +131,83 @@ class TestReadGridGrouped(TestWebGrid):
                 ['project_id'], ['project_id'],
             )),
         )
+
+
+class TestReadGridRows(TestWebGrid):
+
+    def _read_grid(self, row_fields, domain=None, grid_range=None):
+        return self.env['test.web.grid'].with_context(grid_anchor="2019-06-14").read_grid(
+            row_fields, "start_date", "resource_hours", domain or [], grid_range or self.range_day,
+        )
+
+    def _read_grid_rows(self, row_fields, row_values, state_token, domain=None, grid_range=None):
+        return self.env['test.web.grid'].with_context(grid_anchor="2019-06-14").read_grid_rows(
+            row_fields, "start_date", "resource_hours", row_values, state_token,
+            domain=domain or [], range=grid_range or self.range_day,
+        )
+
+    def test_read_grid_rows(self):
+        row_fields = ["project_id", "task_id"]
+        grid = self._read_grid(row_fields)
+        project_row_index = next(
+            index for index, row in enumerate(grid['rows']) if row['values']['project_id']
+        )
+        row_values = grid['rows'][project_row_index]['values']
+
+        result = self._read_grid_rows(row_fields, row_values, grid['state_token'])
+        self.assertNotIn('outdated', result)
+        self.assertEqual(result['state_token'], grid['state_token'])
+        self.assertEqual([row['values'] for row in result['rows']], [row_values])
+        self.assertEqual(
+            [cell['value'] for cell in result['grid'][0]],
+            [cell['value'] for cell in grid['grid'][project_row_index]],
+        )
+
+        # only the cells of the requested row are fetched again after an edition
+        self.grid_obj_2.resource_hours = 6
+        result = self._read_grid_rows(row_fields, row_values, grid['state_token'])
+        date_of_work = self.grid_obj_2.start_date.day - 1
+        self.assertEqual(result['grid'][0][date_of_work]['value'], 6)
+        self.assertEqual(len(result['rows']), 1)
+
+    def test_read_grid_rows_outdated(self):
+        row_fields = ["project_id", "task_id"]
+        grid = self._read_grid(row_fields)
+        row_values = grid['rows'][0]['values']
+
+        # the columns changed since the grid was read
+        result = self._read_grid_rows(row_fields, row_values, grid['state_token'], grid_range=self.range_week_2)
+        self.assertEqual(result, {
+            'state_token': self._read_grid(row_fields, grid_range=self.range_week_2)['state_token'],
+            'outdated': True,
+        })
+        self.assertNotEqual(result['state_token'], grid['state_token'])
+
+        # the domain changed since the grid was read
+        domain = [('employee_id', '=', self.employee.id)]
+        result = self._read_grid_rows(row_fields, row_values, grid['state_token'], domain=domain)
+        self.assertTrue(result['outdated'])
+        self.assertEqual(result['state_token'], self._read_grid(row_fields, domain=domain)['state_token'])
+
+    def test_read_grid_rows_date_part(self):
+        # the records of a row grouped by a date part can't be fetched with a domain on its values
+        row_fields = ["start_datetime:month"]
+        grid = self._read_grid(row_fields)
+        result = self._read_grid_rows(row_fields, grid['rows'][0]['values'], grid['state_token'])
+        self.assertEqual(result, {'state_token': grid['state_token'], 'outdated': True})
+
+    def test_read_grid_rows_section(self):
+        # the empty cells of a row of a sectioned grid only list the records of its section
+        row_fields = ["employee_id"]
+        sections = self.env['test.web.grid'].with_context(grid_anchor="2019-06-14").read_grid_grouped(
+            row_fields, "start_date", "resource_hours", "project_id", [], self.range_day,
+        )
+        section = next(section for section in sections if section['__label'] and section['__label'][0] == self.project.id)
+        row_values = dict(section['rows'][0]['values'], project_id=section['__label'])
+
+        result = self._read_grid_rows(row_fields, row_values, section['state_token'])
+        self.assertNotIn('outdated', result)
+        empty_cell = next(cell for cell in result['grid'][0] if not cell['size'])
+        self.assertIn(('project_id', '=', self.project.id), empty_cell['domain'])
+        for cell in result['grid'][0]:
+            self.assertEqual(self.env['test.web.grid'].search(cell['domain']).project_id, self.project if cell['size'] else self.project.browse())
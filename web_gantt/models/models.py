@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from collections import defaultdict
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from lxml.builder import E
 
 from odoo import _, api, models
@@ -101,6 +101,11 @@ class Base(models.AbstractModel):
             trigger_record = slave_record
             related_record = master_record
 
+        # Load the records of the whole dependency graph together instead of level by level during the rescheduling.
+        dependency_graph = trigger_record._web_gantt_reschedule_get_dependency_graph(dependency_field_name)
+        trigger_record = trigger_record.with_prefetch(dependency_graph._ids)
+        related_record = related_record.with_prefetch(dependency_graph._ids)
+
         cache = self._web_gantt_reschedule_get_empty_cache()
 
         new_start_date, new_stop_date = trigger_record._web_gantt_reschedule_record(
@@ -297,6 +302,74 @@ class Base(models.AbstractModel):
         """
         return rows
 
+    @api.model
+    def _gantt_unavailability_get_rows_res_ids(self, rows, field_name):
+        """ Get the ids of the records of the field the rows are grouped by, for the rows of which field_name is the
+            first group by. The rows of which field_name is a deeper group by are walked through to find them.
+
+            :param list rows: the rows of the gantt view, as passed to gantt_unavailability
+            :param str field_name: the name of the field the unavailabilities depend on (e.g. 'resource_id')
+            :returns: set of ids
+        """
+        res_ids = set()
+        rows_to_visit = list(rows or [])
+        while rows_to_visit:
+            row = rows_to_visit.pop()
+            group_bys = row.get('groupedBy')
+            if not group_bys:
+                continue
+            if group_bys[0] == field_name:
+                if row.get('resId'):
+                    res_ids.add(row['resId'])
+            elif field_name in group_bys:
+                rows_to_visit += row.get('rows') or []
+        return res_ids
+
+    @api.model
+    def _gantt_unavailability_fill_rows(self, rows, field_name, scale, intervals_per_res_id, default_intervals=None):
+        """ Get a copy of the rows of the gantt view with an 'unavailabilities' key set in each row from the provided
+            unavailable intervals. The rows grouped by field_name, and their sub rows, get the intervals of their
+            record, the other ones get default_intervals. The unavailabilities are computed once per record, whatever
+            the number of rows it appears in.
+
+            :param list rows: the rows of the gantt view, as passed to gantt_unavailability
+            :param str field_name: the name of the field the unavailabilities depend on (e.g. 'resource_id')
+            :param str scale: among "day", "week", "month" and "year"
+            :param dict intervals_per_res_id: {res_id: list of (start, stop) unavailable intervals}, where None means
+                   that the rows of the record have no unavailabilities
+            :param default_intervals: the unavailable intervals of the other rows, None if they have no
+                   unavailabilities
+            :returns: list of rows
+        """
+        # remove intervals smaller than a cell, as they will cause half a cell to turn grey
+        # ie: when looking at a week, a employee start everyday at 8, so there is a unavailability
+        # like: 2019-05-22 20:00 -> 2019-05-23 08:00 which will make the first half of the 23's cell grey
+        cell_dt = timedelta(hours=1) if scale in ['day', 'week'] else timedelta(hours=12)
+        unavailabilities_per_res_id = {}
+
+        def get_unavailabilities(res_id):
+            if res_id not in unavailabilities_per_res_id:
+                intervals = intervals_per_res_id.get(res_id, default_intervals) if res_id else default_intervals
+                unavailabilities_per_res_id[res_id] = None if intervals is None else [
+                    {'start': interval[0], 'stop': interval[1]}
+                    for interval in intervals
+                    if interval[1] - interval[0] >= cell_dt
+                ]
+            return unavailabilities_per_res_id[res_id]
+
+        def fill_row(row, res_id):
+            new_row = dict(row)
+            group_bys = row.get('groupedBy')
+            if not res_id and group_bys and group_bys[0] == field_name:
+                res_id = row.get('resId')
+            new_row['rows'] = [fill_row(sub_row, res_id) for sub_row in row.get('rows') or []]
+            unavailabilities = get_unavailabilities(res_id)
+            if unavailabilities is not None:
+                new_row['unavailabilities'] = unavailabilities
+            return new_row
+
+        return [fill_row(row, False) for row in rows or []]
+
     def _web_gantt_action_reschedule_related_records(
         self,
         dependency_field_name, dependency_inverted_field_name,
@@ -320,56 +393,78 @@ class Base(models.AbstractModel):
             :return: True if successful, False if not.
             :rtype: bool
         """
-        rescheduling_candidates = self._web_gantt_get_rescheduling_candidates(
-            dependency_field_name, dependency_inverted_field_name,
-            start_date_field_name, stop_date_field_name,
-            direction,
-            record_ids_to_exclude
-        )
-
-        if rescheduling_candidates is False:
-            return self._WEB_GANTT_LOOP_ERROR
-
-        if not rescheduling_candidates:
-            return True
-
         result = True
-        records_to_propagate = self.env[self._name]
-        for rescheduling_candidate in rescheduling_candidates:
-            record, related_record, is_related_record_master = rescheduling_candidate
-
-            new_start_date, new_stop_date = record._web_gantt_reschedule_record(
-                related_record, is_related_record_master,
-                start_date_field_name, stop_date_field_name,
-                cache
-            )
-            record_write_result = record._web_gantt_reschedule_write_new_dates(
-                new_start_date, new_stop_date,
+        records = self
+        # The records are rescheduled level by level: the candidates of the current records are rescheduled, then
+        # the candidates of the ones that were successfully rescheduled, and so on.
+        while records:
+            rescheduling_candidates = records._web_gantt_get_rescheduling_candidates(
+                dependency_field_name, dependency_inverted_field_name,
                 start_date_field_name, stop_date_field_name,
+                direction,
+                record_ids_to_exclude
             )
 
-            if record_write_result:
-                records_to_propagate |= record
-                record_ids_to_exclude[record.id] = record_ids_to_exclude[related_record.id] + [related_record.id]
+            if rescheduling_candidates is False:
+                return self._WEB_GANTT_LOOP_ERROR
+
+            # The new dates of the candidates only depend on the records of the previous level, so that they can all
+            # be computed before writing them, with a single write per distinct couple of dates.
+            records_per_dates = defaultdict(lambda: self.env[self._name])
+            for record, related_record, is_related_record_master in rescheduling_candidates:
+                new_dates = record._web_gantt_reschedule_record(
+                    related_record, is_related_record_master,
+                    start_date_field_name, stop_date_field_name,
+                    cache
+                )
+                records_per_dates[tuple(new_dates)] |= record
+
+            records_to_propagate = self.env[self._name]
+            for (new_start_date, new_stop_date), records_to_write in records_per_dates.items():
+                write_result = records_to_write._web_gantt_reschedule_write_new_dates(
+                    new_start_date, new_stop_date,
+                    start_date_field_name, stop_date_field_name,
+                )
+                if write_result:
+                    records_to_propagate |= records_to_write
+                result &= write_result
+
+            for record, related_record, dummy in rescheduling_candidates:
+                if record in records_to_propagate:
+                    record_ids_to_exclude[record.id] = record_ids_to_exclude[related_record.id] + [related_record.id]
+
+            for record in records:
+                record_ids_to_exclude.pop(record.id, None)
+
+            records = records_to_propagate
 
-            result &= record_write_result
-
-        for record in self:
-            record_ids_to_exclude.pop(record.id, None)
+        return result
 
-        related_records_result = records_to_propagate._web_gantt_action_reschedule_related_records(
-            dependency_field_name, dependency_inverted_field_name,
-            start_date_field_name, stop_date_field_name,
-            direction,
-            record_ids_to_exclude,
-            cache
-        )
-        if isinstance(related_records_result, bool):
-            result &= related_records_result
-        else:
-            result = related_records_result
+    def _web_gantt_reschedule_get_dependency_graph(self, dependency_field_name):
+        """ Get the records linked to the current ones, directly or not, through the dependency relation, using a
+            single recursive query. The rescheduling process uses them as prefetch set, so that the records of the
+            graph are read together instead of level by level.
 
-        return result
+            :param dependency_field_name: The field name of the relation between the master and slave records.
+            :return: the records of the dependency graph of the current records, or the current records if the
+                     dependency field is not a stored many2many.
+        """
+        field = self._fields[dependency_field_name]
+        if field.type != 'many2many' or not field.store or field.comodel_name != self._name:
+            return self
+
+        self.flush_model([dependency_field_name])
+        self.env.cr.execute(f"""
+            WITH RECURSIVE dependency_graph(id) AS (
+                SELECT unnest(%s)
+                UNION
+                SELECT CASE WHEN rel."{field.column1}" = graph.id THEN rel."{field.column2}" ELSE rel."{field.column1}" END
+                  FROM "{field.relation}" rel
+                  JOIN dependency_graph graph ON graph.id IN (rel."{field.column1}", rel."{field.column2}")
+            )
+            SELECT id FROM dependency_graph
+        """, [self.ids])
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
 
     def _web_gantt_get_rescheduling_candidates(
         self,
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from datetime import datetime
+
+from odoo.tests.common import TransactionCase
+
+
+class TestGanttUnavailability(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.Model = cls.env['res.partner']
+        # a night, longer than a cell, and a lunch break, shorter than a cell on the month scale
+        cls.night = (datetime(2022, 6, 1, 18, 0), datetime(2022, 6, 2, 8, 0))
+        cls.lunch = (datetime(2022, 6, 2, 12, 0), datetime(2022, 6, 2, 13, 0))
+        cls.company_night = (datetime(2022, 6, 1, 17, 0), datetime(2022, 6, 2, 9, 0))
+
+    def test_get_rows_res_ids(self):
+        rows = [{
+            'groupedBy': ['user_id', 'parent_id'],
+            'resId': 1,
+            'rows': [
+                {'groupedBy': ['parent_id'], 'resId': 10, 'rows': []},
+            ],
+        }, {
+            'groupedBy': ['parent_id', 'user_id'],
+            'resId': 11,
+            'rows': [
+                {'groupedBy': ['user_id'], 'resId': 2, 'rows': []},
+                {'groupedBy': ['user_id'], 'resId': False, 'rows': []},
+            ],
+        }, {
+            'groupedBy': ['parent_id'],
+            'resId': 12,
+            'rows': [],
+        }]
+        self.assertEqual(self.Model._gantt_unavailability_get_rows_res_ids(rows, 'user_id'), {1, 2})
+        self.assertEqual(self.Model._gantt_unavailability_get_rows_res_ids(rows, 'parent_id'), {10, 11, 12})
+        self.assertEqual(self.Model._gantt_unavailability_get_rows_res_ids(rows, 'company_id'), set())
+        self.assertEqual(self.Model._gantt_unavailability_get_rows_res_ids([], 'user_id'), set())
+
+    def test_fill_rows_grouped(self):
+        rows = [
+            {'groupedBy': ['user_id'], 'resId': 1, 'rows': []},
+            {'groupedBy': ['user_id'], 'resId': 2, 'rows': []},
+            {'groupedBy': ['user_id'], 'resId': False, 'rows': []},
+        ]
+        intervals_per_res_id = {1: [self.night, self.lunch], 2: None}
+        result = self.Model._gantt_unavailability_fill_rows(rows, 'user_id', 'week', intervals_per_res_id, [self.company_night])
+
+        self.assertEqual(result[0]['unavailabilities'], [
+            {'start': self.night[0], 'stop': self.night[1]},
+            {'start': self.lunch[0], 'stop': self.lunch[1]},
+        ])
+        self.assertNotIn('unavailabilities', result[1], "A record without intervals should have no unavailabilities")
+        self.assertEqual(result[2]['unavailabilities'], [{'start': self.company_night[0], 'stop': self.company_night[1]}],
+                         "The rows without record should get the default intervals")
+        self.assertNotIn('unavailabilities', rows[0], "The rows passed should not be modified")
+
+        result = self.Model._gantt_unavailability_fill_rows(rows, 'user_id', 'month', intervals_per_res_id)
+        self.assertEqual(result[0]['unavailabilities'], [{'start': self.night[0], 'stop': self.night[1]}],
+                         "The intervals shorter than a cell should be filtered out")
+        self.assertNotIn('unavailabilities', result[2])
+
+    def test_fill_rows_nested(self):
+        rows = [{
+            'groupedBy': ['user_id', 'parent_id'],
+            'resId': 1,
+            'rows': [
+                {'groupedBy': ['parent_id'], 'resId': 10, 'rows': []},
+            ],
+        }, {
+            'groupedBy': ['parent_id', 'user_id'],
+            'resId': 11,
+            'rows': [
+                {'groupedBy': ['user_id'], 'resId': 1, 'rows': []},
+                {'groupedBy': ['user_id'], 'resId': 2, 'rows': []},
+            ],
+        }]
+        intervals_per_res_id = {1: [self.night], 2: [self.lunch]}
+        result = self.Model._gantt_unavailability_fill_rows(rows, 'user_id', 'day', intervals_per_res_id, [self.company_night])
+
+        night = [{'start': self.night[0], 'stop': self.night[1]}]
+        self.assertEqual(result[0]['unavailabilities'], night)
+        self.assertEqual(result[0]['rows'][0]['unavailabilities'], night,
+                         "A sub row should get the unavailabilities of the record of its parent row")
+        self.assertEqual(result[1]['unavailabilities'], [{'start': self.company_night[0], 'stop': self.company_night[1]}],
+                         "A row grouped by another field first should get the default intervals")
+        self.assertEqual(result[1]['rows'][0]['unavailabilities'], night)
+        self.assertEqual(result[1]['rows'][1]['unavailabilities'], [{'start': self.lunch[0], 'stop': self.lunch[1]}])
@@ -3,6 +3,8 @@ import datetime
 from dateutil import rrule
 
 import collections
+import hashlib
+import json
 from functools import partial
 
 import babel.dates
@@ -37,6 +39,60 @@ class Base(models.AbstractModel):
         domain = expression.normalize_domain(domain)
         column_info = self._grid_column_info(col_field, range)
 
+        groups = self._read_grid_groups(row_fields, col_field, cell_field, column_info, domain, readonly_field, orderby)
+
+        results = self._build_grid(row_fields, col_field, cell_field, column_info,
+                                groups=groups, domain=domain, readonly_field=readonly_field)
+        results['state_token'] = self._grid_state_token(row_fields, col_field, cell_field, column_info, domain, readonly_field)
+
+        return self._apply_grid_grouped_expand(domain, row_fields, results)
+
+    @api.model
+    def read_grid_rows(self, row_fields, col_field, cell_field, row_values, state_token, domain=None, range=None,
+                       readonly_field=None, orderby=None):
+        """
+        Fetches the cells of the rows of a grid previously read with
+        ``read_grid`` or ``read_grid_grouped`` matching ``row_values``,
+        typically after one of their cells has been edited. Only the records
+        of these rows get aggregated, instead of the whole grid.
+
+        :param list[str] row_fields: group row header fields
+        :param str col_field: column field
+        :param str cell_field: cell field, summed
+        :param dict row_values: values of the row fields (and of the section
+                                field for grouped grids) of the rows to fetch,
+                                as returned in the rows of the grid
+        :param str state_token: ``state_token`` of the grid previously read
+        :param range: displayed range for the current page
+        :param readonly_field: make cell readonly based on value of readonly_field given
+        :type range: None | {'step': object, 'span': object}
+        :type domain: None | list
+        :returns: dict of the state token and of the matrix data and row values
+                  of the rows matching ``row_values``, or of the state token
+                  and ``outdated: True`` if the columns or parameters of the
+                  grid changed since it was read, so that it has to be read
+                  again
+        """
+        domain = expression.normalize_domain(domain)
+        column_info = self._grid_column_info(col_field, range)
+
+        token = self._grid_state_token(row_fields, col_field, cell_field, column_info, domain, readonly_field)
+        row_domain = self._grid_row_domain(row_values)
+        if token != state_token or row_domain is None:
+            return {'state_token': token, 'outdated': True}
+
+        groups = self._read_grid_groups(row_fields, col_field, cell_field, column_info,
+                                        expression.AND([domain, row_domain]), readonly_field, orderby)
+        # as in read_grid_grouped, the empty cells of a sectioned grid are restricted to their section
+        result = self._build_grid(row_fields, col_field, cell_field, column_info, groups=groups,
+                                  domain=expression.AND([domain, row_domain]), readonly_field=readonly_field)
+        return {
+            'state_token': token,
+            'rows': result['rows'],
+            'grid': result['grid'],
+        }
+
+    def _read_grid_groups(self, row_fields, col_field, cell_field, column_info, domain, readonly_field, orderby):
         grid_select = set([col_field, cell_field])
 
         # readonly field should be in select clause with group_operator, or in group by clause too
@@ -46,17 +102,36 @@ class Base(models.AbstractModel):
                 raise UserError(_("The field used as readonly type must have a group_operator attribute."))
 
         # [{ __count, __domain, grouping, **row_fields, cell_field }]
-        groups = self._read_group_raw(
+        return self._read_group_raw(
             expression.AND([domain, column_info.domain]),
             list(grid_select) + [f.partition(':')[0] for f in row_fields],
             [column_info.grouping] + row_fields,
             lazy=False, orderby=orderby
         )
 
-        results = self._build_grid(row_fields, col_field, cell_field, column_info,
-                                groups=groups, domain=domain, readonly_field=readonly_field)
+    def _grid_state_token(self, row_fields, col_field, cell_field, column_info, domain, readonly_field):
+        """ Returns a token identifying the layout of a grid (fields, domain
+        and columns), used to check that rows fetched separately fit in a grid
+        previously read.
+        """
+        layout = [
+            self._name, row_fields, col_field, cell_field, domain, readonly_field,
+            column_info.domain, [column['values'] for column in column_info.values],
+        ]
+        return hashlib.sha1(json.dumps(layout, sort_keys=True, default=str).encode()).hexdigest()
 
-        return self._apply_grid_grouped_expand(domain, row_fields, results)
+    def _grid_row_domain(self, row_values):
+        """ Converts the values of a grid row into the domain of its records,
+        or returns None if that's not possible (grouping by date parts).
+        """
+        domain = []
+        for field_name, value in row_values.items():
+            if ':' in field_name or field_name not in self._fields:
+                return None
+            if self._fields[field_name].type == 'many2one' and value:
+                value = value[0]
+            domain.append((field_name, '=', value))
+        return domain
 
     @api.model
     def read_grid_grouped(self, row_fields, col_field, cell_field, section_field, domain,
@@ -144,6 +219,11 @@ class Base(models.AbstractModel):
                 '__label': section_group_label,
             } for section_group_label, section_group in section_groups.items()]
 
+        state_token = self._grid_state_token(row_fields, col_field, cell_field, column_info,
+                                             expression.normalize_domain(domain), readonly_field)
+        for result in results:
+            result['state_token'] = state_token
+
         return self._apply_grid_grouped_expand(
             grid_domain, row_fields, results,
             section_field, group_expand_section_values
@@ -167,13 +167,20 @@ const GridModel = AbstractModel.extend({
         }
         return this._fetch(this.groupedBy);
     },
-    reloadCell: function (cell, cellField, colField) {
-        var self = this;
-        var domain = cell.col.domain.concat(this.domain);
-        var domainRow = cell.row.values;
-        for (var value in domainRow) {
-            domain = domain.concat([[value.toString(), '=', domainRow[value][0]]]);
-        }
+    /**
+     * Reloads the row of the given cell only, by fetching its cells from the
+     * server. Falls back on reloading the whole grid when the server reports
+     * that the grid it was read with is outdated (e.g. new columns).
+     *
+     * @param {Object} cell
+     * @returns {Promise}
+     */
+    reloadCell: async function (cell) {
+        const groupIndex = cell.cell_path[0];
+        const rowIndex = cell.cell_path[cell.cell_path.length - 2];
+        const group = this._gridData.data[groupIndex];
+        const groupBy = this._gridData.groupBy;
+        const rowValues = Object.assign({}, cell.row.values);
         /**
          * We're doing this because the record can be attribute to someone else
          * when it's attribute to no one at the beginning.
@@ -181,33 +188,40 @@ const GridModel = AbstractModel.extend({
          * (to also change de name of the person it's attribute to)
          */
         if (this._gridData.isGrouped) {
-            var groupLabel = this._gridData.data[cell.cell_path[0]].__label;
-            if (groupLabel !== undefined)
-                domain = domain.concat([[this._gridData.groupBy[0], '=', groupLabel[0]]]);
-            else {
-                return self._fetch(self._gridData.groupBy);
+            if (group.__label === undefined) {
+                return this._fetch(groupBy);
             }
+            rowValues[groupBy[0]] = group.__label;
         }
 
-        return this._rpc({
+        const result = await this._rpc({
             model: this.modelName,
-            method: 'read_group',
+            method: 'read_grid_rows',
             kwargs: {
-                domain: domain,
-                fields: [cellField],
-                groupby: [colField],
+                row_fields: this._gridData.isGrouped ? groupBy.slice(1) : groupBy,
+                col_field: this._gridData.colField,
+                cell_field: this._gridData.cellField,
+                row_values: rowValues,
+                state_token: group.state_token,
+                domain: this.domain || [],
+                range: this.currentRange,
+                readonly_field: this.readonlyField,
             },
-            context: this.getContext()
-        }).then(function (result) {
-            if (result.length === 0 || !(cellField in result[0])) {
-                return Promise.resolve();
-            }
-            var currentCell = utils.into(self._gridData.data, cell.cell_path);
-            currentCell.value = result[0][cellField];
-            currentCell.size = result[0][colField + '_count'];
-            currentCell.domain = domain;
-            self._gridData = self.computeAllTotals(self._gridData);
+            context: this.getContext(),
         });
+        if (result.outdated) {
+            return this._fetch(groupBy);
+        }
+        if (result.grid.length) {
+            group.grid[rowIndex] = result.grid[0];
+        } else {
+            // the records of the row have been moved away
+            group.grid[rowIndex].forEach((rowCell) => {
+                rowCell.value = 0;
+                rowCell.size = 0;
+            });
+        }
+        this._gridData = this.computeAllTotals(this._gridData);
     },
 
     //--------------------------------------------------------------------------
@@ -12,6 +12,8 @@ MockServer.include({
             return this._mockReadGrid(args.model, args.kwargs);
         } else if (args.method === 'read_grid_grouped') {
             return this._mockReadGridGrouped(args.model, args.kwargs);
+        } else if (args.method === 'read_grid_rows') {
+            return this._mockReadGridRows(args.model, args.kwargs);
         } else if (args.method === 'adjust_grid') {
             var domain = args.args[1];
             var columnField = args.args[2];
@@ -194,6 +196,32 @@ MockServer.include({
             }
         });
     },
+    /**
+     * @private
+     * @param {string} model
+     * @param {Object} kwargs
+     * @returns {Promise}
+     */
+    _mockReadGridRows(model, kwargs) {
+        const rowDomain = Object.entries(kwargs.row_values).map(([fieldName, value]) => {
+            return [fieldName, '=', Array.isArray(value) ? value[0] : value];
+        });
+        return this._mockReadGrid(model, {
+            row_fields: kwargs.row_fields,
+            col_field: kwargs.col_field,
+            cell_field: kwargs.cell_field,
+            domain: (kwargs.domain || []).concat(rowDomain),
+            range: kwargs.range,
+            readonly_field: kwargs.readonly_field,
+            context: kwargs.context,
+        }).then(function (result) {
+            return {
+                state_token: kwargs.state_token,
+                rows: result.rows,
+                grid: result.grid,
+            };
+        });
+    },
     /**
      * @TODO: this is not very generic but it works for the tests
      * @private